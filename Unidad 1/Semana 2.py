@@ -1,5 +1,25 @@
 from abc import ABC, abstractmethod
+from array import array
+import csv
 from datetime import datetime
+import io
+from itertools import islice
+import json
+import math
+import os
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+# Bono mensual del gerente por cada empleado a cargo
+BONO_GESTION_POR_EMPLEADO = 500
+# Empleados por bloque al generar y escribir el reporte de nómina
+TAMANO_BLOQUE_REPORTE = 1000
+# Tamaño del búfer del archivo del reporte (bytes)
+TAMANO_BUFER_REPORTE = 1 << 20
 
 
 # ABSTRACCIÓN: Clase abstracta que define la interfaz común
@@ -16,6 +36,7 @@ class Empleado(ABC):
         self.__id_empleado = id_empleado
         self._salario_base = salario_base  # Protegido para subclases
         self._fecha_contrato = datetime.now()
+        self._empresa = None  # Empresa que lo contrató, a la que avisa los cambios de salario
 
     # ENCAPSULACIÓN: Métodos getter y setter para controlar el acceso
     @property
@@ -37,14 +58,26 @@ class Empleado(ABC):
     @salario_base.setter
     def salario_base(self, nuevo_salario):
         if nuevo_salario > 0:
+            salario_anterior = self.calcular_salario()
             self._salario_base = nuevo_salario
+            self._avisar_cambio_salario(salario_anterior)
         else:
             raise ValueError("El salario debe ser positivo")
 
+    # Avisa a la empresa que el salario mensual cambió, para que actualice el total de la nómina
+    def _avisar_cambio_salario(self, salario_anterior):
+        if self._empresa is not None:
+            self._empresa._salario_cambiado(self, salario_anterior, self.calcular_salario())
+
     # Método concreto común
     def info_basica(self):
         return f"ID: {self.__id_empleado}, Nombre: {self.__nombre} {self.__apellido}"
 
+    # Datos del empleado para el reporte de nómina; cada subclase agrega los suyos
+    def datos_nomina(self):
+        return {'id_empleado': self.__id_empleado, 'nombre': self.__nombre,
+                'apellido': self.__apellido, 'tipo': self.tipo_empleado()}
+
     # ABSTRACCIÓN: Métodos abstractos que deben ser implementados por subclases
     @abstractmethod
     def calcular_salario(self):
@@ -84,6 +117,12 @@ class EmpleadoTiempoCompleto(Empleado):
                 f"Bono anual: ${self._bono_anual:,.2f}\n"
                 f"Beneficios: {beneficios_str}")
 
+    def datos_nomina(self):
+        datos = super().datos_nomina()
+        datos['bono_anual'] = self._bono_anual
+        datos['beneficios'] = list(self._beneficios)
+        return datos
+
     def tipo_empleado(self):
         return "Tiempo Completo"
 
@@ -113,6 +152,12 @@ class EmpleadoMedioTiempo(Empleado):
                 f"Horas semanales: {self._horas_semanales}\n"
                 f"Salario mensual: ${salario_mensual:,.2f}")
 
+    def datos_nomina(self):
+        datos = super().datos_nomina()
+        datos['tarifa_hora'] = self._tarifa_hora
+        datos['horas_semanales'] = self._horas_semanales
+        return datos
+
     def tipo_empleado(self):
         return "Medio Tiempo"
 
@@ -122,86 +167,578 @@ class Gerente(EmpleadoTiempoCompleto):
     """
     Gerente con responsabilidades adicionales.
     Demuestra HERENCIA multinivel y POLIMORFISMO.
+
+    Un gerente que trabaja en una empresa solo puede tener a cargo empleados de esa
+    misma empresa: agregar_empleado_a_cargo lanza ValueError con un empleado que no
+    trabaja en ella, y al contratar al gerente todo su equipo_a_cargo ya debe estar
+    contratado (ver Empresa). Un gerente sin empresa puede tener a cargo a cualquiera.
     """
 
     def __init__(self, nombre, apellido, id_empleado, salario_base, bono_anual, equipo_a_cargo=None):
         super().__init__(nombre, apellido, id_empleado, salario_base, bono_anual)
-        self._equipo_a_cargo = equipo_a_cargo or []
+        self._equipo_a_cargo = list(dict.fromkeys(equipo_a_cargo or []))  # Sin repetidos
         self._beneficios.extend(["Carro de empresa", "Gastos de representación"])
 
+    # Lanza ValueError si el empleado ya está a cargo del gerente o si el gerente trabaja en
+    # una empresa y el empleado no es de la misma; si el empleado tenía otro jefe, deja su equipo
     def agregar_empleado_a_cargo(self, empleado):
+        if empleado in self._equipo_a_cargo:
+            raise ValueError(f"El empleado {empleado.id_empleado} ya está a cargo de {self.id_empleado}")
+        if self._empresa is not None:
+            self._empresa._asignar_jefe(empleado, self)  # Valida y actualiza el organigrama
+        salario_anterior = self.calcular_salario()
         self._equipo_a_cargo.append(empleado)
+        self._avisar_cambio_salario(salario_anterior)  # Cambió el bono de gestión
+
+    def quitar_empleado_a_cargo(self, empleado):
+        salario_anterior = self.calcular_salario()
+        self._equipo_a_cargo.remove(empleado)
+        if self._empresa is not None:
+            self._empresa._quitar_jefe(empleado, self)
+        self._avisar_cambio_salario(salario_anterior)
 
     # POLIMORFISMO: Sobrescribir método para comportamiento específico
     def calcular_salario(self):
         salario_base = super().calcular_salario()
-        bono_gestion = len(self._equipo_a_cargo) * 500  # Bono por empleado a cargo
+        bono_gestion = len(self._equipo_a_cargo) * BONO_GESTION_POR_EMPLEADO  # Bono por empleado a cargo
         return salario_base + bono_gestion
 
     def mostrar_info(self):
         info_base = super().mostrar_info()
         return (f"{info_base}\n"
                 f"Empleados a cargo: {len(self._equipo_a_cargo)}\n"
-                f"Bono de gestión: ${len(self._equipo_a_cargo) * 500:,.2f}")
+                f"Bono de gestión: ${len(self._equipo_a_cargo) * BONO_GESTION_POR_EMPLEADO:,.2f}")
+
+    def datos_nomina(self):
+        datos = super().datos_nomina()
+        datos['empleados_a_cargo'] = len(self._equipo_a_cargo)
+        datos['bono_gestion'] = len(self._equipo_a_cargo) * BONO_GESTION_POR_EMPLEADO
+        return datos
 
     def tipo_empleado(self):
         return "Gerente"
 
 
+# Motor de nómina por columnas
+class NominaColumnar:
+    """
+    Datos de salario de los empleados de una empresa guardados por columnas, para
+    calcular todos los salarios sin llamar a calcular_salario() uno por uno.
+
+    Cada empleado ocupa una fila, en orden de contratación. Los datos que usan las
+    fórmulas (tipo, salario base, bono anual, tarifa por hora, horas semanales, tamaño
+    del equipo) se guardan en arreglos tipados (módulo array). Empresa actualiza la fila
+    al contratar, al despedir y cada vez que un empleado avisa un cambio de salario,
+    así que calcular la nómina es solo la aritmética: con NumPy instalado como
+    operaciones vectorizadas sobre los mismos arreglos (sin copiarlos) y sin NumPy en
+    una sola pasada por las columnas.
+
+    Las operaciones se hacen en el mismo orden que en calcular_salario(), así que cada
+    salario es exactamente el mismo número (en punto flotante de 64 bits). Los
+    empleados de otras subclases, que pueden tener su propia fórmula, se calculan con
+    calcular_salario().
+
+    Despedir deja la fila libre; cuando las filas libres superan la mitad, las columnas
+    se compactan conservando el orden.
+    """
+    # Código de tipo de cada fila. Se compara el tipo exacto porque una subclase puede
+    # cambiar la fórmula.
+    TIEMPO_COMPLETO, MEDIO_TIEMPO, GERENTE, OTRO, LIBRE = 0, 1, 2, 3, -1
+    _CODIGOS = {EmpleadoTiempoCompleto: TIEMPO_COMPLETO, EmpleadoMedioTiempo: MEDIO_TIEMPO,
+                Gerente: GERENTE}
+    # No se compacta con menos filas libres que estas
+    MIN_LIBRES_COMPACTAR = 64
+
+    def __init__(self, empleados=()):
+        self._filas = {}  # ID -> fila
+        self._ids = []  # ID de cada fila (None si está libre)
+        self._tipos = array('b')
+        self._base = array('d')
+        self._bono = array('d')
+        self._tarifa = array('d')
+        self._horas = array('d')
+        self._equipo = array('d')
+        self._otros = {}  # fila -> empleado de otra subclase
+        self._libres = 0
+        for empleado in empleados:
+            self.agregar(empleado)
+
+    def __len__(self):
+        return len(self._filas)
+
+    def _datos(self, empleado):
+        # (tipo, base, bono, tarifa, horas, equipo) del empleado
+        tipo = self._CODIGOS.get(type(empleado), self.OTRO)
+        if tipo == self.MEDIO_TIEMPO:
+            return tipo, 0.0, 0.0, float(empleado._tarifa_hora), float(empleado._horas_semanales), 0.0
+        if tipo == self.OTRO:
+            return tipo, 0.0, 0.0, 0.0, 0.0, 0.0
+        equipo = len(empleado._equipo_a_cargo) if tipo == self.GERENTE else 0
+        return tipo, float(empleado._salario_base), float(empleado._bono_anual), 0.0, 0.0, float(equipo)
+
+    def _escribir(self, fila, datos):
+        (self._tipos[fila], self._base[fila], self._bono[fila],
+         self._tarifa[fila], self._horas[fila], self._equipo[fila]) = datos
+
+    def agregar(self, empleado):
+        datos = self._datos(empleado)
+        fila = len(self._ids)
+        for columna, valor in zip((self._tipos, self._base, self._bono, self._tarifa, self._horas,
+                                   self._equipo), datos):
+            columna.append(valor)
+        self._ids.append(empleado.id_empleado)
+        if datos[0] == self.OTRO:
+            self._otros[fila] = empleado
+        self._filas[empleado.id_empleado] = fila
+
+    def actualizar(self, empleado):
+        """
+        Vuelve a leer los datos del empleado (después de un cambio de salario o de equipo).
+        """
+        self._escribir(self._filas[empleado.id_empleado], self._datos(empleado))
+
+    def quitar(self, id_empleado):
+        fila = self._filas.pop(id_empleado)
+        self._escribir(fila, (self.LIBRE, 0.0, 0.0, 0.0, 0.0, 0.0))
+        self._ids[fila] = None
+        self._otros.pop(fila, None)
+        self._libres += 1
+        if self._libres >= self.MIN_LIBRES_COMPACTAR and self._libres * 2 > len(self._ids):
+            self._compactar()
+
+    def _compactar(self):
+        ocupadas = [fila for fila, tipo in enumerate(self._tipos) if tipo != self.LIBRE]
+        for nombre in ('_tipos', '_base', '_bono', '_tarifa', '_horas', '_equipo'):
+            columna = getattr(self, nombre)
+            setattr(self, nombre, array(columna.typecode, [columna[fila] for fila in ocupadas]))
+        otros = self._otros
+        self._otros = {}
+        for nueva, fila in enumerate(ocupadas):
+            if fila in otros:
+                self._otros[nueva] = otros[fila]
+        self._ids = [self._ids[fila] for fila in ocupadas]
+        self._filas = {id_empleado: fila for fila, id_empleado in enumerate(self._ids)}
+        self._libres = 0
+
+    def salarios(self):
+        """
+        Lista con el salario mensual de cada empleado, en orden de contratación.
+        """
+        if np is not None and self._ids:
+            tipos = np.frombuffer(self._tipos, dtype=np.int8)
+            base = np.frombuffer(self._base, dtype=np.float64)
+            bono = np.frombuffer(self._bono, dtype=np.float64)
+            tiempo_completo = base + bono / 12
+            salarios = np.where(tipos == self.MEDIO_TIEMPO,
+                                np.frombuffer(self._tarifa, dtype=np.float64)
+                                * np.frombuffer(self._horas, dtype=np.float64) * 4,
+                                tiempo_completo)
+            salarios = np.where(tipos == self.GERENTE,
+                                tiempo_completo
+                                + np.frombuffer(self._equipo, dtype=np.float64) * BONO_GESTION_POR_EMPLEADO,
+                                salarios)
+            for fila, empleado in self._otros.items():
+                salarios[fila] = empleado.calcular_salario()
+            if self._libres:
+                salarios = salarios[tipos != self.LIBRE]
+            return salarios.tolist()
+        # Sin NumPy, una sola pasada por las columnas. Las filas libres y las de otras
+        # subclases (con ceros) dan un valor que se descarta o se reemplaza abajo.
+        salarios = [base + bono / 12 if tipo == self.TIEMPO_COMPLETO
+                    else tarifa * horas * 4 if tipo == self.MEDIO_TIEMPO
+                    else base + bono / 12 + equipo * BONO_GESTION_POR_EMPLEADO
+                    for tipo, base, bono, tarifa, horas, equipo
+                    in zip(self._tipos, self._base, self._bono, self._tarifa, self._horas, self._equipo)]
+        for fila, empleado in self._otros.items():
+            salarios[fila] = empleado.calcular_salario()
+        if self._libres:
+            salarios = [salario for salario, tipo in zip(salarios, self._tipos) if tipo != self.LIBRE]
+        return salarios
+
+    def total(self):
+        """
+        Costo total de la nómina. Se suma en orden de contratación, igual que sumando
+        calcular_salario() de cada uno, para obtener el mismo resultado.
+        """
+        return sum(self.salarios())
+
+
+# ABSTRACCIÓN: Formato de salida del reporte de nómina
+class FormatoReporte(ABC):
+    """
+    Convierte las filas del reporte de nómina en texto. Cada fila es el diccionario de
+    datos_nomina() con el salario mensual agregado; el pie recibe los totales
+    calculados al escribir las filas.
+    """
+    # Si es True, cada fila trae además en 'info' el texto de mostrar_info() del empleado
+    necesita_info = False
+    # Si es False, las filas traen solo 'tipo' y 'salario_mensual' (más 'info') y no se
+    # llama a datos_nomina()
+    necesita_datos = True
+
+    @abstractmethod
+    def encabezado(self, nombre_empresa):
+        pass
+
+    @abstractmethod
+    def formatear(self, fila):
+        pass
+
+    def formatear_bloque(self, filas):
+        return "".join(map(self.formatear, filas))
+
+    @abstractmethod
+    def pie(self, totales):
+        pass
+
+
+class ReporteTexto(FormatoReporte):
+    """
+    Reporte para leer en pantalla: el texto de mostrar_info() de cada empleado, así
+    cada tipo (y cada subclase que lo redefina) se muestra con su propio formato.
+    """
+    necesita_info = True
+    necesita_datos = False
+
+    def encabezado(self, nombre_empresa):
+        return f"\n{'=' * 60}\nNÓMINA DE {nombre_empresa.upper()}\n{'=' * 60}\n"
+
+    def formatear(self, fila):
+        return f"\n{fila['info']}\n{'-' * 60}\n"
+
+    def pie(self, totales):
+        return (f"\nTOTAL NÓMINA MENSUAL: ${totales['total_nomina']:,.2f}\n"
+                f"NÚMERO DE EMPLEADOS: {totales['numero_empleados']}\n")
+
+
+class ReporteCSV(FormatoReporte):
+    """
+    Una fila CSV por empleado (los campos que no corresponden a su tipo quedan vacíos)
+    y una última fila TOTAL con el costo total en la columna salario_mensual.
+    """
+    COLUMNAS = ('id_empleado', 'nombre', 'apellido', 'tipo', 'salario_mensual', 'bono_anual',
+                'tarifa_hora', 'horas_semanales', 'empleados_a_cargo', 'bono_gestion', 'beneficios')
+
+    def _escribir(self, filas):
+        texto = io.StringIO()
+        escritor = csv.DictWriter(texto, self.COLUMNAS)
+        for fila in filas:
+            if 'beneficios' in fila:
+                fila = dict(fila, beneficios=", ".join(fila['beneficios']))
+            escritor.writerow(fila)
+        return texto.getvalue()
+
+    def encabezado(self, nombre_empresa):
+        texto = io.StringIO()
+        csv.writer(texto).writerow(self.COLUMNAS)
+        return texto.getvalue()
+
+    def formatear(self, fila):
+        return self._escribir([fila])
+
+    def formatear_bloque(self, filas):
+        return self._escribir(filas)
+
+    def pie(self, totales):
+        return self._escribir([{'id_empleado': 'TOTAL', 'salario_mensual': totales['total_nomina']}])
+
+
+class ReporteJSONL(FormatoReporte):
+    """
+    Un objeto JSON por línea para cada empleado y una última línea con los totales
+    ({"totales": {...}}).
+    """
+
+    def encabezado(self, nombre_empresa):
+        return ""
+
+    def formatear(self, fila):
+        return json.dumps(fila, ensure_ascii=False, default=str) + "\n"
+
+    def pie(self, totales):
+        return json.dumps({'totales': totales}, ensure_ascii=False) + "\n"
+
+
+FORMATOS_REPORTE = {'texto': ReporteTexto, 'csv': ReporteCSV, 'jsonl': ReporteJSONL}
+
+
 # ENCAPSULACIÓN: Clase para gestionar la empresa
 class Empresa:
     """
     Clase que gestiona todos los empleados de la empresa.
     Demuestra ENCAPSULACIÓN al mantener la lista de empleados privada.
+
+    Los empleados se guardan en un diccionario por ID (que conserva el orden de
+    contratación), con índices por tipo y por apellido, así que contratar, buscar y
+    despedir cuestan O(1).
+
+    El costo total de la nómina se mantiene al día: se actualiza al contratar y
+    despedir, y cada empleado contratado avisa a la empresa cuando cambia su salario.
+    Con los mismos avisos se mantienen los datos de salario en columnas
+    (NominaColumnar), así que el reporte calcula todos los salarios de una vez.
+
+    Organigrama: cuando un gerente de la empresa agrega un empleado a cargo, la empresa
+    anota quién es su jefe (cada empleado tiene a lo sumo uno; agregarlo a otro equipo
+    lo cambia de jefe). Para cada empleado se mantienen la cantidad de empleados y el
+    costo mensual de su subárbol (él y todos los que están debajo, directa o
+    indirectamente), así que consultarlos cuesta O(1). Cambiar de jefe, contratar o
+    despedir y cambiar un salario actualizan solo la cadena de jefes hacia arriba,
+    O(profundidad). Los empleados que un gerente ya trae en equipo_a_cargo deben estar
+    contratados antes que él (si no, contratar_empleado lanza ValueError) y al
+    contratarlo pasan a su cargo en el organigrama, como si los agregara uno por uno.
     """
 
     def __init__(self, nombre_empresa):
         self.__nombre_empresa = nombre_empresa
-        self.__empleados = []  # Lista privada de empleados
+        self.__empleados = {}  # Diccionario privado ID -> empleado, en orden de contratación
+        self.__por_tipo = {}  # tipo_empleado() -> {ID: empleado}
+        self.__por_apellido = {}  # apellido en minúsculas -> {ID: empleado}
+        self.__total_nomina = 0  # Suma de los salarios mensuales
+        self.__nomina = NominaColumnar()  # Datos de salario por columnas, en orden de contratación
+        self.__jefe = {}  # ID -> ID del jefe (solo los empleados que tienen jefe)
+        self.__a_cargo = {}  # ID del jefe -> {ID: empleado} de su equipo
+        self.__subarbol = {}  # ID -> [cantidad de empleados, costo mensual] de su subárbol
 
     def contratar_empleado(self, empleado):
         if isinstance(empleado, Empleado):
-            self.__empleados.append(empleado)
+            if empleado._empresa is not None and empleado._empresa is not self:
+                raise ValueError("El empleado ya trabaja en otra empresa")
+            if empleado.id_empleado in self.__empleados:
+                raise ValueError(f"Ya existe un empleado con ID: {empleado.id_empleado}")
+            equipo = empleado._equipo_a_cargo if isinstance(empleado, Gerente) else []
+            for subordinado in equipo:
+                if self.__empleados.get(subordinado.id_empleado) is not subordinado:
+                    raise ValueError(f"El empleado {subordinado.id_empleado} del equipo del gerente "
+                                     f"no trabaja en la empresa")
+            self.__nomina.agregar(empleado)  # Primero, por si sus datos no son números
+            self.__empleados[empleado.id_empleado] = empleado
+            self.__por_tipo.setdefault(empleado.tipo_empleado(), {})[empleado.id_empleado] = empleado
+            self.__por_apellido.setdefault(empleado.apellido.lower(), {})[empleado.id_empleado] = empleado
+            empleado._empresa = self
+            salario = empleado.calcular_salario()
+            self.__total_nomina += salario
+            self.__subarbol[empleado.id_empleado] = [1, salario]
+            for subordinado in equipo:
+                self._asignar_jefe(subordinado, empleado)
             print(f"✓ Empleado {empleado.nombre} {empleado.apellido} contratado exitosamente")
         else:
             raise TypeError("Solo se pueden contratar objetos de tipo Empleado")
 
+    # Quita al empleado del diccionario de un índice secundario, y la clave si quedó vacía
+    @staticmethod
+    def _quitar_de_indice(indice, clave, id_empleado):
+        empleados = indice[clave]
+        del empleados[id_empleado]
+        if not empleados:
+            del indice[clave]
+
     def despedir_empleado(self, id_empleado):
-        for i, empleado in enumerate(self.__empleados):
-            if empleado.id_empleado == id_empleado:
-                empleado_despedido = self.__empleados.pop(i)
-                print(f"✓ Empleado {empleado_despedido.nombre} {empleado_despedido.apellido} despedido")
-                return empleado_despedido
-        print(f"✗ No se encontró empleado con ID: {id_empleado}")
-        return None
+        empleado_despedido = self.__empleados.get(id_empleado)
+        if empleado_despedido is None:
+            print(f"✗ No se encontró empleado con ID: {id_empleado}")
+            return None
+        # Sale del organigrama: su equipo queda sin jefe y él deja el equipo de su jefe
+        for subordinado in list(self.__a_cargo.get(id_empleado, {}).values()):
+            empleado_despedido.quitar_empleado_a_cargo(subordinado)
+        id_jefe = self.__jefe.get(id_empleado)
+        if id_jefe is not None:
+            self.__empleados[id_jefe].quitar_empleado_a_cargo(empleado_despedido)
+        del self.__empleados[id_empleado]
+        del self.__subarbol[id_empleado]
+        self.__nomina.quitar(id_empleado)
+        self._quitar_de_indice(self.__por_tipo, empleado_despedido.tipo_empleado(), id_empleado)
+        self._quitar_de_indice(self.__por_apellido, empleado_despedido.apellido.lower(), id_empleado)
+        empleado_despedido._empresa = None
+        if self.__empleados:
+            self.__total_nomina -= empleado_despedido.calcular_salario()
+        else:
+            self.__total_nomina = 0  # Descarta el error de redondeo acumulado
+        print(f"✓ Empleado {empleado_despedido.nombre} {empleado_despedido.apellido} despedido")
+        return empleado_despedido
 
     def buscar_empleado(self, id_empleado):
-        for empleado in self.__empleados:
-            if empleado.id_empleado == id_empleado:
-                return empleado
-        return None
+        return self.__empleados.get(id_empleado)
+
+    # Empleados de un tipo ("Tiempo Completo", "Medio Tiempo", "Gerente"), en orden de contratación
+    def buscar_por_tipo(self, tipo):
+        return list(self.__por_tipo.get(tipo, {}).values())
+
+    # Empleados con ese apellido (sin distinguir mayúsculas), en orden de contratación
+    def buscar_por_apellido(self, apellido):
+        return list(self.__por_apellido.get(apellido.lower(), {}).values())
 
-    # POLIMORFISMO: Funciona con cualquier tipo de empleado
+    # POLIMORFISMO: Funciona con cualquier tipo de empleado (el reporte de texto usa
+    # el mostrar_info() de cada uno)
     def mostrar_nomina(self):
         if not self.__empleados:
             print("No hay empleados registrados")
             return
 
-        print(f"\n{'=' * 60}")
-        print(f"NÓMINA DE {self.__nombre_empresa.upper()}")
-        print(f"{'=' * 60}")
-
+        self.exportar_nomina(sys.stdout)
+        sys.stdout.flush()
+
+    def filas_nomina(self, incluir_info=False, incluir_datos=True):
+        """
+        Genera las filas del reporte de nómina (datos_nomina() de cada empleado, o solo
+        su tipo si incluir_datos es False, más su salario mensual y, con incluir_info,
+        el texto de mostrar_info() en 'info'), en orden de contratación. Los salarios
+        salen de las columnas que la empresa mantiene al día.
+        """
+        for empleado, salario in zip(self.__empleados.values(), self.__nomina.salarios()):
+            fila = empleado.datos_nomina() if incluir_datos else {'tipo': empleado.tipo_empleado()}
+            fila['salario_mensual'] = salario
+            if incluir_info:
+                fila['info'] = empleado.mostrar_info()
+            yield fila
+
+    def exportar_nomina(self, destino, formato='texto', tamano_bloque=TAMANO_BLOQUE_REPORTE):
+        """
+        Escribe el reporte de nómina en destino (ruta de archivo o archivo abierto).
+
+        formato es 'texto', 'csv', 'jsonl' o un FormatoReporte. Las filas se formatean y escriben de a
+        bloques de tamano_bloque empleados. Los totales del pie se suman mientras se
+        recorren las filas, en una sola pasada.
+
+        Devuelve los totales: número de empleados, total de la nómina y, por tipo,
+        cantidad de empleados y costo.
+        """
+        if isinstance(destino, (str, os.PathLike)):
+            with open(destino, 'w', encoding='utf-8', newline='', buffering=TAMANO_BUFER_REPORTE) as archivo:
+                return self.exportar_nomina(archivo, formato, tamano_bloque)
+        if isinstance(formato, str):
+            formato = FORMATOS_REPORTE[formato]()
+
+        por_tipo = {}
+        numero_empleados = 0
         total_nomina = 0
-        for empleado in self.__empleados:
-            print(f"\n{empleado.mostrar_info()}")
-            total_nomina += empleado.calcular_salario()
-            print("-" * 60)
-
-        print(f"\nTOTAL NÓMINA MENSUAL: ${total_nomina:,.2f}")
-        print(f"NÚMERO DE EMPLEADOS: {len(self.__empleados)}")
-
+        filas = self.filas_nomina(formato.necesita_info, formato.necesita_datos)
+        destino.write(formato.encabezado(self.__nombre_empresa))
+        while True:
+            bloque = list(islice(filas, tamano_bloque))
+            if not bloque:
+                break
+            for fila in bloque:
+                salario = fila['salario_mensual']
+                total_nomina += salario
+                tipo = por_tipo.get(fila['tipo'])
+                if tipo is None:
+                    tipo = por_tipo[fila['tipo']] = {'empleados': 0, 'costo': 0}
+                tipo['empleados'] += 1
+                tipo['costo'] += salario
+            numero_empleados += len(bloque)
+            destino.write(formato.formatear_bloque(bloque))
+        totales = {'numero_empleados': numero_empleados, 'total_nomina': total_nomina, 'por_tipo': por_tipo}
+        destino.write(formato.pie(totales))
+        return totales
+
+    # Lo llaman los empleados contratados cuando cambia su salario
+    def _salario_cambiado(self, empleado, salario_anterior, salario_nuevo):
+        diferencia = salario_nuevo - salario_anterior
+        self.__total_nomina += diferencia
+        self.__nomina.actualizar(empleado)
+        self._sumar_en_cadena(empleado.id_empleado, 0, diferencia)
+
+    # ORGANIGRAMA
+
+    # Suma a los totales del subárbol del empleado y de todos sus jefes hacia arriba
+    def _sumar_en_cadena(self, id_empleado, cantidad, costo):
+        while id_empleado is not None:
+            totales = self.__subarbol[id_empleado]
+            totales[0] += cantidad
+            totales[1] += costo
+            id_empleado = self.__jefe.get(id_empleado)
+
+    # Lo llama Gerente.agregar_empleado_a_cargo antes de agregar al empleado a su equipo, y
+    # contratar_empleado para el equipo que el gerente ya traía
+    def _asignar_jefe(self, empleado, jefe):
+        id_empleado = empleado.id_empleado
+        if self.__empleados.get(id_empleado) is not empleado:
+            raise ValueError(f"El empleado {id_empleado} no trabaja en la empresa del gerente")
+        # Hay un ciclo si el empleado es el nuevo jefe o uno de los jefes del nuevo jefe
+        id_actual = jefe.id_empleado
+        while id_actual is not None:
+            if id_actual == id_empleado:
+                raise ValueError(f"Poner a {id_empleado} a cargo de {jefe.id_empleado} formaría un ciclo")
+            id_actual = self.__jefe.get(id_actual)
+        id_anterior = self.__jefe.get(id_empleado)
+        if id_anterior == jefe.id_empleado:
+            raise ValueError(f"El empleado {id_empleado} ya está a cargo de {jefe.id_empleado}")
+        if id_anterior is not None:
+            self.__empleados[id_anterior].quitar_empleado_a_cargo(empleado)
+        self.__jefe[id_empleado] = jefe.id_empleado
+        self.__a_cargo.setdefault(jefe.id_empleado, {})[id_empleado] = empleado
+        cantidad, costo = self.__subarbol[id_empleado]
+        self._sumar_en_cadena(jefe.id_empleado, cantidad, costo)
+
+    # Lo llama Gerente.quitar_empleado_a_cargo
+    def _quitar_jefe(self, empleado, jefe):
+        id_empleado = empleado.id_empleado
+        if self.__empleados.get(id_empleado) is not empleado or self.__jefe.get(id_empleado) != jefe.id_empleado:
+            return  # No estaba en el organigrama
+        del self.__jefe[id_empleado]
+        self._quitar_de_indice(self.__a_cargo, jefe.id_empleado, id_empleado)
+        cantidad, costo = self.__subarbol[id_empleado]
+        self._sumar_en_cadena(jefe.id_empleado, -cantidad, -costo)
+
+    def jefe_de(self, id_empleado):
+        id_jefe = self.__jefe.get(id_empleado)
+        return None if id_jefe is None else self.__empleados[id_jefe]
+
+    # Equipo directo del empleado dentro del organigrama, en el orden en que se asignó
+    def equipo_de(self, id_empleado):
+        return list(self.__a_cargo.get(id_empleado, {}).values())
+
+    # O(1): cantidad de empleados del subárbol (el empleado incluido)
+    def empleados_subarbol(self, id_empleado):
+        return self.__subarbol[id_empleado][0]
+
+    # O(1): costo mensual del subárbol, el salario del empleado incluido
+    def costo_subarbol(self, id_empleado):
+        return self.__subarbol[id_empleado][1]
+
+    def verificar_organigrama(self):
+        """
+        Recalcula los totales de cada subárbol recorriendo la cadena de jefes de cada
+        empleado y devuelve un diccionario ID -> (totales mantenidos, recalculados) con
+        los que no coinciden (vacío si todo está bien). El costo se compara con
+        tolerancia, como en verificar_total_nomina.
+        """
+        recalculados = {id_empleado: [0, 0] for id_empleado in self.__empleados}
+        for id_empleado, empleado in self.__empleados.items():
+            salario = empleado.calcular_salario()
+            id_actual = id_empleado
+            while id_actual is not None:
+                recalculados[id_actual][0] += 1
+                recalculados[id_actual][1] += salario
+                id_actual = self.__jefe.get(id_actual)
+        distintos = {}
+        for id_empleado, (cantidad, costo) in recalculados.items():
+            cantidad_mantenida, costo_mantenido = self.__subarbol[id_empleado]
+            if cantidad != cantidad_mantenida or not math.isclose(costo_mantenido, costo,
+                                                                  rel_tol=1e-9, abs_tol=1e-6):
+                distintos[id_empleado] = ((cantidad_mantenida, costo_mantenido), (cantidad, costo))
+        return distintos
+
+    # O(1): devuelve el total mantenido al día
     def calcular_costo_total_nomina(self):
-        return sum(empleado.calcular_salario() for empleado in self.__empleados)
+        return self.__total_nomina
+
+    # Vuelve a sumar todos los salarios y reemplaza el total mantenido
+    def recalcular_costo_total_nomina(self):
+        self.__total_nomina = sum(empleado.calcular_salario() for empleado in self.__empleados.values())
+        return self.__total_nomina
+
+    def verificar_total_nomina(self):
+        """
+        Compara el total mantenido con la suma de todos los salarios (con
+        calcular_salario(), sin usar las columnas). Devuelve None si coinciden o (total
+        mantenido, total recalculado) si no. Se compara con tolerancia, porque sumar y
+        restar salarios de a uno acumula un pequeño error de redondeo.
+        """
+        recalculado = sum(empleado.calcular_salario() for empleado in self.__empleados.values())
+        if math.isclose(self.__total_nomina, recalculado, rel_tol=1e-9, abs_tol=1e-6):
+            return None
+        return self.__total_nomina, recalculado
 
     @property
     def total_empleados(self):
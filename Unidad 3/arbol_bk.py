@@ -0,0 +1,155 @@
+"""
+Árbol BK para buscar nombres de productos con errores de tipeo.
+
+Cada nodo guarda un nombre (en minúsculas) y sus hijos cuelgan según la distancia
+de edición (Levenshtein) al nombre del nodo. Por la desigualdad triangular, al buscar
+los nombres a distancia <= k de un texto, de un nodo a distancia d solo hace falta
+visitar los hijos colgados en las distancias d-k .. d+k, lo que evita comparar el
+texto con la mayor parte de los nombres.
+"""
+
+
+def distancia_edicion(a, b):
+    """
+    Distancia de Levenshtein: mínimo de inserciones, eliminaciones y sustituciones
+    de un carácter para convertir a en b.
+
+    Usa el algoritmo de vectores de bits de Myers: cada columna de la tabla de
+    programación dinámica se guarda en un entero de Python (un bit por carácter de la
+    palabra más corta), así que procesar un carácter son unas pocas operaciones
+    entre enteros en lugar de un ciclo sobre la otra palabra.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    # Bits de las posiciones de b donde aparece cada carácter.
+    posiciones = {}
+    bit = 1
+    for caracter in b:
+        posiciones[caracter] = posiciones.get(caracter, 0) | bit
+        bit <<= 1
+    todos = bit - 1
+    ultimo = bit >> 1
+    # vp / vn: diferencias verticales +1 / -1 de la columna actual.
+    vp = todos
+    vn = 0
+    distancia = len(b)
+    for caracter in a:
+        iguales = posiciones.get(caracter, 0)
+        xv = iguales | vn
+        xh = (((iguales & vp) + vp) ^ vp) | iguales
+        hp = vn | ~(xh | vp)
+        hn = vp & xh
+        if hp & ultimo:
+            distancia += 1
+        elif hn & ultimo:
+            distancia -= 1
+        hp = (hp << 1) | 1
+        hn <<= 1
+        vp = (hn | ~(xv | hp)) & todos
+        vn = hp & xv
+    return distancia
+
+
+class ArbolBK:
+    """
+    Árbol BK de nombres. Cada nombre tiene el conjunto de claves (IDs) de los
+    productos que lo usan.
+
+    Un nodo no se puede quitar sin reconstruir sus subárboles, así que al eliminar la
+    última clave de un nombre el nodo queda vacío y se sigue usando para recorrer el
+    árbol. Cuando los nodos vacíos superan la mitad, el árbol se reconstruye.
+    """
+    # Nodo: [nombre, conjunto de claves, {distancia: nodo hijo}]
+
+    def __init__(self, entradas=()):
+        self._raiz = None
+        self._nodos = 0
+        self._vacios = 0
+        # clave -> nombre, para poder quitar una clave sin recibir su nombre.
+        self._nombres = {}
+        for clave, nombre in entradas:
+            self.agregar(clave, nombre)
+
+    def __len__(self):
+        return len(self._nombres)
+
+    def agregar(self, clave, nombre):
+        """
+        Agrega (o cambia) el nombre de una clave.
+        """
+        if clave in self._nombres:
+            self.eliminar(clave)
+        nombre = nombre.lower()
+        self._nombres[clave] = nombre
+        if self._raiz is None:
+            self._raiz = [nombre, {clave}, {}]
+            self._nodos = 1
+            return
+        nodo = self._raiz
+        while True:
+            d = distancia_edicion(nombre, nodo[0])
+            if d == 0:
+                if not nodo[1]:
+                    self._vacios -= 1
+                nodo[1].add(clave)
+                return
+            hijo = nodo[2].get(d)
+            if hijo is None:
+                nodo[2][d] = [nombre, {clave}, {}]
+                self._nodos += 1
+                return
+            nodo = hijo
+
+    def eliminar(self, clave):
+        """
+        Quita una clave. No hace nada si no está.
+        """
+        nombre = self._nombres.pop(clave, None)
+        if nombre is None:
+            return
+        nodo = self._raiz
+        while True:
+            d = distancia_edicion(nombre, nodo[0])
+            if d == 0:
+                break
+            nodo = nodo[2][d]
+        nodo[1].discard(clave)
+        if not nodo[1]:
+            self._vacios += 1
+            if self._vacios * 2 > self._nodos:
+                self._reconstruir()
+
+    def _reconstruir(self):
+        nombres = self._nombres
+        self._raiz = None
+        self._nodos = 0
+        self._vacios = 0
+        self._nombres = {}
+        for clave, nombre in nombres.items():
+            self.agregar(clave, nombre)
+
+    def buscar(self, texto, maxima_distancia):
+        """
+        Devuelve una lista de (distancia, nombre, claves) con los nombres a distancia
+        <= maxima_distancia del texto (sin distinguir mayúsculas), de la más cercana
+        a la más lejana y, a igual distancia, por nombre.
+        """
+        if self._raiz is None:
+            return []
+        texto = texto.lower()
+        encontrados = []
+        pendientes = [self._raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            d = distancia_edicion(texto, nodo[0])
+            if d <= maxima_distancia and nodo[1]:
+                encontrados.append((d, nodo[0], sorted(nodo[1])))
+            for distancia_hijo, hijo in nodo[2].items():
+                if d - maxima_distancia <= distancia_hijo <= d + maxima_distancia:
+                    pendientes.append(hijo)
+        encontrados.sort(key=lambda encontrado: encontrado[:2])
+        return encontrados
@@ -0,0 +1,402 @@
+"""
+Benchmark comparativo de los tres Inventario de la unidad:
+
+- semana_9:  lista en memoria, sin archivo.
+- semana_10: lista con índice por ID; cada cambio reescribe el archivo completo.
+- semana11:  diccionario; guarda el archivo solo al salir.
+
+Los tres se someten a las mismas cargas de trabajo, con 10^3 a 10^6 productos:
+carga inicial, altas, actualizaciones, bajas, búsquedas por nombre, listado completo
+y guardado. De cada una se registra el tiempo, el pico de memoria (tracemalloc) y
+los bytes leídos y escritos (/proc/self/io, solo en Linux).
+
+Cada combinación de implementación y tamaño se ejecuta en un proceso aparte, para
+que la memoria y los cachés de una no afecten a otra. Dentro del proceso, cada
+carga se ejecuta dos veces sobre inventarios idénticos (mismas semillas): una
+medición de tiempo sin tracemalloc, que lo haría más lento, y otra de memoria.
+
+Las operaciones sueltas (altas, bajas, etc.) tienen un presupuesto de tiempo: si se
+agota antes de completarlas, se informan las que se hicieron y el tiempo por
+operación. Así semana_10 con un millón de productos (que reescribe el archivo en
+cada cambio) termina en un tiempo razonable.
+
+Los resultados se guardan en JSON (por defecto en el directorio temporal del sistema,
+fuera del repositorio; --salida elige otro archivo); con --comparar se marcan las
+cargas que se volvieron más lentas que en un archivo de resultados anterior.
+
+Uso:
+    python benchmark_inventarios.py [tamano_maximo] [--salida archivo.json]
+                                    [--operaciones N] [--comparar anterior.json]
+"""
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import semana_9
+import semana_10
+import semana11
+
+TAMANOS = [1_000, 10_000, 100_000, 1_000_000]
+OPERACIONES = 1_000
+# Segundos máximos por carga de trabajo de operaciones sueltas.
+PRESUPUESTO_SEGUNDOS = 10.0
+# Una carga se considera más lenta si supera a la anterior en esta proporción.
+TOLERANCIA_REGRESION = 0.20
+PALABRAS = ("Laptop", "Mouse", "Teclado", "Monitor", "Cable", "Parlante", "Cámara", "Disco")
+
+
+def registros(n):
+    """
+    Los n productos iniciales, iguales para las tres implementaciones.
+    """
+    return [(i, f"{PALABRAS[i % len(PALABRAS)]} {i}", i % 100, 1.0 + i % 500) for i in range(n)]
+
+
+class Implementacion:
+    """
+    Adapta una implementación a las operaciones del benchmark.
+    tamano_maximo limita los tamaños a los que se ejecuta (None = sin límite).
+    """
+    nombre = None
+    tamano_maximo = None
+
+    def __init__(self, directorio):
+        self.archivo = os.path.join(directorio, f"{self.nombre}.txt")
+
+    def preparar(self, datos):
+        """
+        Escribe el archivo inicial (fuera de la medición).
+        """
+
+    def clave(self, i):
+        return i
+
+
+class Semana9(Implementacion):
+    nombre = 'semana_9'
+    # No tiene archivo: la carga son n altas, y cada alta busca el ID recorriendo la lista.
+    tamano_maximo = 10_000
+
+    def preparar(self, datos):
+        self.datos = datos
+
+    def cargar(self):
+        inventario = semana_9.Inventario()
+        for registro in self.datos:
+            inventario.agregar_producto(semana_9.Producto(*registro))
+        return inventario
+
+    def agregar(self, inventario, registro):
+        inventario.agregar_producto(semana_9.Producto(*registro))
+
+    def actualizar(self, inventario, clave, cantidad, precio):
+        inventario.actualizar_producto(clave, nueva_cantidad=cantidad, nuevo_precio=precio)
+
+    def eliminar(self, inventario, clave):
+        inventario.eliminar_producto(clave)
+
+    def buscar(self, inventario, texto):
+        return inventario.buscar_por_nombre(texto)
+
+    def listar(self, inventario):
+        inventario.mostrar_inventario()
+
+    guardar = None
+
+
+class Semana10(Semana9):
+    nombre = 'semana_10'
+    tamano_maximo = None
+
+    def preparar(self, datos):
+        with open(self.archivo, 'w') as f:
+            for registro in datos:
+                f.write(','.join(map(str, registro)) + '\n')
+
+    def cargar(self):
+        return semana_10.Inventario(self.archivo)
+
+    def agregar(self, inventario, registro):
+        inventario.agregar_producto(semana_10.Producto(*registro))
+
+    def guardar(self, inventario):
+        inventario.guardar_inventario()
+
+
+class Semana11(Implementacion):
+    nombre = 'semana11'
+
+    def preparar(self, datos):
+        with open(self.archivo, 'w') as f:
+            for registro in datos:
+                f.write('|'.join(map(str, registro)) + '\n')
+
+    def clave(self, i):
+        return str(i)
+
+    def cargar(self):
+        inventario = semana11.Inventario()
+        inventario.cargar_inventario(self.archivo)
+        return inventario
+
+    def agregar(self, inventario, registro):
+        inventario.agregar_producto(semana11.Producto(str(registro[0]), *registro[1:]))
+
+    def actualizar(self, inventario, clave, cantidad, precio):
+        inventario.actualizar_producto(clave, cantidad, precio)
+
+    def eliminar(self, inventario, clave):
+        inventario.eliminar_producto(clave)
+
+    def buscar(self, inventario, texto):
+        return inventario.buscar_producto_por_nombre(texto)
+
+    def listar(self, inventario):
+        inventario.mostrar_todos_los_productos()
+
+    def guardar(self, inventario):
+        inventario.guardar_inventario(self.archivo)
+
+
+IMPLEMENTACIONES = {clase.nombre: clase for clase in (Semana9, Semana10, Semana11)}
+
+
+class SalidaDescartada:
+    """
+    Reemplaza a stdout durante las mediciones: descarta lo que imprimen los
+    inventarios sin hacer llamadas al sistema, así esos mensajes no se cuentan como
+    bytes escritos (escribir en /dev/null sí sumaría en wchar).
+    """
+    def write(self, texto):
+        return len(texto)
+
+    def flush(self):
+        pass
+
+
+# Bytes que leyó leer_io de /proc/self/io (se descuentan de rchar).
+_leidos_por_leer_io = 0
+
+
+def leer_io():
+    """
+    Bytes leídos y escritos por el proceso (rchar/wchar de /proc/self/io), o None
+    si el sistema no lo informa. Incluyen las lecturas y escrituras que resuelve el
+    caché del sistema operativo, pero no la salida de los inventarios (ver
+    SalidaDescartada).
+    """
+    global _leidos_por_leer_io
+    try:
+        with open('/proc/self/io') as f:
+            texto = f.read()
+        valores = dict(linea.split(': ') for linea in texto.splitlines())
+        # rchar incluye las lecturas anteriores de este mismo archivo, no la actual.
+        leidos = int(valores['rchar']) - _leidos_por_leer_io
+        _leidos_por_leer_io += len(texto)
+        return leidos, int(valores['wchar'])
+    except (IOError, KeyError, ValueError):
+        return None
+
+
+def plan_de_operaciones(n, operaciones):
+    """
+    Argumentos de cada carga de trabajo, generados con semillas fijas para que las
+    dos pasadas (tiempo y memoria) hagan exactamente lo mismo.
+    """
+    generador = random.Random(n)
+    altas = [(n + i, f"{PALABRAS[i % len(PALABRAS)]} nuevo {i}", 1, 9.5) for i in range(operaciones)]
+    actualizaciones = [(generador.randrange(n), generador.randrange(100), 1.0 + generador.randrange(500))
+                       for _ in range(operaciones)]
+    bajas = generador.sample(range(n), min(n, operaciones))
+    busquedas = [f"{PALABRAS[i % len(PALABRAS)]} {generador.randrange(n)}"[-6:] for i in range(operaciones)]
+    return {'agregar': altas, 'actualizar': actualizaciones, 'eliminar': bajas, 'buscar_nombre': busquedas}
+
+
+def ejecutar_cargas(implementacion, n, plan, limites, medir_memoria):
+    """
+    Ejecuta las cargas de trabajo en orden sobre un inventario nuevo. Con limites
+    (cantidad de operaciones por carga) se repite exactamente lo que hizo otra pasada.
+    Devuelve {carga: {...mediciones...}}.
+    """
+    resultados = {}
+    inventario = None
+
+    def medir(nombre, funcion, argumentos=None):
+        nonlocal inventario
+        gc.collect()
+        if medir_memoria:
+            tracemalloc.start()
+        io_inicio = leer_io()
+        inicio = time.perf_counter()
+        hechas = 0
+        if argumentos is None:
+            resultado = funcion()
+            if nombre == 'carga':
+                inventario = resultado
+            hechas = 1
+        else:
+            limite = limites[nombre] if limites else len(argumentos)
+            for argumento in argumentos[:limite]:
+                funcion(argumento)
+                hechas += 1
+                if not limites and time.perf_counter() - inicio > PRESUPUESTO_SEGUNDOS:
+                    break
+        segundos = time.perf_counter() - inicio
+        io_fin = leer_io()
+        medicion = {'operaciones': hechas, 'segundos': segundos,
+                    'us_por_operacion': segundos / hechas * 1e6 if hechas else None}
+        if io_inicio and io_fin:
+            medicion['bytes_leidos'] = io_fin[0] - io_inicio[0]
+            medicion['bytes_escritos'] = io_fin[1] - io_inicio[1]
+        if medir_memoria:
+            medicion['memoria_pico_bytes'] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        resultados[nombre] = medicion
+
+    i = implementacion
+    clave = i.clave
+    medir('carga', i.cargar)
+    medir('agregar', lambda r: i.agregar(inventario, r), plan['agregar'])
+    medir('actualizar', lambda a: i.actualizar(inventario, clave(a[0]), a[1], a[2]), plan['actualizar'])
+    medir('eliminar', lambda k: i.eliminar(inventario, clave(k)), plan['eliminar'])
+    medir('buscar_nombre', lambda texto: i.buscar(inventario, texto), plan['buscar_nombre'])
+    medir('listar', lambda: i.listar(inventario))
+    if i.guardar is not None:
+        medir('guardar', lambda: i.guardar(inventario))
+    return resultados
+
+
+def ejecutar_caso(nombre, n, operaciones):
+    """
+    Mide una implementación con un tamaño (se llama en el proceso hijo).
+    """
+    with tempfile.TemporaryDirectory() as directorio:
+        implementacion = IMPLEMENTACIONES[nombre](directorio)
+        implementacion.preparar(registros(n))
+        plan = plan_de_operaciones(n, operaciones)
+        with contextlib.redirect_stdout(SalidaDescartada()):
+            tiempos = ejecutar_cargas(implementacion, n, plan, None, medir_memoria=False)
+            # La segunda pasada parte del mismo archivo inicial.
+            implementacion.preparar(registros(n))
+            limites = {carga: medicion['operaciones'] for carga, medicion in tiempos.items()}
+            memoria = ejecutar_cargas(implementacion, n, plan, limites, medir_memoria=True)
+    for carga, medicion in tiempos.items():
+        medicion['memoria_pico_bytes'] = memoria[carga]['memoria_pico_bytes']
+    return tiempos
+
+
+def ejecutar_en_proceso(nombre, n, operaciones):
+    """
+    Ejecuta un caso en un proceso nuevo y devuelve sus resultados.
+    """
+    proceso = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--caso', nombre, str(n), str(operaciones)],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if proceso.returncode != 0:
+        return {'error': proceso.stderr.strip().splitlines()[-1] if proceso.stderr.strip() else 'error'}
+    return json.loads(proceso.stdout)
+
+
+def comparar(anterior, actual, tolerancia=TOLERANCIA_REGRESION):
+    """
+    Devuelve las cargas de trabajo cuyo tiempo por operación empeoró más que la
+    tolerancia respecto de un resultado anterior.
+    """
+    previos = {(r['implementacion'], r['tamano']): r for r in anterior['resultados']}
+    regresiones = []
+    for resultado in actual['resultados']:
+        previo = previos.get((resultado['implementacion'], resultado['tamano']))
+        if not previo or 'cargas' not in previo or 'cargas' not in resultado:
+            continue
+        for carga, medicion in resultado['cargas'].items():
+            antes = previo['cargas'].get(carga, {}).get('us_por_operacion')
+            ahora = medicion.get('us_por_operacion')
+            if antes and ahora and ahora > antes * (1 + tolerancia):
+                regresiones.append((resultado['implementacion'], resultado['tamano'], carga, antes, ahora))
+    return regresiones
+
+
+def imprimir_tabla(resultados):
+    print(f"{'implementación':<11} {'productos':>9} {'carga':<14} {'ops':>6} {'us/op':>12} "
+          f"{'memoria pico':>14} {'leídos':>12} {'escritos':>12}")
+    for resultado in resultados:
+        if 'cargas' not in resultado:
+            print(f"{resultado['implementacion']:<11} {resultado['tamano']:>9} "
+                  f"{resultado.get('omitido') or resultado.get('error')}")
+            continue
+        for carga, m in resultado['cargas'].items():
+            print(f"{resultado['implementacion']:<11} {resultado['tamano']:>9} {carga:<14} "
+                  f"{m['operaciones']:>6} {m['us_por_operacion']:>12.1f} "
+                  f"{m['memoria_pico_bytes']:>14,} {m.get('bytes_leidos', 0):>12,} "
+                  f"{m.get('bytes_escritos', 0):>12,}")
+
+
+def main():
+    argumentos = sys.argv[1:]
+    if argumentos[:1] == ['--caso']:
+        nombre, n, operaciones = argumentos[1], int(argumentos[2]), int(argumentos[3])
+        print(json.dumps(ejecutar_caso(nombre, n, operaciones)))
+        return
+
+    def opcion(nombre, defecto):
+        if nombre in argumentos:
+            posicion = argumentos.index(nombre)
+            valor = argumentos[posicion + 1]
+            del argumentos[posicion:posicion + 2]
+            return valor
+        return defecto
+
+    salida = opcion('--salida', os.path.join(tempfile.gettempdir(), 'benchmark_resultados.json'))
+    operaciones = int(opcion('--operaciones', OPERACIONES))
+    anterior = opcion('--comparar', None)
+    tamano_maximo = int(argumentos[0]) if argumentos else TAMANOS[-1]
+
+    resultados = []
+    for nombre, clase in IMPLEMENTACIONES.items():
+        for n in TAMANOS:
+            if n > tamano_maximo:
+                continue
+            resultado = {'implementacion': nombre, 'tamano': n}
+            if clase.tamano_maximo is not None and n > clase.tamano_maximo:
+                resultado['omitido'] = f"omitido: la carga es cuadrática por encima de {clase.tamano_maximo}"
+            else:
+                print(f"Midiendo {nombre} con {n} productos...", flush=True)
+                cargas = ejecutar_en_proceso(nombre, n, operaciones)
+                if 'error' in cargas:
+                    resultado['error'] = cargas['error']
+                else:
+                    resultado['cargas'] = cargas
+            resultados.append(resultado)
+
+    informe = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'operaciones': operaciones,
+        'presupuesto_segundos': PRESUPUESTO_SEGUNDOS,
+        'resultados': resultados,
+    }
+    with open(salida, 'w') as f:
+        json.dump(informe, f, indent=2)
+    imprimir_tabla(resultados)
+    print(f"Resultados guardados en {salida}")
+
+    if anterior:
+        with open(anterior) as f:
+            regresiones = comparar(json.load(f), informe)
+        for nombre, n, carga, antes, ahora in regresiones:
+            print(f"Regresión: {nombre} con {n} productos, {carga}: {antes:.1f} -> {ahora:.1f} us/op")
+        if not regresiones:
+            print("Sin regresiones respecto de la medición anterior.")
+
+
+if __name__ == "__main__":
+    main()
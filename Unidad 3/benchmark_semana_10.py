@@ -0,0 +1,78 @@
+"""
+Benchmark del índice por ID del Inventario de semana_10.
+
+Mide la latencia por operación (buscar, actualizar, eliminar y volver a agregar)
+con inventarios de 1.000 a 1.000.000 de productos. Con el índice, el tiempo por
+operación debe mantenerse prácticamente constante al crecer el inventario.
+
+La escritura a disco se desactiva durante la medición para aislar el costo de
+las estructuras en memoria.
+
+Uso: python benchmark_semana_10.py [operaciones_por_tamano]
+"""
+import contextlib
+import os
+import random
+import sys
+import tempfile
+import time
+
+from semana_10 import Inventario, Producto
+
+TAMANOS = [1_000, 10_000, 100_000, 1_000_000]
+
+
+class InventarioSinDisco(Inventario):
+    """
+    Inventario que no escribe en disco, para medir solo las operaciones en memoria.
+    """
+    def guardar_inventario(self):
+        pass
+
+
+def crear_inventario(n):
+    """
+    Crea un inventario vacío (sin archivo) y lo llena con n productos.
+    """
+    ruta = os.path.join(tempfile.gettempdir(), "benchmark_semana_10_no_existe.txt")
+    inventario = InventarioSinDisco(ruta)
+    for i in range(n):
+        inventario.agregar_producto(Producto(i, f"Producto {i}", i % 100, 1.0 + i % 50))
+    return inventario
+
+
+def medir(funcion, argumentos):
+    """
+    Ejecuta la función con cada argumento y devuelve los microsegundos por operación.
+    """
+    inicio = time.perf_counter()
+    for argumento in argumentos:
+        funcion(argumento)
+    return (time.perf_counter() - inicio) / len(argumentos) * 1e6
+
+
+def main():
+    operaciones = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    generador = random.Random(42)
+
+    print(f"{'productos':>10} | {'buscar (us)':>11} | {'actualizar (us)':>15} | {'eliminar+agregar (us)':>21}")
+    print("-" * 67)
+    for n in TAMANOS:
+        with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+            inventario = crear_inventario(n)
+            ids = [generador.randrange(n) for _ in range(operaciones)]
+
+            t_buscar = medir(inventario.buscar_por_id, ids)
+            t_actualizar = medir(lambda i: inventario.actualizar_producto(i, nueva_cantidad=7), ids)
+
+            def reemplazar(i):
+                producto = inventario.buscar_por_id(i)
+                inventario.eliminar_producto(i)
+                inventario.agregar_producto(producto)
+
+            t_reemplazar = medir(reemplazar, ids)
+        print(f"{n:>10} | {t_buscar:>11.3f} | {t_actualizar:>15.3f} | {t_reemplazar:>21.3f}")
+
+
+if __name__ == "__main__":
+    main()
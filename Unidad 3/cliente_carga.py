@@ -0,0 +1,120 @@
+"""
+Generador de carga para servidor_inventario.py.
+
+Abre varias conexiones a la vez (una por terminal simulada). Cada una envía
+solicitudes de a una, esperando la respuesta antes de mandar la siguiente, con una
+mezcla parecida a la de un punto de venta: sobre todo consultas por ID, algunas
+actualizaciones de stock, búsquedas por nombre y pocas altas y bajas. Al final
+informa las solicitudes por segundo y la latencia (mediana, p99 y máxima).
+
+Uso: python cliente_carga.py [clientes] [solicitudes_por_cliente] [puerto o socket]
+"""
+import asyncio
+import math
+import random
+import sys
+import time
+
+from servidor_inventario import PUERTO, leer_direccion
+
+# Productos que se dan de alta antes de medir (IDs "C0", "C1", ...).
+PRODUCTOS_INICIALES = 10_000
+# Proporción de cada tipo de solicitud.
+MEZCLA = (('G', 0.70), ('U', 0.15), ('B', 0.10), ('A', 0.025), ('E', 0.025))
+NOMBRES = ("Laptop", "Mouse", "Teclado", "Monitor", "Cable", "Parlante", "Cámara", "Disco")
+
+
+async def conectar(direccion):
+    if isinstance(direccion, int):
+        return await asyncio.open_connection('127.0.0.1', direccion)
+    return await asyncio.open_unix_connection(direccion)
+
+
+async def enviar(lector, escritor, solicitud):
+    """
+    Envía una solicitud y lee su respuesta completa. Devuelve True si fue OK.
+    """
+    escritor.write(solicitud.encode('utf-8'))
+    await escritor.drain()
+    respuesta = await lector.readline()
+    if solicitud.startswith('B') and respuesta.startswith(b'OK'):
+        # Una búsqueda responde con la cantidad de resultados y luego una línea por cada uno.
+        for _ in range(int(respuesta.split(b'\t')[1])):
+            await lector.readline()
+    return respuesta.startswith(b'OK')
+
+
+def crear_solicitud(generador):
+    tipo = generador.choices([t for t, _ in MEZCLA], [p for _, p in MEZCLA])[0]
+    producto_id = f"C{generador.randrange(PRODUCTOS_INICIALES)}"
+    if tipo == 'G':
+        return f"G\t{producto_id}\n"
+    if tipo == 'U':
+        return f"U\t{producto_id}\t{generador.randrange(100)}\t\t\n"
+    if tipo == 'B':
+        return f"B\t20\t{generador.choice(NOMBRES)[:4]}\n"
+    if tipo == 'A':
+        return f"A\t{producto_id}\t{generador.randrange(100)}\t9.99\t{generador.choice(NOMBRES)} {producto_id}\n"
+    return f"E\t{producto_id}\n"
+
+
+async def preparar(direccion):
+    """
+    Da de alta los productos iniciales (los que ya existen se dejan como están).
+    """
+    lector, escritor = await conectar(direccion)
+    for i in range(PRODUCTOS_INICIALES):
+        nombre = f"{NOMBRES[i % len(NOMBRES)]} {i}"
+        await enviar(lector, escritor, f"A\tC{i}\t{i % 50}\t{1 + i % 100}.5\t{nombre}\n")
+    escritor.close()
+
+
+async def terminal(direccion, solicitudes, semilla, latencias):
+    """
+    Simula una terminal: envía las solicitudes y anota la latencia de cada una.
+    Devuelve la cantidad de respuestas de error (por ejemplo, alta de un ID existente).
+    """
+    generador = random.Random(semilla)
+    lector, escritor = await conectar(direccion)
+    errores = 0
+    for _ in range(solicitudes):
+        solicitud = crear_solicitud(generador)
+        inicio = time.perf_counter()
+        if not await enviar(lector, escritor, solicitud):
+            errores += 1
+        latencias.append(time.perf_counter() - inicio)
+    escritor.close()
+    return errores
+
+
+def percentil(ordenados, fraccion):
+    return ordenados[max(0, math.ceil(fraccion * len(ordenados)) - 1)]
+
+
+async def medir(direccion, clientes, solicitudes):
+    await preparar(direccion)
+    latencias = []
+    inicio = time.perf_counter()
+    errores = await asyncio.gather(*(terminal(direccion, solicitudes, semilla, latencias)
+                                     for semilla in range(clientes)))
+    segundos = time.perf_counter() - inicio
+    latencias.sort()
+    print(f"Clientes: {clientes} | Solicitudes: {len(latencias)} | Respuestas de error: {sum(errores)}")
+    print(f"Solicitudes por segundo: {len(latencias) / segundos:,.0f}")
+    print(f"Latencia: mediana {percentil(latencias, 0.5) * 1000:.3f} ms | "
+          f"p99 {percentil(latencias, 0.99) * 1000:.3f} ms | "
+          f"máxima {latencias[-1] * 1000:.3f} ms")
+
+
+def main():
+    clientes = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    solicitudes = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    direccion = leer_direccion(sys.argv[3]) if len(sys.argv) > 3 else PUERTO
+    try:
+        asyncio.run(medir(direccion, clientes, solicitudes))
+    except ConnectionError as e:
+        print(f"No se pudo conectar con el servidor: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Totales del inventario mantenidos al día en cada cambio.
+
+Los inventarios de semana_9, semana_10 y semana11 avisan a un EstadisticasInventario
+cada vez que agregan, quitan o modifican un producto. Así la cantidad de productos,
+las unidades totales, el valor total del stock y la cantidad de productos con poco
+stock se consultan en O(1), sin recorrer el inventario.
+"""
+import math
+
+# Un producto tiene poco stock si su cantidad es menor que este umbral.
+UMBRAL_STOCK_BAJO = 10
+
+
+class EstadisticasInventario:
+    """
+    Totales de un inventario. Cada operación cuesta O(1); recalcular los obtiene
+    recorriendo todos los productos, y diferencias compara los totales mantenidos
+    con los recalculados.
+    """
+    CAMPOS = ('productos', 'unidades', 'valor_total', 'stock_bajo')
+
+    def __init__(self, umbral_stock_bajo=UMBRAL_STOCK_BAJO):
+        self.umbral_stock_bajo = umbral_stock_bajo
+        self.productos = 0
+        self.unidades = 0
+        self.valor_total = 0.0
+        self.stock_bajo = 0
+
+    def sumar(self, cantidad, precio):
+        """
+        Registra un producto nuevo.
+        """
+        self.productos += 1
+        self.unidades += cantidad
+        self.valor_total += cantidad * precio
+        if cantidad < self.umbral_stock_bajo:
+            self.stock_bajo += 1
+
+    def restar(self, cantidad, precio):
+        """
+        Registra que se quitó un producto con esa cantidad y ese precio.
+        """
+        self.productos -= 1
+        self.unidades -= cantidad
+        self.valor_total -= cantidad * precio
+        if cantidad < self.umbral_stock_bajo:
+            self.stock_bajo -= 1
+
+    def reemplazar(self, cantidad, precio, nueva_cantidad, nuevo_precio):
+        """
+        Registra que un producto pasó de (cantidad, precio) a (nueva_cantidad, nuevo_precio).
+        """
+        self.restar(cantidad, precio)
+        self.sumar(nueva_cantidad, nuevo_precio)
+
+    def recalcular(self, pares):
+        """
+        Vuelve a calcular los totales a partir de pares (cantidad, precio).
+        """
+        pares = list(pares)
+        self.productos = len(pares)
+        self.unidades = sum(cantidad for cantidad, _ in pares)
+        # fsum suma sin acumular error de redondeo.
+        self.valor_total = math.fsum(cantidad * precio for cantidad, precio in pares)
+        self.stock_bajo = sum(1 for cantidad, _ in pares if cantidad < self.umbral_stock_bajo)
+
+    def como_diccionario(self):
+        return {
+            'productos': self.productos,
+            'unidades': self.unidades,
+            'valor_total': self.valor_total,
+            'stock_bajo': self.stock_bajo,
+            'umbral_stock_bajo': self.umbral_stock_bajo,
+        }
+
+    def diferencias(self, pares):
+        """
+        Recalcula los totales desde pares (cantidad, precio) y devuelve un diccionario
+        campo -> (valor mantenido, valor recalculado) con los que no coinciden (vacío si
+        todo está bien). El valor total se compara con tolerancia, porque sumar y restar
+        montos de a uno acumula un pequeño error de redondeo.
+        """
+        recalculadas = EstadisticasInventario(self.umbral_stock_bajo)
+        recalculadas.recalcular(pares)
+        distintos = {}
+        for campo in self.CAMPOS:
+            mantenido = getattr(self, campo)
+            recalculado = getattr(recalculadas, campo)
+            if campo == 'valor_total':
+                iguales = math.isclose(mantenido, recalculado, rel_tol=1e-9, abs_tol=1e-6)
+            else:
+                iguales = mantenido == recalculado
+            if not iguales:
+                distintos[campo] = (mantenido, recalculado)
+        return distintos
+
+    def __str__(self):
+        return (f"Productos: {self.productos} | Unidades: {self.unidades} | "
+                f"Valor total: ${self.valor_total:,.2f} | "
+                f"Con stock menor a {self.umbral_stock_bajo}: {self.stock_bajo}")
@@ -0,0 +1,221 @@
+"""
+Formato binario compacto para guardar inventarios, junto a los dos formatos de texto
+que ya usan los programas de la unidad:
+
+- 'csv':     id,nombre,cantidad,precio      (semana_10.py, IDs enteros)
+- 'pipe':    ID|Nombre|Cantidad|Precio      (semana11.py, IDs de texto)
+- 'binario': el formato descrito abajo
+
+Estructura del archivo binario (todo en little-endian):
+
+    Encabezado (32 bytes):
+        firma       4 bytes   b'INVB'
+        versión     uint16
+        banderas    uint16    bit 0: los IDs son enteros (columna int64)
+        registros   uint64    cantidad de productos
+        largo       uint64    bytes de datos después del encabezado
+        checksum    uint32    CRC-32 de los datos
+        relleno     4 bytes
+    Datos:
+        IDs         int64 * registros         (solo si los IDs son enteros)
+        cantidades  int64 * registros
+        precios     float64 * registros
+        largos      uint32 * textos           largo en caracteres de cada texto
+        textos      UTF-8 de todos los textos seguidos: por cada producto, su ID
+                    (si es de texto) y luego su nombre
+
+Las columnas numéricas y la tabla de largos tienen ancho fijo, así que al cargar
+se leen con un único readinto y se convierten directamente en arreglos. Los textos
+se decodifican de una sola vez y se cortan usando los largos.
+
+Uso como conversor: python formato_binario.py ORIGEN DESTINO FORMATO
+(el formato del origen se detecta solo; FORMATO es csv, pipe o binario).
+"""
+import os
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+
+FIRMA = b'INVB'
+VERSION = 1
+ENCABEZADO = struct.Struct('<4sHHQQI4x')
+BANDERA_IDS_ENTEROS = 1
+FORMATOS = ('csv', 'pipe', 'binario')
+
+
+def _a_little_endian(arreglo):
+    if sys.byteorder != 'little':
+        arreglo.byteswap()
+    return arreglo
+
+
+def es_binario(nombre_archivo):
+    """
+    Indica si el archivo empieza con la firma del formato binario.
+    """
+    try:
+        with open(nombre_archivo, 'rb') as f:
+            return f.read(len(FIRMA)) == FIRMA
+    except IOError:
+        return False
+
+
+def detectar_formato(nombre_archivo):
+    """
+    Devuelve 'binario', 'pipe' o 'csv' según el contenido del archivo.
+    Un archivo de texto vacío se considera 'pipe'.
+    """
+    if es_binario(nombre_archivo):
+        return 'binario'
+    with open(nombre_archivo, 'r') as f:
+        for linea in f:
+            if linea.strip():
+                return 'pipe' if '|' in linea else 'csv'
+    return 'pipe'
+
+
+def guardar_binario(nombre_archivo, registros):
+    """
+    Guarda una secuencia de tuplas (id, nombre, cantidad, precio) en formato binario.
+    Escribe un archivo temporal y lo renombra, para no dejar un archivo a medias.
+    """
+    registros = list(registros)
+    ids_enteros = all(type(r[0]) is int for r in registros)
+    if ids_enteros:
+        textos = [r[1] for r in registros]
+    else:
+        textos = [texto for r in registros for texto in (str(r[0]), r[1])]
+
+    partes = []
+    if ids_enteros:
+        partes.append(_a_little_endian(array('q', (r[0] for r in registros))).tobytes())
+    partes.append(_a_little_endian(array('q', (r[2] for r in registros))).tobytes())
+    partes.append(_a_little_endian(array('d', (r[3] for r in registros))).tobytes())
+    partes.append(_a_little_endian(array('I', map(len, textos))).tobytes())
+    partes.append(''.join(textos).encode('utf-8'))
+    datos = b''.join(partes)
+
+    banderas = BANDERA_IDS_ENTEROS if ids_enteros else 0
+    encabezado = ENCABEZADO.pack(FIRMA, VERSION, banderas, len(registros), len(datos), zlib.crc32(datos))
+    temporal = nombre_archivo + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(encabezado)
+        f.write(datos)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, nombre_archivo)
+
+
+def cargar_binario(nombre_archivo):
+    """
+    Lee un archivo binario y devuelve la lista de tuplas (id, nombre, cantidad, precio).
+    Lanza ValueError si la firma, la versión o el checksum no son válidos.
+    """
+    with open(nombre_archivo, 'rb') as f:
+        buffer = bytearray(os.fstat(f.fileno()).st_size)
+        leidos = f.readinto(buffer)
+    vista = memoryview(buffer)[:leidos]
+    if leidos < ENCABEZADO.size:
+        raise ValueError("archivo binario incompleto")
+    firma, version, banderas, n, largo, checksum = ENCABEZADO.unpack_from(vista)
+    if firma != FIRMA:
+        raise ValueError("no es un archivo de inventario binario")
+    if version != VERSION:
+        raise ValueError(f"versión de formato no soportada: {version}")
+    datos = vista[ENCABEZADO.size:]
+    if len(datos) != largo or zlib.crc32(datos) != checksum:
+        raise ValueError("el archivo binario está dañado (checksum incorrecto)")
+
+    posicion = 0
+
+    def columna(tipo, cantidad):
+        nonlocal posicion
+        arreglo = array(tipo)
+        fin = posicion + arreglo.itemsize * cantidad
+        arreglo.frombytes(datos[posicion:fin])
+        posicion = fin
+        return _a_little_endian(arreglo)
+
+    ids_enteros = banderas & BANDERA_IDS_ENTEROS
+    ids = columna('q', n).tolist() if ids_enteros else None
+    cantidades = columna('q', n).tolist()
+    precios = columna('d', n).tolist()
+    largos = columna('I', n if ids_enteros else 2 * n)
+    texto = str(datos[posicion:], 'utf-8')
+    limites = list(accumulate(largos, initial=0))
+    textos = list(map(texto.__getitem__, map(slice, limites, limites[1:])))
+    if ids_enteros:
+        nombres = textos
+    else:
+        ids, nombres = textos[0::2], textos[1::2]
+    return list(zip(ids, nombres, cantidades, precios))
+
+
+def leer_registros(nombre_archivo, formato=None):
+    """
+    Lee un archivo en cualquiera de los tres formatos (detectado si no se indica) y
+    devuelve la lista de tuplas (id, nombre, cantidad, precio). Las líneas de texto
+    con formato incorrecto se omiten, igual que al cargar en los programas.
+    """
+    formato = formato or detectar_formato(nombre_archivo)
+    if formato == 'binario':
+        return cargar_binario(nombre_archivo)
+    separador = '|' if formato == 'pipe' else ','
+    registros = []
+    with open(nombre_archivo, 'r') as f:
+        for linea in f:
+            partes = linea.strip().split(separador)
+            if len(partes) != 4:
+                continue
+            try:
+                id = partes[0] if formato == 'pipe' else int(partes[0])
+                registros.append((id, partes[1], int(partes[2]), float(partes[3])))
+            except ValueError:
+                continue
+    return registros
+
+
+def escribir_registros(nombre_archivo, registros, formato):
+    """
+    Escribe las tuplas (id, nombre, cantidad, precio) en el formato indicado.
+    """
+    if formato == 'binario':
+        guardar_binario(nombre_archivo, registros)
+        return
+    if formato not in FORMATOS:
+        raise ValueError(f"formato desconocido: {formato}")
+    separador = '|' if formato == 'pipe' else ','
+    temporal = nombre_archivo + '.tmp'
+    with open(temporal, 'w') as f:
+        for id, nombre, cantidad, precio in registros:
+            f.write(f"{id}{separador}{nombre}{separador}{cantidad}{separador}{precio}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, nombre_archivo)
+
+
+def convertir(origen, destino, formato_destino):
+    """
+    Convierte un inventario entre formatos. Devuelve la cantidad de productos escritos.
+    """
+    registros = leer_registros(origen)
+    escribir_registros(destino, registros, formato_destino)
+    return len(registros)
+
+
+def main():
+    if len(sys.argv) != 4 or sys.argv[3] not in FORMATOS:
+        print("Uso: python formato_binario.py ORIGEN DESTINO {csv|pipe|binario}")
+        return
+    origen, destino, formato = sys.argv[1:]
+    try:
+        cantidad = convertir(origen, destino, formato)
+        print(f"Se convirtieron {cantidad} productos de {detectar_formato(origen)} a {formato}.")
+    except (IOError, ValueError) as e:
+        print(f"Error al convertir el inventario: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+"""
+Historial de movimientos de stock: cada vez que un inventario cambia la cantidad o el
+precio de un producto, se anota un evento (momento, ID, cantidad y precio anteriores
+y nuevos) que nunca se modifica.
+
+Los eventos se guardan en un archivo por mes dentro de un directorio junto al archivo
+del inventario (inventario.txt.historial/2024-05.mov, ver directorio_historial, con
+una línea por evento), así una consulta sobre un rango de fechas solo abre los meses
+de ese rango. Para no frenar las actualizaciones, registrar solo agrega el evento a
+una lista en memoria; la lista se escribe al final del archivo del mes cuando junta
+TAMANO_BUFER eventos, al consultar y al sincronizar (los inventarios lo hacen cada
+vez que aseguran sus propios cambios en disco: al guardar o al escribir la bitácora).
+
+Consultas:
+- historial(id, desde, hasta): los eventos de un producto, en orden de tiempo. Cada
+  mes se indexa por ID la primera vez que se consulta (y se mantienen en memoria los
+  MESES_EN_MEMORIA usados más recientemente), así que la búsqueda es un bisect.
+- movimiento_neto(desde, hasta, id): unidades que entraron menos las que salieron,
+  por mes. Para un mes ya terminado el total por producto se calcula una vez y se
+  guarda junto a sus eventos (2024-05.neto).
+
+Los momentos son segundos desde la época (time.time()) y los meses se cuentan en UTC.
+"""
+import calendar
+import os
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict, namedtuple
+
+# Eventos que se juntan en memoria antes de escribirlos.
+TAMANO_BUFER = 1000
+# Meses cuyo índice por ID se mantiene en memoria.
+MESES_EN_MEMORIA = 12
+
+Movimiento = namedtuple('Movimiento', 'marca_tiempo producto_id cantidad_anterior cantidad_nueva '
+                                      'precio_anterior precio_nuevo')
+
+
+def periodo_de(marca_tiempo):
+    """
+    Mes ('AAAA-MM', en UTC) al que pertenece un momento.
+    """
+    fecha = time.gmtime(marca_tiempo)
+    return f"{fecha.tm_year:04d}-{fecha.tm_mon:02d}"
+
+
+def directorio_historial(nombre_archivo):
+    """
+    Directorio del historial de un inventario: el nombre de su archivo con '.historial'.
+    """
+    return nombre_archivo + '.historial'
+
+
+def limites_periodo(periodo):
+    """
+    Momentos de inicio del mes y del mes siguiente.
+    """
+    anio, mes = map(int, periodo.split('-'))
+    siguiente = (anio + 1, 1) if mes == 12 else (anio, mes + 1)
+    return (calendar.timegm((anio, mes, 1, 0, 0, 0)),
+            calendar.timegm((siguiente[0], siguiente[1], 1, 0, 0, 0)))
+
+
+class _IndiceMes:
+    """
+    Eventos de un mes agrupados por ID, cada lista ordenada por momento.
+    """
+    def __init__(self):
+        self.eventos = {}
+        self.tiempos = {}
+
+    def agregar(self, evento):
+        eventos = self.eventos.setdefault(evento.producto_id, [])
+        tiempos = self.tiempos.setdefault(evento.producto_id, [])
+        if tiempos and evento.marca_tiempo < tiempos[-1]:
+            # El reloj retrocedió: se inserta en su lugar para mantener el orden.
+            posicion = bisect_right(tiempos, evento.marca_tiempo)
+            tiempos.insert(posicion, evento.marca_tiempo)
+            eventos.insert(posicion, evento)
+        else:
+            tiempos.append(evento.marca_tiempo)
+            eventos.append(evento)
+
+    def entre(self, producto_id, desde, hasta):
+        """
+        Eventos del producto con desde <= momento < hasta.
+        """
+        tiempos = self.tiempos.get(producto_id)
+        if not tiempos:
+            return []
+        return self.eventos[producto_id][bisect_left(tiempos, desde):bisect_left(tiempos, hasta)]
+
+
+class HistorialMovimientos:
+    """
+    Almacén de eventos de movimiento de stock particionado por mes (ver el módulo).
+    """
+    def __init__(self, directorio):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self._bufer = []
+        # Mes -> _IndiceMes, del usado hace más tiempo al más reciente.
+        self._indices = OrderedDict()
+        # Mes -> {ID: unidades netas} de meses terminados.
+        self._netos = {}
+
+    def _archivo(self, periodo, extension='.mov'):
+        return os.path.join(self.directorio, periodo + extension)
+
+    def periodos(self):
+        """
+        Meses con eventos, en orden.
+        """
+        self._vaciar_bufer()
+        return sorted(nombre[:-4] for nombre in os.listdir(self.directorio) if nombre.endswith('.mov'))
+
+    # --- escritura ---
+
+    def registrar(self, producto_id, cantidad_anterior, cantidad_nueva, precio_anterior, precio_nuevo,
+                  marca_tiempo=None):
+        """
+        Anota un movimiento. Solo lo agrega a la lista en memoria (O(1)).
+        """
+        self._bufer.append(Movimiento(time.time() if marca_tiempo is None else marca_tiempo,
+                                      str(producto_id), cantidad_anterior, cantidad_nueva,
+                                      precio_anterior, precio_nuevo))
+        if len(self._bufer) >= TAMANO_BUFER:
+            self._vaciar_bufer()
+
+    def _vaciar_bufer(self, fsync=False):
+        """
+        Escribe los eventos en memoria al final del archivo de su mes.
+        """
+        if not self._bufer:
+            return
+        eventos, self._bufer = self._bufer, []
+        por_periodo = {}
+        for evento in eventos:
+            por_periodo.setdefault(periodo_de(evento.marca_tiempo), []).append(evento)
+        for periodo, grupo in por_periodo.items():
+            # El ID va al final: es el único campo que podría contener '|'.
+            with open(self._archivo(periodo), 'a', encoding='utf-8') as f:
+                f.write(''.join(f"{e.marca_tiempo!r}|{e.cantidad_anterior}|{e.cantidad_nueva}|"
+                                f"{e.precio_anterior!r}|{e.precio_nuevo!r}|{e.producto_id}\n"
+                                for e in grupo))
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            indice = self._indices.get(periodo)
+            if indice is not None:
+                for evento in grupo:
+                    indice.agregar(evento)
+            # Si el mes ya tenía su total neto calculado, recibió eventos atrasados.
+            self._netos.pop(periodo, None)
+            if os.path.exists(self._archivo(periodo, '.neto')):
+                os.remove(self._archivo(periodo, '.neto'))
+
+    def sincronizar(self):
+        """
+        Escribe los eventos pendientes y los asegura en el disco (fsync).
+        """
+        self._vaciar_bufer(fsync=True)
+
+    # --- lectura ---
+
+    def _leer_mes(self, periodo):
+        indice = _IndiceMes()
+        try:
+            with open(self._archivo(periodo), encoding='utf-8') as f:
+                for linea in f:
+                    if not linea.endswith('\n'):
+                        # Línea a medio escribir por una caída.
+                        break
+                    try:
+                        momento, cantidad_anterior, cantidad_nueva, precio_anterior, precio_nuevo, producto_id = \
+                            linea[:-1].split('|', 5)
+                        indice.agregar(Movimiento(float(momento), producto_id,
+                                                  int(cantidad_anterior), int(cantidad_nueva),
+                                                  float(precio_anterior), float(precio_nuevo)))
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            pass
+        return indice
+
+    def _indice_mes(self, periodo):
+        indice = self._indices.get(periodo)
+        if indice is None:
+            indice = self._leer_mes(periodo)
+            self._indices[periodo] = indice
+            if len(self._indices) > MESES_EN_MEMORIA:
+                self._indices.popitem(last=False)
+        else:
+            self._indices.move_to_end(periodo)
+        return indice
+
+    def _periodos_entre(self, desde, hasta):
+        periodos = self.periodos()
+        if desde is not None:
+            periodos = [p for p in periodos if p >= periodo_de(desde)]
+        if hasta is not None:
+            periodos = [p for p in periodos if limites_periodo(p)[0] < hasta]
+        return periodos
+
+    def historial(self, producto_id, desde=None, hasta=None):
+        """
+        Movimientos del producto con desde <= momento < hasta (None = sin límite), en
+        orden de tiempo. Solo se leen los meses del rango.
+        """
+        producto_id = str(producto_id)
+        desde_real = float('-inf') if desde is None else desde
+        hasta_real = float('inf') if hasta is None else hasta
+        eventos = []
+        for periodo in self._periodos_entre(desde, hasta):
+            eventos.extend(self._indice_mes(periodo).entre(producto_id, desde_real, hasta_real))
+        return eventos
+
+    def _neto_mes(self, periodo):
+        """
+        {ID: unidades netas} del mes completo. Si el mes ya terminó se guarda en su
+        archivo .neto para no volver a leer los eventos.
+        """
+        netos = self._netos.get(periodo)
+        if netos is not None:
+            return netos
+        terminado = limites_periodo(periodo)[1] <= time.time()
+        archivo_neto = self._archivo(periodo, '.neto')
+        netos = {}
+        if terminado and os.path.exists(archivo_neto):
+            with open(archivo_neto, encoding='utf-8') as f:
+                for linea in f:
+                    unidades, producto_id = linea.rstrip('\n').split('|', 1)
+                    netos[producto_id] = int(unidades)
+        else:
+            for producto_id, eventos in self._indice_mes(periodo).eventos.items():
+                netos[producto_id] = sum(e.cantidad_nueva - e.cantidad_anterior for e in eventos)
+            if not terminado:
+                return netos
+            temporal = archivo_neto + '.tmp'
+            with open(temporal, 'w', encoding='utf-8') as f:
+                f.write(''.join(f"{unidades}|{producto_id}\n" for producto_id, unidades in netos.items()))
+            os.replace(temporal, archivo_neto)
+        self._netos[periodo] = netos
+        return netos
+
+    def movimiento_neto(self, desde=None, hasta=None, producto_id=None):
+        """
+        Lista de (mes, unidades netas) de los meses del rango que tienen eventos: la
+        suma de cantidad_nueva - cantidad_anterior de los movimientos con
+        desde <= momento < hasta, de un producto o de todos (producto_id=None).
+        Los meses enteros dentro del rango usan su total guardado; solo los meses de
+        los extremos, si quedan cortados, se recorren evento por evento.
+        """
+        clave = None if producto_id is None else str(producto_id)
+        resultado = []
+        for periodo in self._periodos_entre(desde, hasta):
+            inicio, fin = limites_periodo(periodo)
+            if (desde is None or desde <= inicio) and (hasta is None or fin <= hasta):
+                netos = self._neto_mes(periodo)
+                unidades = sum(netos.values()) if clave is None else netos.get(clave, 0)
+            else:
+                indice = self._indice_mes(periodo)
+                desde_real = inicio if desde is None else max(desde, inicio)
+                hasta_real = fin if hasta is None else min(hasta, fin)
+                ids = indice.eventos if clave is None else [clave]
+                unidades = sum(e.cantidad_nueva - e.cantidad_anterior
+                               for i in ids for e in indice.entre(i, desde_real, hasta_real))
+            resultado.append((periodo, unidades))
+        return resultado
@@ -0,0 +1,91 @@
+"""
+Lista ordenada para los índices secundarios del inventario (por ID, cantidad y precio).
+
+Los elementos se guardan ordenados en bloques de a lo sumo 2 * CARGA elementos, junto
+con el máximo de cada bloque. Para ubicar un elemento se hace una búsqueda binaria
+entre los máximos y otra dentro del bloque, así que agregar y eliminar cuestan
+O(log n) comparaciones más el corrimiento dentro de un único bloque (acotado por
+CARGA), en lugar de desplazar una lista de n elementos. Recorrer un rango de k
+elementos cuesta O(log n + k).
+"""
+from bisect import bisect_left, insort
+from itertools import chain, islice
+
+
+class ListaOrdenada:
+    """
+    Colección ordenada de elementos comparables y distintos entre sí (por ejemplo
+    tuplas (cantidad, producto_id)).
+    No se debe modificar mientras se recorre.
+    """
+    # Tamaño de referencia de los bloques: un bloque se divide al superar 2 * CARGA.
+    CARGA = 1000
+
+    def __init__(self, elementos=()):
+        ordenados = sorted(elementos)
+        self._bloques = [ordenados[i:i + self.CARGA] for i in range(0, len(ordenados), self.CARGA)]
+        self._maximos = [bloque[-1] for bloque in self._bloques]
+        self._largo = len(ordenados)
+
+    def __len__(self):
+        return self._largo
+
+    def __iter__(self):
+        return chain.from_iterable(self._bloques)
+
+    def __reversed__(self):
+        for bloque in reversed(self._bloques):
+            yield from reversed(bloque)
+
+    def agregar(self, elemento):
+        """
+        Inserta un elemento en su posición.
+        """
+        self._largo += 1
+        if not self._bloques:
+            self._bloques.append([elemento])
+            self._maximos.append(elemento)
+            return
+        i = bisect_left(self._maximos, elemento)
+        if i == len(self._maximos):
+            # Mayor que todos: va al final del último bloque.
+            i -= 1
+            self._bloques[i].append(elemento)
+            self._maximos[i] = elemento
+        else:
+            insort(self._bloques[i], elemento)
+        bloque = self._bloques[i]
+        if len(bloque) > 2 * self.CARGA:
+            self._bloques.insert(i + 1, bloque[self.CARGA:])
+            del bloque[self.CARGA:]
+            self._maximos.insert(i, bloque[-1])
+
+    def eliminar(self, elemento):
+        """
+        Quita un elemento. Lanza KeyError si no está.
+        """
+        i = bisect_left(self._maximos, elemento)
+        if i < len(self._bloques):
+            bloque = self._bloques[i]
+            j = bisect_left(bloque, elemento)
+            if j < len(bloque) and bloque[j] == elemento:
+                del bloque[j]
+                self._largo -= 1
+                if not bloque:
+                    del self._bloques[i]
+                    del self._maximos[i]
+                elif j == len(bloque):
+                    self._maximos[i] = bloque[-1]
+                return
+        raise KeyError(elemento)
+
+    def desde(self, valor):
+        """
+        Recorre en orden los elementos mayores o iguales que valor.
+        """
+        i = bisect_left(self._maximos, valor)
+        if i == len(self._bloques):
+            return
+        yield from islice(self._bloques[i], bisect_left(self._bloques[i], valor), None)
+        for k in range(i + 1, len(self._bloques)):
+            yield from self._bloques[k]
@@ -0,0 +1,120 @@
+"""
+Índice invertido de trigramas para buscar productos por una parte de su nombre.
+
+Cada nombre se pasa a minúsculas y se divide en todos sus fragmentos de tres
+caracteres (trigramas). Para cada trigrama se guarda el conjunto de claves de los
+productos que lo contienen. Una búsqueda intersecta los conjuntos de los trigramas
+del texto buscado y luego verifica cada candidato con `in`, por lo que el resultado
+es exactamente el mismo que `texto.lower() in nombre.lower()` recorriendo todo el
+inventario, y en el mismo orden de inserción.
+"""
+
+TAMANO_GRAMA = 3
+
+
+def trigramas(texto):
+    """
+    Devuelve el conjunto de trigramas de un texto (ya en minúsculas).
+    """
+    return {texto[i:i + TAMANO_GRAMA] for i in range(len(texto) - TAMANO_GRAMA + 1)}
+
+
+class IndiceTrigramas:
+    """
+    Índice de nombres de productos. Cada entrada tiene una clave (el ID del producto),
+    el nombre indexado y un valor asociado (normalmente el propio objeto Producto),
+    que es lo que devuelve la búsqueda.
+    """
+    def __init__(self):
+        # clave -> [orden de inserción, nombre en minúsculas, valor]
+        self._entradas = {}
+        # trigrama -> conjunto de claves cuyo nombre contiene ese trigrama
+        self._listas = {}
+        self._siguiente_orden = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def agregar(self, clave, nombre, valor, orden=None):
+        """
+        Indexa un producto. Si la clave ya existía, se reemplazan su nombre y su valor
+        pero conserva su posición en el orden de los resultados.
+        Con orden (el valor que devolvió eliminar) una entrada quitada vuelve a su
+        posición original; por defecto las claves nuevas quedan al final.
+        """
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self._desindexar(clave, entrada[1])
+            entrada[1] = nombre.lower()
+            entrada[2] = valor
+        else:
+            if orden is None:
+                orden = self._siguiente_orden
+                self._siguiente_orden += 1
+            entrada = [orden, nombre.lower(), valor]
+            self._entradas[clave] = entrada
+        for grama in trigramas(entrada[1]):
+            self._listas.setdefault(grama, set()).add(clave)
+
+    def renombrar(self, clave, nombre):
+        """
+        Actualiza el nombre indexado de un producto existente.
+        """
+        entrada = self._entradas.get(clave)
+        if entrada is not None:
+            self.agregar(clave, nombre, entrada[2])
+
+    def eliminar(self, clave):
+        """
+        Quita un producto del índice y devuelve su orden (None si la clave no existe).
+        """
+        entrada = self._entradas.pop(clave, None)
+        if entrada is None:
+            return None
+        self._desindexar(clave, entrada[1])
+        return entrada[0]
+
+    def _desindexar(self, clave, nombre_lower):
+        for grama in trigramas(nombre_lower):
+            claves = self._listas.get(grama)
+            if claves is not None:
+                claves.discard(clave)
+                if not claves:
+                    del self._listas[grama]
+
+    def buscar(self, texto):
+        """
+        Devuelve los valores cuyo nombre contiene el texto (sin distinguir mayúsculas),
+        en el orden en que fueron agregados.
+        """
+        texto_lower = texto.lower()
+        gramas = trigramas(texto_lower)
+        if not gramas:
+            # Textos de menos de tres caracteres no tienen trigramas: se revisan todos
+            # los nombres, ya guardados en minúsculas. El diccionario casi siempre está
+            # en orden (solo una entrada restaurada con su orden original queda fuera de
+            # lugar), así que ordenar el resultado es prácticamente lineal.
+            encontrados = [entrada for entrada in self._entradas.values() if texto_lower in entrada[1]]
+        else:
+            encontrados = self._buscar_candidatos(texto_lower, gramas)
+        encontrados.sort(key=lambda entrada: entrada[0])
+        return [entrada[2] for entrada in encontrados]
+
+    def _buscar_candidatos(self, texto_lower, gramas):
+        """
+        Entradas cuyo nombre contiene el texto, usando los conjuntos de sus trigramas
+        (sin ordenar).
+        """
+        listas = []
+        for grama in gramas:
+            claves = self._listas.get(grama)
+            if not claves:
+                return []
+            listas.append(claves)
+        # Se intersecta empezando por la lista más corta.
+        listas.sort(key=len)
+        candidatos = listas[0].intersection(*listas[1:])
+
+        # Verificación final: que los trigramas estén no implica que estén seguidos.
+        return [self._entradas[clave] for clave in candidatos
+                if texto_lower in self._entradas[clave][1]]
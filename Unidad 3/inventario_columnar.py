@@ -0,0 +1,320 @@
+"""
+Inventario con almacenamiento por columnas, pensado para consultas de análisis
+sobre inventarios grandes (valor total del stock, productos con poco stock,
+estadísticas de precios).
+
+En lugar de un objeto Producto por artículo, los IDs, cantidades y precios se
+guardan en arreglos tipados contiguos (módulo array) y los nombres en una sola
+tabla de bytes. Las consultas de totales y umbrales se hacen sobre columnas
+completas: con NumPy instalado se ejecutan como operaciones vectorizadas sobre
+los mismos arreglos (sin copiarlos); sin NumPy se usan map/compress de la
+biblioteca estándar.
+
+Los productos se exponen como vistas livianas (ProductoColumnar) con los mismos
+getters y setters que Producto de semana_9/semana_10.
+"""
+from array import array
+from itertools import compress, repeat
+from operator import index, lt, mul
+
+from indice_trigramas import IndiceTrigramas
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+class ProductoColumnar:
+    """
+    Vista de un producto guardado en un InventarioColumnar.
+    No copia los datos: cada getter y setter lee o escribe en las columnas.
+    """
+    __slots__ = ('_inventario', '_id')
+
+    def __init__(self, inventario, id):
+        self._inventario = inventario
+        self._id = id
+
+    def _fila(self):
+        return self._inventario._filas[self._id]
+
+    # Getters y setters, con la misma interfaz que Producto
+    def get_id(self):
+        return self._id
+
+    def get_nombre(self):
+        return self._inventario._leer_nombre(self._fila())
+
+    def get_cantidad(self):
+        return self._inventario._cantidades[self._fila()]
+
+    def get_precio(self):
+        return self._inventario._precios[self._fila()]
+
+    def set_cantidad(self, nueva_cantidad):
+        self._inventario._cantidades[self._fila()] = nueva_cantidad
+
+    def set_precio(self, nuevo_precio):
+        self._inventario._precios[self._fila()] = nuevo_precio
+
+    def set_nombre(self, nuevo_nombre):
+        self._inventario._renombrar(self._id, nuevo_nombre)
+
+    def __str__(self):
+        return (f"ID: {self.get_id()}, Nombre: {self.get_nombre()}, "
+                f"Cantidad: {self.get_cantidad()}, Precio: ${self.get_precio():.2f}")
+
+
+class InventarioColumnar:
+    """
+    Inventario en memoria con la misma interfaz que el de semana_9, respaldado por columnas.
+    Los IDs y las cantidades deben ser enteros (de 64 bits) y los precios números.
+    """
+    # Número mínimo de filas eliminadas antes de considerar compactar las columnas.
+    MIN_FILAS_LIBRES = 64
+
+    def __init__(self):
+        self._ids = array('q')
+        self._cantidades = array('q')
+        self._precios = array('d')
+        # 1 si la fila está en uso, 0 si su producto fue eliminado.
+        self._activos = array('b')
+        # Tabla de nombres: todos los nombres en UTF-8, uno detrás de otro.
+        self._nombres = bytearray()
+        self._inicio_nombre = array('q')
+        self._largo_nombre = array('q')
+        # ID -> fila en las columnas.
+        self._filas = {}
+        self._filas_libres = 0
+        self._indice_nombres = IndiceTrigramas()
+
+    def __len__(self):
+        return len(self._filas)
+
+    @property
+    def productos(self):
+        """
+        Lista de vistas de los productos, en orden de inserción.
+        """
+        return [ProductoColumnar(self, id) for id in compress(self._ids, self._activos)]
+
+    # --- columnas ---
+
+    def _leer_nombre(self, fila):
+        inicio = self._inicio_nombre[fila]
+        return self._nombres[inicio:inicio + self._largo_nombre[fila]].decode('utf-8')
+
+    def _escribir_nombre(self, nombre):
+        datos = nombre.encode('utf-8')
+        inicio = len(self._nombres)
+        self._nombres += datos
+        return inicio, len(datos)
+
+    def _compactar(self):
+        # Reconstruye las columnas solo con las filas activas, conservando el orden.
+        filas = [fila for fila in range(len(self._ids)) if self._activos[fila]]
+        nombres = [self._leer_nombre(fila) for fila in filas]
+        self._ids = array('q', (self._ids[f] for f in filas))
+        self._cantidades = array('q', (self._cantidades[f] for f in filas))
+        self._precios = array('d', (self._precios[f] for f in filas))
+        self._activos = array('b', repeat(1, len(filas)))
+        self._nombres = bytearray()
+        self._inicio_nombre = array('q')
+        self._largo_nombre = array('q')
+        for nombre in nombres:
+            inicio, largo = self._escribir_nombre(nombre)
+            self._inicio_nombre.append(inicio)
+            self._largo_nombre.append(largo)
+        self._filas = {id: fila for fila, id in enumerate(self._ids)}
+        self._filas_libres = 0
+
+    def _renombrar(self, id_producto, nombre):
+        if not isinstance(nombre, str):
+            raise TypeError("el nombre debe ser texto")
+        fila = self._filas[id_producto]
+        # El nombre anterior queda sin uso en la tabla hasta la próxima compactación.
+        self._inicio_nombre[fila], self._largo_nombre[fila] = self._escribir_nombre(nombre)
+        self._indice_nombres.renombrar(id_producto, nombre)
+
+    # --- operaciones CRUD (misma interfaz que semana_9) ---
+
+    def agregar_producto(self, producto):
+        """
+        Copia en las columnas un producto (cualquier objeto con get_id, get_nombre,
+        get_cantidad y get_precio). Rechaza IDs repetidos.
+
+        Los valores se convierten y validan antes de modificar nada (TypeError si el ID
+        o la cantidad no son enteros, OverflowError si no entran en 64 bits), así un
+        producto inválido no deja las columnas desalineadas. La fila se registra en el
+        índice de IDs al final.
+        """
+        id = index(producto.get_id())
+        if id in self._filas:
+            print(f"Error: Ya existe un producto con el ID {id}.")
+            return False
+        cantidad = index(producto.get_cantidad())
+        precio = float(producto.get_precio())
+        nombre = producto.get_nombre()
+        array('q', (id, cantidad))  # Lanza OverflowError si no entran en la columna
+        inicio, largo = self._escribir_nombre(nombre)
+        fila = len(self._ids)
+        self._ids.append(id)
+        self._cantidades.append(cantidad)
+        self._precios.append(precio)
+        self._activos.append(1)
+        self._inicio_nombre.append(inicio)
+        self._largo_nombre.append(largo)
+        self._filas[id] = fila
+        self._indice_nombres.agregar(id, nombre, id)
+        print(f"Producto '{producto.get_nombre()}' agregado exitosamente.")
+        return True
+
+    def eliminar_producto(self, id_producto):
+        """
+        Marca la fila del producto como libre; las columnas se compactan cuando
+        las filas libres superan la mitad.
+        """
+        fila = self._filas.pop(id_producto, None)
+        if fila is None:
+            print(f"Error: No se encontró ningún producto con el ID {id_producto}.")
+            return False
+        self._activos[fila] = 0
+        self._cantidades[fila] = 0
+        self._precios[fila] = 0.0
+        self._filas_libres += 1
+        self._indice_nombres.eliminar(id_producto)
+        if self._filas_libres >= self.MIN_FILAS_LIBRES and self._filas_libres * 2 > len(self._ids):
+            self._compactar()
+        print(f"Producto con ID {id_producto} eliminado exitosamente.")
+        return True
+
+    def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None, nuevo_nombre=None):
+        """
+        Actualiza la cantidad, el precio o el nombre de un producto por su ID.
+
+        Como en agregar_producto, todos los valores se validan antes de escribir
+        ninguna columna (TypeError, ValueError u OverflowError), así un valor inválido
+        no deja el producto actualizado a medias.
+        """
+        fila = self._filas.get(id_producto)
+        if fila is None:
+            print(f"Error: No se encontró ningún producto con el ID {id_producto}.")
+            return False
+        if nueva_cantidad is not None:
+            nueva_cantidad = index(nueva_cantidad)
+            array('q', (nueva_cantidad,))  # Lanza OverflowError si no entra en la columna
+        if nuevo_precio is not None:
+            nuevo_precio = float(nuevo_precio)
+        if nuevo_nombre is not None and not isinstance(nuevo_nombre, str):
+            raise TypeError("el nombre debe ser texto")
+        if nueva_cantidad is not None:
+            self._cantidades[fila] = nueva_cantidad
+        if nuevo_precio is not None:
+            self._precios[fila] = nuevo_precio
+        if nuevo_nombre is not None:
+            self._renombrar(id_producto, nuevo_nombre)
+        print(f"Producto con ID {id_producto} actualizado exitosamente.")
+        return True
+
+    def buscar_por_id(self, id_producto):
+        if id_producto in self._filas:
+            return ProductoColumnar(self, id_producto)
+        return None
+
+    def buscar_por_nombre(self, nombre_buscado):
+        return [ProductoColumnar(self, id) for id in self._indice_nombres.buscar(nombre_buscado)]
+
+    def mostrar_inventario(self):
+        if not self._filas:
+            print("El inventario está vacío.")
+        else:
+            print("\n--- Inventario Actual ---")
+            for producto in self.productos:
+                print(producto)
+            print("-------------------------")
+
+    # --- consultas por columnas ---
+    # Las filas eliminadas tienen cantidad y precio en cero, así que no afectan las
+    # sumas; en los filtros se descartan con la columna de activos.
+
+    def unidades_totales(self):
+        """
+        Suma de las cantidades de todos los productos.
+        """
+        if np is not None and self._ids:
+            return int(np.frombuffer(self._cantidades, dtype=np.int64).sum())
+        return sum(self._cantidades)
+
+    def valor_total(self):
+        """
+        Valor del stock: suma de cantidad * precio de todos los productos.
+        """
+        if np is not None and self._ids:
+            cantidades = np.frombuffer(self._cantidades, dtype=np.int64)
+            precios = np.frombuffer(self._precios, dtype=np.float64)
+            return float(np.dot(cantidades, precios))
+        return sum(map(mul, self._cantidades, self._precios))
+
+    def _filtrar(self, mascara):
+        # Convierte una máscara de filas en vistas de producto.
+        return [ProductoColumnar(self, id) for id in compress(self._ids, mascara)]
+
+    def productos_bajo_stock(self, umbral):
+        """
+        Productos cuya cantidad es menor que el umbral.
+        """
+        if np is not None and self._ids:
+            cantidades = np.frombuffer(self._cantidades, dtype=np.int64)
+            activos = np.frombuffer(self._activos, dtype=np.int8)
+            mascara = ((cantidades < umbral) & (activos == 1)).tolist()
+        else:
+            mascara = list(map(min, map(lt, self._cantidades, repeat(umbral)), self._activos))
+        return self._filtrar(mascara)
+
+    def productos_por_precio(self, minimo, maximo):
+        """
+        Productos con precio entre minimo y maximo (ambos incluidos).
+        """
+        if np is not None and self._ids:
+            precios = np.frombuffer(self._precios, dtype=np.float64)
+            activos = np.frombuffer(self._activos, dtype=np.int8)
+            mascara = ((precios >= minimo) & (precios <= maximo) & (activos == 1)).tolist()
+        else:
+            mascara = [minimo <= precio <= maximo and activo
+                       for precio, activo in zip(self._precios, self._activos)]
+        return self._filtrar(mascara)
+
+    def estadisticas_precios(self):
+        """
+        Devuelve un diccionario con el precio mínimo, máximo y promedio, o None si
+        el inventario está vacío.
+        """
+        if not self._filas:
+            return None
+        if np is not None:
+            precios = np.frombuffer(self._precios, dtype=np.float64)
+            activos = np.frombuffer(self._activos, dtype=np.int8) == 1
+            vigentes = precios[activos]
+            return {'minimo': float(vigentes.min()), 'maximo': float(vigentes.max()),
+                    'promedio': float(vigentes.mean())}
+        vigentes = list(compress(self._precios, self._activos))
+        return {'minimo': min(vigentes), 'maximo': max(vigentes),
+                'promedio': sum(vigentes) / len(vigentes)}
+
+
+if __name__ == "__main__":
+    from semana_9 import Producto
+
+    inventario = InventarioColumnar()
+    inventario.agregar_producto(Producto(101, "Laptop", 10, 1200.50))
+    inventario.agregar_producto(Producto(102, "Mouse USB", 50, 15.00))
+    inventario.agregar_producto(Producto(103, "Teclado", 25, 45.99))
+    inventario.agregar_producto(Producto(104, "Monitor", 5, 250.75))
+    inventario.mostrar_inventario()
+    print(f"Unidades totales: {inventario.unidades_totales()}")
+    print(f"Valor total del stock: ${inventario.valor_total():,.2f}")
+    print("Productos con menos de 10 unidades:")
+    for producto in inventario.productos_bajo_stock(10):
+        print(producto)
+    print(f"Estadísticas de precios: {inventario.estadisticas_precios()}")
@@ -0,0 +1,191 @@
+"""
+Inventario seguro para usarse desde varios hilos a la vez (por ejemplo, desde el
+servidor de servidor_inventario.py y su hilo de guardado).
+
+Usa un candado de lectores y escritor: las consultas (obtener, buscar por nombre)
+pueden ejecutarse al mismo tiempo entre sí, y las modificaciones se ejecutan solas.
+Las consultas devuelven copias (tuplas id, nombre, cantidad, precio) tomadas con el
+candado, así nunca se ve un producto a medio actualizar.
+
+A diferencia de los inventarios del menú, los métodos no imprimen nada: devuelven
+el resultado para que quien los llama decida cómo informarlo.
+"""
+import threading
+from contextlib import contextmanager
+from itertools import islice
+
+from formato_binario import detectar_formato, escribir_registros, leer_registros
+from indice_trigramas import IndiceTrigramas
+from semana11 import Producto
+
+
+class CandadoLectorEscritor:
+    """
+    Candado que admite varios lectores a la vez o un único escritor.
+    Da prioridad a los escritores: cuando uno espera, no entran lectores nuevos, así
+    una corriente continua de consultas no puede postergar las escrituras para siempre.
+    No es reentrante: un hilo no debe pedirlo de nuevo mientras lo tiene.
+    """
+    def __init__(self):
+        self._condicion = threading.Condition(threading.Lock())
+        self._lectores = 0
+        self._escribiendo = False
+        self._escritores_esperando = 0
+
+    @contextmanager
+    def lectura(self):
+        with self._condicion:
+            while self._escribiendo or self._escritores_esperando:
+                self._condicion.wait()
+            self._lectores += 1
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._lectores -= 1
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    @contextmanager
+    def escritura(self):
+        with self._condicion:
+            self._escritores_esperando += 1
+            while self._escribiendo or self._lectores:
+                self._condicion.wait()
+            self._escritores_esperando -= 1
+            self._escribiendo = True
+        try:
+            yield
+        finally:
+            with self._condicion:
+                self._escribiendo = False
+                self._condicion.notify_all()
+
+
+class InventarioConcurrente:
+    """
+    Inventario en memoria (IDs de texto, como en semana11) protegido por un
+    CandadoLectorEscritor.
+    """
+    def __init__(self):
+        self._productos = {}
+        # Índice de trigramas de los nombres; el valor de cada entrada es el ID.
+        self._indice_nombres = IndiceTrigramas()
+        self._candado = CandadoLectorEscritor()
+        # Ordena los guardados: dos a la vez usarían el mismo archivo temporal.
+        self._candado_archivo = threading.Lock()
+        # Formato de formato_binario en el que se guarda: el del archivo cargado.
+        self.formato = 'pipe'
+        # Número de cambios hechos y número de cambios que ya estaban al guardar.
+        self._version = 0
+        self._version_guardada = 0
+
+    @staticmethod
+    def _copia(producto):
+        return (producto.producto_id, producto.nombre, producto.cantidad, producto.precio)
+
+    def __len__(self):
+        with self._candado.lectura():
+            return len(self._productos)
+
+    def hay_cambios(self):
+        return self._version != self._version_guardada
+
+    # --- consultas ---
+
+    def obtener(self, producto_id):
+        """
+        Devuelve la tupla del producto o None si no existe.
+        """
+        with self._candado.lectura():
+            producto = self._productos.get(producto_id)
+            return self._copia(producto) if producto is not None else None
+
+    def buscar_por_nombre(self, texto, limite=None):
+        """
+        Tuplas de los productos cuyo nombre contiene el texto (sin distinguir
+        mayúsculas), en orden de alta; como mucho `limite` si se indica.
+        """
+        with self._candado.lectura():
+            ids = self._indice_nombres.buscar(texto)
+            return [self._copia(self._productos[producto_id]) for producto_id in islice(ids, limite)]
+
+    # --- modificaciones ---
+
+    def agregar_producto(self, producto):
+        """
+        Añade un producto. Devuelve False si ya existe uno con el mismo ID.
+        """
+        with self._candado.escritura():
+            if producto.producto_id in self._productos:
+                return False
+            self._productos[producto.producto_id] = producto
+            self._indice_nombres.agregar(producto.producto_id, producto.nombre, producto.producto_id)
+            self._version += 1
+            return True
+
+    def eliminar_producto(self, producto_id):
+        """
+        Elimina un producto. Devuelve False si no existe.
+        """
+        with self._candado.escritura():
+            if self._productos.pop(producto_id, None) is None:
+                return False
+            self._indice_nombres.eliminar(producto_id)
+            self._version += 1
+            return True
+
+    def actualizar_producto(self, producto_id, nueva_cantidad=None, nuevo_precio=None, nuevo_nombre=None):
+        """
+        Actualiza los campos indicados y devuelve la tupla resultante, o None si el
+        producto no existe.
+        """
+        with self._candado.escritura():
+            producto = self._productos.get(producto_id)
+            if producto is None:
+                return None
+            if nueva_cantidad is not None:
+                producto.cantidad = nueva_cantidad
+            if nuevo_precio is not None:
+                producto.precio = nuevo_precio
+            if nuevo_nombre is not None:
+                producto.nombre = nuevo_nombre
+                self._indice_nombres.renombrar(producto_id, nuevo_nombre)
+            self._version += 1
+            return self._copia(producto)
+
+    # --- archivo ---
+
+    def cargar(self, nombre_archivo):
+        """
+        Reemplaza el contenido por el de un archivo en cualquiera de los formatos de
+        formato_binario (los IDs se pasan a texto). Si un ID se repite, queda la
+        última línea, igual que en semana11. Al guardar se usa el mismo formato, para
+        que el programa dueño del archivo lo pueda seguir leyendo. El archivo se lee sin
+        tomar el candado.
+        """
+        formato = detectar_formato(nombre_archivo)
+        productos = {}
+        for producto_id, nombre, cantidad, precio in leer_registros(nombre_archivo, formato):
+            productos[str(producto_id)] = Producto(str(producto_id), nombre, cantidad, precio)
+        indice = IndiceTrigramas()
+        for producto in productos.values():
+            indice.agregar(producto.producto_id, producto.nombre, producto.producto_id)
+        with self._candado.escritura():
+            self._productos = productos
+            self._indice_nombres = indice
+            self.formato = formato
+            self._version_guardada = self._version
+        return len(productos)
+
+    def guardar(self, nombre_archivo):
+        """
+        Guarda el inventario (archivo temporal + renombrado). Solo la copia de los
+        datos se hace con el candado de lectura; la escritura no bloquea a nadie.
+        """
+        with self._candado_archivo:
+            with self._candado.lectura():
+                registros = [self._copia(producto) for producto in self._productos.values()]
+                version = self._version
+            escribir_registros(nombre_archivo, registros, self.formato)
+            self._version_guardada = version
@@ -0,0 +1,454 @@
+"""
+Inventario repartido en varias particiones, cada una con su propio archivo y su
+propio proceso.
+
+Cada producto pertenece a la partición crc32(ID) % N (crc32 y no hash(), porque
+hash() de un texto cambia en cada ejecución de Python). Cada partición es un
+Inventario de semana11 que vive en un proceso trabajador y guarda su propio archivo:
+con N = 1 es el archivo original (inventario.txt); con más, inventario.1-de-4.txt,
+inventario.2-de-4.txt, etc. La cantidad de particiones se anota en
+inventario.txt.particiones.
+
+InventarioParticionado tiene los mismos métodos que usa el menú de semana11:
+- las operaciones sobre un ID (agregar, eliminar, actualizar) van solo al proceso
+  de su partición;
+- la búsqueda por nombre y los listados se piden a todas las particiones a la vez y
+  se combinan los resultados.
+
+Para cambiar la cantidad de particiones (con el programa cerrado):
+    python inventario_particionado.py reparticionar [archivo] cantidad
+
+Uso: python inventario_particionado.py [archivo] [particiones]
+"""
+import heapq
+import io
+import multiprocessing
+import os
+import sys
+import zlib
+from contextlib import redirect_stdout
+
+import semana11
+from arbol_bk import distancia_edicion
+from formato_binario import detectar_formato, escribir_registros, leer_registros
+from semana11 import TAMANO_PAGINA, Inventario
+
+# Cantidad de particiones por omisión al crear un inventario nuevo.
+PARTICIONES = 4
+# Productos que se piden a cada partición por vez al mostrar el inventario completo.
+TAMANO_BLOQUE_LISTADO = 1000
+
+
+def particion_de(producto_id, particiones):
+    """
+    Número de partición (0 .. particiones - 1) al que pertenece un ID.
+    """
+    return zlib.crc32(str(producto_id).encode('utf-8')) % particiones
+
+
+def nombre_particion(nombre_archivo, indice, particiones):
+    """
+    Nombre del archivo de la partición indice (desde 0). Con una sola partición es
+    el archivo original.
+    """
+    if particiones == 1:
+        return nombre_archivo
+    raiz, extension = os.path.splitext(nombre_archivo)
+    return f"{raiz}.{indice + 1}-de-{particiones}{extension}"
+
+
+def leer_cantidad_particiones(nombre_archivo):
+    """
+    Cantidad de particiones anotada para el archivo, o None si no hay anotación.
+    """
+    try:
+        with open(nombre_archivo + '.particiones') as f:
+            return int(f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def _anotar_cantidad_particiones(nombre_archivo, particiones):
+    temporal = nombre_archivo + '.particiones.tmp'
+    with open(temporal, 'w') as f:
+        f.write(f"{particiones}\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, nombre_archivo + '.particiones')
+
+
+def reparticionar(nombre_archivo, particiones):
+    """
+    Reparte los productos en una nueva cantidad de particiones. Debe hacerse con el
+    inventario cerrado. Primero se escriben los archivos nuevos, después se anota la
+    nueva cantidad y recién entonces se borran los archivos viejos, así una
+    interrupción deja siempre un juego de archivos completo y anotado.
+    Devuelve la cantidad de productos repartidos.
+    """
+    if particiones < 1:
+        raise ValueError("la cantidad de particiones debe ser al menos 1")
+    anteriores = leer_cantidad_particiones(nombre_archivo) or 1
+    if anteriores == particiones:
+        return None
+    archivos_viejos = [nombre_particion(nombre_archivo, i, anteriores) for i in range(anteriores)]
+    formato = 'pipe'
+    grupos = [[] for _ in range(particiones)]
+    for archivo in archivos_viejos:
+        if not os.path.exists(archivo):
+            continue
+        if detectar_formato(archivo) == 'binario':
+            formato = 'binario'
+        for registro in leer_registros(archivo):
+            grupos[particion_de(registro[0], particiones)].append(registro)
+    for indice, registros in enumerate(grupos):
+        escribir_registros(nombre_particion(nombre_archivo, indice, particiones), registros, formato)
+    _anotar_cantidad_particiones(nombre_archivo, particiones)
+    for archivo in archivos_viejos:
+        if os.path.exists(archivo):
+            os.remove(archivo)
+    return sum(len(registros) for registros in grupos)
+
+
+# --- proceso trabajador ---
+
+# Operaciones que atiende cada trabajador sobre su Inventario de semana11.
+_OPERACIONES = {
+    'agregar': Inventario.agregar_producto,
+    'eliminar': Inventario.eliminar_producto,
+    'actualizar': Inventario.actualizar_producto,
+    'obtener': lambda inventario, producto_id: inventario.productos.get(producto_id),
+    'contar': lambda inventario: len(inventario.productos),
+    # Sin imprimir ni sugerir parecidos: eso lo hace la fachada con los resultados de todas.
+    'buscar': lambda inventario, texto: [inventario.productos[producto_id] for producto_id
+                                         in inventario._obtener_indice_nombres().buscar(texto)],
+    'prefijo': Inventario.productos_con_prefijo,
+    'parecidos': Inventario.productos_parecidos,
+    'pagina': Inventario.pagina,
+    'estadisticas': Inventario.estadisticas,
+    # _guardar lanza IOError en lugar de imprimirlo, para que la fachada informe una sola vez.
+    'guardar': Inventario._guardar,
+    'iniciar_checkpoints': Inventario.iniciar_checkpoints,
+    'detener_checkpoints': Inventario.detener_checkpoints,
+}
+
+
+def _trabajador(conexion, nombre_archivo):
+    """
+    Carga una partición y atiende pedidos (operación, argumentos) hasta recibir
+    'cerrar'. Responde (True, resultado, texto impreso) o (False, excepción, texto).
+    """
+    inventario = Inventario()
+    salida = io.StringIO()
+    with redirect_stdout(salida):
+        inventario.cargar_inventario(nombre_archivo)
+    conexion.send((True, None, salida.getvalue()))
+    while True:
+        try:
+            operacion, argumentos = conexion.recv()
+        except EOFError:
+            break
+        if operacion == 'cerrar':
+            inventario.detener_checkpoints()
+            conexion.send((True, None, ''))
+            break
+        salida = io.StringIO()
+        try:
+            with redirect_stdout(salida):
+                resultado = _OPERACIONES[operacion](inventario, *argumentos)
+            conexion.send((True, resultado, salida.getvalue()))
+        except Exception as e:
+            conexion.send((False, e, salida.getvalue()))
+    conexion.close()
+
+
+class InventarioParticionado:
+    """
+    Fachada con los métodos de semana11.Inventario sobre N particiones, cada una en
+    su propio proceso. Los mensajes que imprimen las particiones se muestran igual
+    que si la operación se hubiera hecho en un único inventario.
+    No es segura para usarse desde varios hilos a la vez.
+    """
+    _imprimir_producto = staticmethod(Inventario._imprimir_producto)
+
+    def __init__(self, nombre_archivo='inventario.txt', particiones=None):
+        anotadas = leer_cantidad_particiones(nombre_archivo)
+        if particiones is None:
+            particiones = anotadas or PARTICIONES
+        elif anotadas is not None and anotadas != particiones:
+            raise ValueError(f"{nombre_archivo} tiene {anotadas} particiones; "
+                             f"use reparticionar para cambiarlas")
+        if anotadas is None:
+            if particiones > 1 and os.path.exists(nombre_archivo):
+                raise ValueError(f"{nombre_archivo} no está particionado; "
+                                 f"use reparticionar para repartirlo")
+            _anotar_cantidad_particiones(nombre_archivo, particiones)
+        self.nombre_archivo = nombre_archivo
+        self.particiones = particiones
+        self._conexiones = []
+        self._procesos = []
+        for indice in range(particiones):
+            propia, del_trabajador = multiprocessing.Pipe()
+            proceso = multiprocessing.Process(
+                target=_trabajador,
+                args=(del_trabajador, nombre_particion(nombre_archivo, indice, particiones)),
+                name=f"particion-{indice + 1}", daemon=True)
+            proceso.start()
+            del_trabajador.close()
+            self._conexiones.append(propia)
+            self._procesos.append(proceso)
+        # Espera a que todas terminen de cargar (cargan en paralelo).
+        self._respuestas()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def cerrar(self):
+        """
+        Detiene los procesos de las particiones (sin guardar).
+        """
+        for conexion in self._conexiones:
+            conexion.send(('cerrar', ()))
+        try:
+            self._respuestas()
+        finally:
+            for conexion, proceso in zip(self._conexiones, self._procesos):
+                conexion.close()
+                proceso.join()
+            self._conexiones = []
+            self._procesos = []
+
+    # --- comunicación con las particiones ---
+
+    @staticmethod
+    def _respuesta(conexion, mostrar=False):
+        correcto, resultado, texto = conexion.recv()
+        if mostrar and texto:
+            print(texto, end='')
+        if not correcto:
+            raise resultado
+        return resultado
+
+    def _respuestas(self):
+        """
+        Lee la respuesta de cada partición y devuelve la lista de resultados. Si alguna
+        falló, lanza el primer error recién después de leerlas todas: si no, las
+        respuestas no leídas quedarían en las tuberías y se tomarían como respuesta de
+        la próxima operación.
+        """
+        resultados = []
+        error = None
+        for conexion in self._conexiones:
+            try:
+                resultados.append(self._respuesta(conexion))
+            except Exception as e:
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+        return resultados
+
+    def _en_particion(self, producto_id, operacion, *argumentos):
+        """
+        Ejecuta una operación en la partición del ID y muestra lo que imprimió.
+        """
+        conexion = self._conexiones[particion_de(producto_id, self.particiones)]
+        conexion.send((operacion, argumentos))
+        return self._respuesta(conexion, mostrar=True)
+
+    def _en_todas(self, operacion, *argumentos):
+        """
+        Envía la operación a todas las particiones (que la ejecutan en paralelo) y
+        devuelve la lista de resultados, en orden de partición.
+        """
+        for conexion in self._conexiones:
+            conexion.send((operacion, argumentos))
+        return self._respuestas()
+
+    # --- operaciones sobre un producto ---
+
+    def agregar_producto(self, producto):
+        return self._en_particion(producto.producto_id, 'agregar', producto)
+
+    def eliminar_producto(self, producto_id):
+        return self._en_particion(producto_id, 'eliminar', producto_id)
+
+    def actualizar_producto(self, producto_id, nueva_cantidad=None, nuevo_precio=None, nuevo_nombre=None):
+        return self._en_particion(producto_id, 'actualizar', producto_id,
+                                  nueva_cantidad, nuevo_precio, nuevo_nombre)
+
+    def obtener_producto(self, producto_id):
+        """
+        Devuelve (una copia de) el producto con ese ID, o None.
+        """
+        return self._en_particion(producto_id, 'obtener', producto_id)
+
+    def __len__(self):
+        return sum(self._en_todas('contar'))
+
+    # --- consultas sobre todas las particiones ---
+
+    def buscar_producto_por_nombre(self, nombre_busqueda):
+        """
+        Busca en todas las particiones los productos cuyo nombre contiene el texto y
+        los muestra en orden de ID, igual que semana11.
+        """
+        encontrados = sorted((producto for parte in self._en_todas('buscar', nombre_busqueda)
+                              for producto in parte), key=lambda p: p.producto_id)
+        if encontrados:
+            print(f"\nProductos encontrados para '{nombre_busqueda}':")
+            for producto in encontrados:
+                self._imprimir_producto(producto)
+        else:
+            print(f" No se encontraron productos con el nombre '{nombre_busqueda}'.")
+        return encontrados
+
+    def mostrar_parecidos(self, nombre):
+        """
+        Muestra los productos con nombre parecido (errores de tipeo), como mucho una
+        página. Es una acción aparte de la búsqueda porque la primera vez construye
+        el árbol BK de nombres, lo que en inventarios grandes tarda segundos.
+        """
+        parecidos = self.productos_parecidos(nombre)
+        if parecidos:
+            print(f"\nProductos con nombre parecido a '{nombre}':")
+            for producto in parecidos[:TAMANO_PAGINA]:
+                self._imprimir_producto(producto)
+        else:
+            print(f" No hay productos con nombre parecido a '{nombre}'.")
+        return parecidos
+
+    def productos_con_prefijo(self, prefijo, limite=None):
+        """
+        Productos cuyo nombre empieza con el prefijo, en orden alfabético; cada
+        partición devuelve a lo sumo `limite` y se combinan sus listas ya ordenadas.
+        """
+        partes = self._en_todas('prefijo', prefijo, limite)
+        combinados = heapq.merge(*partes, key=lambda p: (p.nombre.lower(), p.producto_id))
+        return list(combinados)[:limite]
+
+    def productos_parecidos(self, nombre, maxima_distancia=semana11.DISTANCIA_SUGERENCIAS):
+        """
+        Productos con nombre a distancia de edición <= maxima_distancia, del más
+        parecido al menos parecido.
+        """
+        parecidos = [producto for parte in self._en_todas('parecidos', nombre, maxima_distancia)
+                     for producto in parte]
+        texto = nombre.lower()
+        parecidos.sort(key=lambda p: (distancia_edicion(texto, p.nombre.lower()), p.nombre.lower(), p.producto_id))
+        return parecidos
+
+    def estadisticas(self):
+        """
+        Totales del inventario (suma de los de cada partición).
+        """
+        partes = self._en_todas('estadisticas')
+        totales = dict(partes[0])
+        for parte in partes[1:]:
+            for campo in ('productos', 'unidades', 'valor_total', 'stock_bajo'):
+                totales[campo] += parte[campo]
+        return totales
+
+    def pagina(self, cursor=None, tamano=TAMANO_PAGINA):
+        """
+        Página de productos en orden de ID. Cada partición devuelve su propia página
+        a partir del cursor (el último ID de la página anterior) y se combinan las
+        listas ordenadas. Devuelve (productos, cursor siguiente), con None si no hay más.
+        """
+        respuestas = self._en_todas('pagina', cursor, tamano)
+        productos = list(heapq.merge(*(productos for productos, _ in respuestas),
+                                     key=lambda p: p.producto_id))
+        # Hay otra página si sobran productos o si alguna partición tiene más.
+        hay_mas = len(productos) > tamano or any(siguiente is not None for _, siguiente in respuestas)
+        productos = productos[:tamano]
+        return productos, (productos[-1].producto_id if hay_mas else None)
+
+    def paginas(self, tamano=TAMANO_PAGINA, cursor=None):
+        """
+        Generador de tuplas (productos, cursor de la página siguiente).
+        """
+        while True:
+            productos, cursor = self.pagina(cursor, tamano)
+            if productos:
+                yield productos, cursor
+            if cursor is None:
+                return
+
+    def mostrar_por_paginas(self, tamano=TAMANO_PAGINA):
+        """
+        Muestra el inventario en orden de ID de a una página (el mismo código que semana11).
+        """
+        Inventario.mostrar_por_paginas(self, tamano)
+
+    def mostrar_todos_los_productos(self):
+        """
+        Muestra todos los productos en orden de ID, pidiéndolos por bloques.
+        """
+        vacio = True
+        for productos, _ in self.paginas(TAMANO_BLOQUE_LISTADO):
+            if vacio:
+                print("\n--- Inventario Completo ---")
+                vacio = False
+            for producto in productos:
+                self._imprimir_producto(producto)
+        if vacio:
+            print(" El inventario está vacío.")
+
+    # --- archivos ---
+
+    def guardar_inventario(self, nombre_archivo=None):
+        """
+        Cada partición guarda su archivo (en paralelo).
+        """
+        nombre_archivo = nombre_archivo or self.nombre_archivo
+        for indice, conexion in enumerate(self._conexiones):
+            conexion.send(('guardar', (nombre_particion(nombre_archivo, indice, self.particiones),)))
+        try:
+            self._respuestas()
+            print(" Inventario guardado correctamente.")
+        except IOError as e:
+            print(f" Error al guardar el archivo: {e}")
+
+    def iniciar_checkpoints(self, nombre_archivo=None, intervalo=semana11.INTERVALO_CHECKPOINT):
+        """
+        Cada partición guarda su archivo automáticamente si tuvo cambios.
+        """
+        nombre_archivo = nombre_archivo or self.nombre_archivo
+        for indice, conexion in enumerate(self._conexiones):
+            conexion.send(('iniciar_checkpoints',
+                           (nombre_particion(nombre_archivo, indice, self.particiones), intervalo)))
+        self._respuestas()
+
+    def detener_checkpoints(self):
+        self._en_todas('detener_checkpoints')
+
+
+def main():
+    argumentos = sys.argv[1:]
+    if argumentos and argumentos[0] == 'reparticionar':
+        if len(argumentos) not in (2, 3):
+            print("Uso: python inventario_particionado.py reparticionar [archivo] cantidad")
+            return
+        nombre_archivo = argumentos[1] if len(argumentos) == 3 else 'inventario.txt'
+        cantidad = reparticionar(nombre_archivo, int(argumentos[-1]))
+        if cantidad is None:
+            print(f"{nombre_archivo} ya tiene {argumentos[-1]} particiones.")
+        else:
+            print(f"Se repartieron {cantidad} productos en {argumentos[-1]} particiones.")
+        return
+
+    nombre_archivo = argumentos[0] if argumentos else 'inventario.txt'
+    particiones = int(argumentos[1]) if len(argumentos) > 1 else None
+    try:
+        inventario = InventarioParticionado(nombre_archivo, particiones)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+    with inventario:
+        semana11.main(inventario, nombre_archivo)
+
+
+if __name__ == "__main__":
+    main()
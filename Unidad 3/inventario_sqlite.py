@@ -0,0 +1,286 @@
+"""
+Inventario de semana_10 guardado en una base de datos SQLite en lugar de un archivo
+de texto.
+
+Tiene los mismos métodos públicos que Inventario de semana_10 (agregar_producto,
+eliminar_producto, actualizar_producto, buscar_por_id, buscar_por_nombre,
+mostrar_inventario), pero cada operación modifica solo la fila del producto en vez
+de reescribir el archivo completo, y los productos no se mantienen en memoria: el
+catálogo puede ser más grande que la RAM disponible.
+
+- El ID tiene un índice único, así que buscar, actualizar y eliminar por ID no
+  recorren la tabla.
+- Las búsquedas por nombre usan una tabla FTS5 con el tokenizador de trigramas,
+  mantenida por triggers. Igual que IndiceTrigramas, el resultado se verifica con
+  el nombre en minúsculas, así que coincide con `texto.lower() in nombre.lower()`.
+- La base usa el modo WAL: cada cambio se agrega al registro de escritura
+  anticipada y las lecturas no esperan a las escrituras.
+- Las consultas son constantes de la clase, así que el caché de sentencias de
+  sqlite3 las prepara una sola vez por conexión.
+
+Uso:
+    python inventario_sqlite.py [inventario.db]
+    python inventario_sqlite.py migrar [inventario.txt] [inventario.db]
+"""
+import os
+import sqlite3
+import sys
+
+from formato_binario import leer_registros
+from semana_10 import TAMANO_PAGINA, Producto, main as menu_principal
+
+
+class InventarioSQLite:
+    """
+    Inventario respaldado por una base SQLite. Los productos devueltos son copias:
+    para modificar uno se usa actualizar_producto.
+    """
+    # El rowid implícito conserva el orden de inserción, igual que la lista de semana_10.
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS productos (
+            id INTEGER NOT NULL UNIQUE,
+            nombre TEXT NOT NULL,
+            nombre_min TEXT NOT NULL,
+            cantidad INTEGER NOT NULL,
+            precio REAL NOT NULL
+        );
+    """
+    # Índice de trigramas sobre el nombre en minúsculas (calculado con str.lower de
+    # Python); case_sensitive evita que SQLite aplique su propia conversión.
+    ESQUEMA_NOMBRES = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS productos_nombres USING fts5(
+            nombre_min, content='productos', content_rowid='rowid',
+            tokenize='trigram case_sensitive 1'
+        );
+        CREATE TRIGGER IF NOT EXISTS productos_ai AFTER INSERT ON productos BEGIN
+            INSERT INTO productos_nombres(rowid, nombre_min) VALUES (new.rowid, new.nombre_min);
+        END;
+        CREATE TRIGGER IF NOT EXISTS productos_ad AFTER DELETE ON productos BEGIN
+            INSERT INTO productos_nombres(productos_nombres, rowid, nombre_min)
+            VALUES ('delete', old.rowid, old.nombre_min);
+        END;
+        CREATE TRIGGER IF NOT EXISTS productos_au AFTER UPDATE OF nombre_min ON productos BEGIN
+            INSERT INTO productos_nombres(productos_nombres, rowid, nombre_min)
+            VALUES ('delete', old.rowid, old.nombre_min);
+            INSERT INTO productos_nombres(rowid, nombre_min) VALUES (new.rowid, new.nombre_min);
+        END;
+    """
+
+    SQL_INSERTAR = "INSERT INTO productos (id, nombre, nombre_min, cantidad, precio) VALUES (?, ?, ?, ?, ?)"
+    SQL_ELIMINAR = "DELETE FROM productos WHERE id = ?"
+    SQL_BUSCAR_ID = "SELECT id, nombre, cantidad, precio FROM productos WHERE id = ?"
+    SQL_ACTUALIZAR = ("UPDATE productos SET nombre = ?, nombre_min = ?, cantidad = ?, precio = ? "
+                      "WHERE id = ?")
+    SQL_TODOS = "SELECT id, nombre, cantidad, precio FROM productos ORDER BY rowid"
+    SQL_PAGINA = ("SELECT rowid, id, nombre, cantidad, precio FROM productos "
+                  "WHERE rowid > ? ORDER BY rowid LIMIT ?")
+    SQL_HAY_PRODUCTOS = "SELECT EXISTS (SELECT 1 FROM productos)"
+    SQL_BUSCAR_NOMBRE = ("SELECT id, nombre, cantidad, precio FROM productos "
+                         "WHERE rowid IN (SELECT rowid FROM productos_nombres "
+                         "WHERE productos_nombres MATCH ?) "
+                         "AND instr(nombre_min, ?) ORDER BY rowid")
+    # Textos de menos de tres caracteres no tienen trigramas: se revisa toda la tabla.
+    SQL_BUSCAR_NOMBRE_CORTO = ("SELECT id, nombre, cantidad, precio FROM productos "
+                               "WHERE instr(nombre_min, ?) ORDER BY rowid")
+
+    def __init__(self, nombre_archivo='inventario.db'):
+        self.nombre_archivo = nombre_archivo
+        # isolation_level=None: las transacciones se abren explícitamente con BEGIN.
+        self._conexion = sqlite3.connect(nombre_archivo, isolation_level=None, cached_statements=64)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        # Con WAL, NORMAL ya no puede corromper la base ante una caída; solo podría
+        # perderse el último cambio si se corta la energía.
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(self.ESQUEMA + self.ESQUEMA_NOMBRES)
+
+    def cerrar(self):
+        self._conexion.close()
+
+    @staticmethod
+    def _a_producto(fila):
+        return Producto(*fila) if fila is not None else None
+
+    @property
+    def productos(self):
+        """
+        Lista de todos los productos en orden de inserción (lee toda la tabla).
+        """
+        return [Producto(*fila) for fila in self._conexion.execute(self.SQL_TODOS)]
+
+    def agregar_producto(self, producto):
+        """
+        Añade un producto nuevo. El índice único del ID rechaza los repetidos.
+        """
+        try:
+            with self._transaccion():
+                self._conexion.execute(self.SQL_INSERTAR, (
+                    producto.get_id(), producto.get_nombre(), producto.get_nombre().lower(),
+                    producto.get_cantidad(), producto.get_precio()))
+        except sqlite3.IntegrityError:
+            print(f"Error: Ya existe un producto con el ID {producto.get_id()}.")
+            return False
+        print(f"Producto '{producto.get_nombre()}' agregado exitosamente.")
+        return True
+
+    def eliminar_producto(self, id_producto):
+        """
+        Elimina un producto por su ID.
+        """
+        with self._transaccion():
+            eliminados = self._conexion.execute(self.SQL_ELIMINAR, (id_producto,)).rowcount
+        if not eliminados:
+            print(f"Error: No se encontró ningún producto con el ID {id_producto}.")
+            return False
+        print(f"Producto con ID {id_producto} eliminado exitosamente.")
+        return True
+
+    def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None, nuevo_nombre=None):
+        """
+        Actualiza la cantidad, el precio o el nombre de un producto por su ID.
+        """
+        with self._transaccion():
+            producto = self.buscar_por_id(id_producto)
+            if producto:
+                if nueva_cantidad is not None:
+                    producto.set_cantidad(nueva_cantidad)
+                if nuevo_precio is not None:
+                    producto.set_precio(nuevo_precio)
+                if nuevo_nombre is not None:
+                    producto.set_nombre(nuevo_nombre)
+                self._conexion.execute(self.SQL_ACTUALIZAR, (
+                    producto.get_nombre(), producto.get_nombre().lower(),
+                    producto.get_cantidad(), producto.get_precio(), id_producto))
+        if not producto:
+            print(f"Error: No se encontró ningún producto con el ID {id_producto}.")
+            return False
+        print(f"Producto con ID {id_producto} actualizado exitosamente.")
+        return True
+
+    def buscar_por_id(self, id_producto):
+        """
+        Busca un producto por su ID usando el índice único.
+        """
+        return self._a_producto(self._conexion.execute(self.SQL_BUSCAR_ID, (id_producto,)).fetchone())
+
+    def buscar_por_nombre(self, nombre_buscado):
+        """
+        Productos cuyo nombre contiene el texto buscado (sin distinguir mayúsculas),
+        en orden de inserción.
+        """
+        texto = nombre_buscado.lower()
+        if len(texto) < 3:
+            filas = self._conexion.execute(self.SQL_BUSCAR_NOMBRE_CORTO, (texto,))
+        else:
+            # Como frase entre comillas, FTS5 exige que los trigramas estén seguidos.
+            frase = '"' + texto.replace('"', '""') + '"'
+            filas = self._conexion.execute(self.SQL_BUSCAR_NOMBRE, (frase, texto))
+        return [Producto(*fila) for fila in filas]
+
+    def pagina(self, cursor=None, tamano=TAMANO_PAGINA):
+        """
+        Igual que en semana_10: devuelve (productos, cursor siguiente). El cursor es
+        el rowid del último producto de la página, así que cada página es una
+        búsqueda en el índice de la tabla y no depende de cuántas páginas se vieron.
+        """
+        filas = self._conexion.execute(self.SQL_PAGINA, (cursor or 0, tamano + 1)).fetchall()
+        productos = [Producto(*fila[1:]) for fila in filas[:tamano]]
+        return productos, (filas[tamano - 1][0] if len(filas) > tamano else None)
+
+    def paginas(self, tamano=TAMANO_PAGINA, cursor=None):
+        """
+        Generador de páginas (productos, cursor siguiente), como en semana_10.
+        """
+        while True:
+            productos, cursor = self.pagina(cursor, tamano)
+            if productos:
+                yield productos, cursor
+            if cursor is None:
+                return
+
+    def mostrar_inventario(self):
+        """
+        Muestra todos los productos, leyéndolos de la base de a uno.
+        """
+        if not self._conexion.execute(self.SQL_HAY_PRODUCTOS).fetchone()[0]:
+            print("El inventario está vacío.")
+        else:
+            print("\n--- Inventario Actual ---")
+            for fila in self._conexion.execute(self.SQL_TODOS):
+                print(Producto(*fila))
+            print("-------------------------")
+
+    def compactar_bitacora(self):
+        """
+        Equivalente a compactar la bitácora de semana_10: integra el registro WAL en
+        el archivo de la base y lo deja vacío.
+        """
+        self._conexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _transaccion(self):
+        return _Transaccion(self._conexion)
+
+
+class _Transaccion:
+    """
+    BEGIN IMMEDIATE al entrar; COMMIT si el bloque termina bien y ROLLBACK si falla.
+    """
+    def __init__(self, conexion):
+        self._conexion = conexion
+
+    def __enter__(self):
+        self._conexion.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, tipo, valor, traza):
+        self._conexion.execute("COMMIT" if tipo is None else "ROLLBACK")
+        return False
+
+
+def migrar_desde_texto(archivo_origen='inventario.txt', archivo_destino='inventario.db'):
+    """
+    Copia un inventario de semana_10 (texto o binario) a una base SQLite, en una sola
+    transacción. Igual que al cargar el archivo, se conserva la primera aparición de
+    cada ID. Devuelve la cantidad de productos copiados.
+    """
+    registros = leer_registros(archivo_origen)
+    inventario = InventarioSQLite(archivo_destino)
+    try:
+        conexion = inventario._conexion
+        contar = "SELECT COUNT(*) FROM productos"
+        antes = conexion.execute(contar).fetchone()[0]
+        with inventario._transaccion():
+            conexion.executemany(
+                "INSERT OR IGNORE INTO productos (id, nombre, nombre_min, cantidad, precio) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((id, nombre, nombre.lower(), cantidad, precio)
+                 for id, nombre, cantidad, precio in registros))
+        copiados = conexion.execute(contar).fetchone()[0] - antes
+        inventario.compactar_bitacora()
+    finally:
+        inventario.cerrar()
+    return copiados
+
+
+def main():
+    argumentos = sys.argv[1:]
+    if argumentos[:1] == ['migrar']:
+        origen = argumentos[1] if len(argumentos) > 1 else 'inventario.txt'
+        destino = argumentos[2] if len(argumentos) > 2 else 'inventario.db'
+        if not os.path.exists(origen):
+            print(f"Error: No se encontró el archivo {origen}.")
+            return
+        try:
+            copiados = migrar_desde_texto(origen, destino)
+            print(f"Se migraron {copiados} productos de {origen} a {destino}.")
+        except (IOError, ValueError, sqlite3.Error) as e:
+            print(f"Error al migrar el inventario: {e}")
+        return
+
+    inventario = InventarioSQLite(argumentos[0] if argumentos else 'inventario.db')
+    try:
+        menu_principal(inventario)
+    finally:
+        inventario.cerrar()
+
+
+if __name__ == "__main__":
+    main()
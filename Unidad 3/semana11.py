@@ -1,4 +1,40 @@
+import mmap
 import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import wraps
+from itertools import accumulate, compress, islice, repeat, takewhile
+from operator import add, and_, itemgetter, methodcaller
+
+from arbol_bk import ArbolBK
+from estadisticas_inventario import UMBRAL_STOCK_BAJO, EstadisticasInventario
+from formato_binario import cargar_binario, es_binario, guardar_binario
+from historial_movimientos import HistorialMovimientos, directorio_historial
+from indice_ordenado import ListaOrdenada
+from indice_trigramas import IndiceTrigramas
+
+# Tamaño de archivo (bytes) a partir del cual el menú usa la carga perezosa.
+TAMANO_CARGA_PEREZOSA = 64 * 1024 * 1024
+# Archivos más chicos que esto se importan en el proceso actual, sin crear procesos.
+TAMANO_MINIMO_PARALELO = 1024 * 1024
+# Cantidad de productos por página al mostrar el inventario.
+TAMANO_PAGINA = 20
+# Segundos entre guardados automáticos (checkpoints) en el menú.
+INTERVALO_CHECKPOINT = 30
+# Fracción máxima del tiempo que pueden ocupar los checkpoints: si uno tarda d
+# segundos, el siguiente espera al menos d / FRACCION_MAXIMA_CHECKPOINT.
+FRACCION_MAXIMA_CHECKPOINT = 0.1
+# Distancia de edición máxima al sugerir nombres parecidos cuando una búsqueda no encuentra nada.
+DISTANCIA_SUGERENCIAS = 2
+# Productos que se mantienen en memoria con el almacén en disco (ver ProductosEnDisco).
+CAPACIDAD_CACHE = 100_000
 
 class Producto:
     """
@@ -33,15 +69,611 @@ class Producto:
             print(f" Error: Formato de línea no válido: '{data}'")
             return None
 
+class ProductosPerezosos(MutableMapping):
+    """
+    Diccionario de productos respaldado por un archivo ID|Nombre|Cantidad|Precio
+    mapeado en memoria (mmap).
+
+    Al abrirse solo construye un índice compacto: la posición (byte) de cada línea y
+    un hash de 30 bits de su ID, ordenado para buscar con bisect, todo en arreglos
+    tipados (unos 16 bytes por línea). Un Producto se crea únicamente la primera vez
+    que se accede a su ID; los leídos, modificados o nuevos quedan en memoria y los
+    eliminados se recuerdan para ocultarlos del archivo.
+
+    Se comporta como el diccionario que llena la carga normal: si un ID se repite
+    en el archivo vale la última línea válida, pero conserva la posición de la primera.
+    Las líneas con formato incorrecto se descartan cuando se leen, no al abrir.
+    """
+    # Tamaño de los bloques del archivo que se procesan a la vez al construir el índice.
+    BLOQUE = 1 << 24
+    MASCARA_HASH = (1 << 30) - 1
+
+    def __init__(self, nombre_archivo):
+        self._archivo = open(nombre_archivo, 'rb')
+        tamano = os.fstat(self._archivo.fileno()).st_size
+        # Un archivo vacío no se puede mapear.
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ) if tamano else b''
+        # Posición de cada línea no vacía, en el orden del archivo.
+        self._posiciones = array('q')
+        # Hash de cada ID ordenado, y el número de línea (índice en _posiciones) de cada uno.
+        self._hashes = array('i')
+        self._lineas = array('i')
+        # Productos del archivo ya leídos (o modificados), por ID.
+        self._en_memoria = {}
+        # IDs del archivo que fueron eliminados.
+        self._eliminados = set()
+        # Posiciones de líneas que no se pudieron convertir en Producto.
+        self._invalidas = set()
+        # Productos que no vienen del archivo, en orden de inserción.
+        self._nuevos = {}
+        # Cantidad de IDs del archivo aún presentes; se calcula la primera vez que se pide.
+        self._cantidad_en_archivo = None
+        self._indexar()
+
+    def _indexar(self):
+        # Cada bloque se procesa con funciones de la biblioteca estándar aplicadas con
+        # map/compress, sin un ciclo de Python por línea.
+        hashes = array('i')
+        inicio, total = 0, len(self._mapa)
+        while inicio < total:
+            fin = self._mapa.find(b'\n', min(inicio + self.BLOQUE, total) - 1)
+            fin = total if fin == -1 else fin + 1
+            lineas = self._mapa[inicio:fin].split(b'\n')
+            inicios = accumulate(map(add, map(len, lineas), repeat(1)), initial=inicio)
+            no_vacias = list(map(bool, lineas))
+            self._posiciones.extend(compress(inicios, no_vacias))
+            ids = map(bytes.lstrip, map(itemgetter(0), map(methodcaller('partition', b'|'),
+                                                           compress(lineas, no_vacias))))
+            hashes.extend(map(and_, map(hash, ids), repeat(self.MASCARA_HASH)))
+            inicio = fin
+        # El ordenamiento es estable: los IDs repetidos quedan en el orden del archivo.
+        self._lineas = array('i', sorted(range(len(hashes)), key=hashes.__getitem__))
+        self._hashes = array('i', map(hashes.__getitem__, self._lineas))
+
+    def cerrar(self):
+        """
+        Libera el mapeo y el archivo. Los productos no leídos dejan de estar disponibles.
+        """
+        if isinstance(self._mapa, mmap.mmap):
+            self._mapa.close()
+        self._archivo.close()
+
+    def _id_en(self, posicion):
+        fin = self._mapa.find(b'\n', posicion)
+        if fin == -1:
+            fin = len(self._mapa)
+        barra = self._mapa.find(b'|', posicion, fin)
+        return self._mapa[posicion:barra if barra != -1 else fin].lstrip()
+
+    def _leer(self, posicion):
+        """
+        Crea el Producto de la línea que empieza en la posición dada, o None si es inválida.
+        """
+        if posicion in self._invalidas:
+            return None
+        fin = self._mapa.find(b'\n', posicion)
+        linea = self._mapa[posicion:fin if fin != -1 else len(self._mapa)]
+        producto = Producto.from_string(linea.decode('utf-8', errors='replace'))
+        if producto is None:
+            self._invalidas.add(posicion)
+        return producto
+
+    def _candidatas(self, id_bytes):
+        """
+        Posiciones de las líneas (en orden del archivo) cuyo ID es id_bytes.
+        """
+        h = hash(id_bytes) & self.MASCARA_HASH
+        i = bisect_left(self._hashes, h)
+        posiciones = []
+        while i < len(self._hashes) and self._hashes[i] == h:
+            posicion = self._posiciones[self._lineas[i]]
+            if posicion not in self._invalidas and self._id_en(posicion) == id_bytes:
+                posiciones.append(posicion)
+            i += 1
+        return posiciones
+
+    def _leer_del_archivo(self, producto_id):
+        """
+        Devuelve el Producto vigente del archivo para el ID (la última línea válida) o None.
+        """
+        if producto_id in self._eliminados or not isinstance(producto_id, str):
+            return None
+        for posicion in reversed(self._candidatas(producto_id.encode('utf-8'))):
+            producto = self._leer(posicion)
+            if producto is not None:
+                return producto
+        return None
+
+    def __getitem__(self, producto_id):
+        if producto_id in self._nuevos:
+            return self._nuevos[producto_id]
+        if producto_id in self._en_memoria:
+            return self._en_memoria[producto_id]
+        producto = self._leer_del_archivo(producto_id)
+        if producto is None:
+            raise KeyError(producto_id)
+        self._en_memoria[producto_id] = producto
+        return producto
+
+    def __contains__(self, producto_id):
+        try:
+            self[producto_id]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, producto_id, producto):
+        if producto_id not in self._nuevos and producto_id in self:
+            self._en_memoria[producto_id] = producto
+        else:
+            self._nuevos[producto_id] = producto
+
+    def __delitem__(self, producto_id):
+        if producto_id in self._nuevos:
+            del self._nuevos[producto_id]
+        elif producto_id in self:
+            del self._en_memoria[producto_id]
+            self._eliminados.add(producto_id)
+            if self._cantidad_en_archivo is not None:
+                self._cantidad_en_archivo -= 1
+        else:
+            raise KeyError(producto_id)
+
+    def __len__(self):
+        if self._cantidad_en_archivo is None:
+            self._cantidad_en_archivo = sum(1 for _ in self._recorrer_archivo())
+        return self._cantidad_en_archivo + len(self._nuevos)
+
+    def __bool__(self):
+        return bool(self._nuevos) or next(self._recorrer_archivo(), None) is not None
+
+    def _recorrer_archivo(self):
+        """
+        Genera (ID, Producto) para cada ID vigente del archivo, en el orden de su
+        primera línea válida. Los productos no leídos antes no se guardan en memoria.
+        """
+        for posicion in self._posiciones:
+            id_bytes = self._id_en(posicion)
+            producto_id = id_bytes.decode('utf-8', errors='replace')
+            if producto_id in self._eliminados:
+                continue
+            validas = self._candidatas(id_bytes)
+            if len(validas) > 1:
+                # ID repetido: se muestra en su primera línea válida con el valor de la última.
+                validas = [c for c in validas if self._leer(c) is not None]
+            if not validas or validas[0] != posicion:
+                continue
+            producto = self._en_memoria.get(producto_id) or self._leer(validas[-1])
+            if producto is not None:
+                yield producto_id, producto
+
+    def __iter__(self):
+        for producto_id, _ in self._recorrer_archivo():
+            yield producto_id
+        yield from list(self._nuevos)
+
+    def items(self):
+        yield from self._recorrer_archivo()
+        yield from list(self._nuevos.items())
+
+    def values(self):
+        for _, producto in self.items():
+            yield producto
+
+
+class ProductosEnDisco(MutableMapping):
+    """
+    Diccionario de productos guardado en una base SQLite (tabla indexada por ID) con
+    una caché LRU en memoria, para inventarios que no entran en la RAM.
+
+    La caché guarda como mucho `capacidad` productos o, si se indica capacidad_bytes,
+    los que entren en esa cantidad de bytes (estimada con sys.getsizeof). Al pasarse
+    del límite se desaloja el producto usado hace más tiempo; si había cambiado, recién
+    ahí se escribe en la base. Las escrituras quedan en una transacción que se
+    confirma con sincronizar (al guardar el inventario).
+
+    Quien modifica un producto obtenido de aquí debe volver a asignarlo
+    (productos[id] = producto) para que se marque como modificado.
+
+    Los contadores aciertos, fallos y desalojos sirven para ajustar la capacidad: cada
+    consulta (in o []) cuenta como acierto si el producto estaba en la caché y como
+    fallo si hubo que buscarlo en la base.
+    """
+    # Bytes que se suman a cada producto por la entrada de la caché (estimado).
+    SOBRECARGA_ENTRADA = 100
+
+    def __init__(self, nombre_archivo, capacidad=CAPACIDAD_CACHE, capacidad_bytes=None):
+        self.nombre_archivo = nombre_archivo
+        # El hilo de checkpoints también la usa (siempre con el candado del inventario).
+        self._conexion = sqlite3.connect(nombre_archivo, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS productos ("
+            "producto_id TEXT PRIMARY KEY, nombre TEXT NOT NULL, "
+            "cantidad INTEGER NOT NULL, precio REAL NOT NULL) WITHOUT ROWID")
+        self.capacidad = capacidad
+        self.capacidad_bytes = capacidad_bytes
+        # ID -> Producto, del usado hace más tiempo al más reciente.
+        self._cache = OrderedDict()
+        # IDs de la caché con cambios que todavía no se escribieron en la base.
+        self._modificados = set()
+        # Tamaño estimado de cada producto de la caché (solo con capacidad_bytes).
+        self._tamanos = {}
+        self._bytes = 0
+        self._cantidad = self._conexion.execute("SELECT COUNT(*) FROM productos").fetchone()[0]
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+        self.escrituras = 0
+
+    def estadisticas(self):
+        """
+        Contadores de la caché, para ajustar su capacidad.
+        """
+        consultas = self.aciertos + self.fallos
+        return {
+            'en_cache': len(self._cache),
+            'bytes_en_cache': self._bytes if self.capacidad_bytes is not None else None,
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'tasa_aciertos': self.aciertos / consultas if consultas else None,
+            'desalojos': self.desalojos,
+            'escrituras': self.escrituras,
+        }
+
+    def _tamano(self, producto):
+        return (self.SOBRECARGA_ENTRADA + sys.getsizeof(producto) + sys.getsizeof(producto.__dict__)
+                + sys.getsizeof(producto.producto_id) + sys.getsizeof(producto.nombre)
+                + sys.getsizeof(producto.cantidad) + sys.getsizeof(producto.precio))
+
+    def _escribir(self, productos):
+        self._conexion.executemany(
+            "INSERT OR REPLACE INTO productos VALUES (?, ?, ?, ?)",
+            ((p.producto_id, p.nombre, p.cantidad, p.precio) for p in productos))
+
+    def _poner_en_cache(self, producto_id, producto, modificado):
+        if producto_id in self._cache:
+            self._cache.move_to_end(producto_id)
+        self._cache[producto_id] = producto
+        if modificado:
+            self._modificados.add(producto_id)
+        if self.capacidad_bytes is not None:
+            tamano = self._tamano(producto)
+            self._bytes += tamano - self._tamanos.get(producto_id, 0)
+            self._tamanos[producto_id] = tamano
+        self._desalojar()
+
+    def _quitar_de_cache(self, producto_id):
+        producto = self._cache.pop(producto_id)
+        self._bytes -= self._tamanos.pop(producto_id, 0)
+        return producto
+
+    def _desalojar(self):
+        # Siempre queda al menos el último producto usado.
+        while len(self._cache) > 1 and (
+                len(self._cache) > self.capacidad
+                or (self.capacidad_bytes is not None and self._bytes > self.capacidad_bytes)):
+            producto_id = next(iter(self._cache))
+            producto = self._quitar_de_cache(producto_id)
+            if producto_id in self._modificados:
+                self._modificados.discard(producto_id)
+                self._escribir([producto])
+                self.escrituras += 1
+            self.desalojos += 1
+
+    def _leer(self, producto_id):
+        """
+        Busca el producto en la caché o, si no está, en la base (y lo agrega a la
+        caché). Devuelve None si no existe.
+        """
+        producto = self._cache.get(producto_id)
+        if producto is not None:
+            self._cache.move_to_end(producto_id)
+            self.aciertos += 1
+            return producto
+        self.fallos += 1
+        fila = self._conexion.execute(
+            "SELECT producto_id, nombre, cantidad, precio FROM productos WHERE producto_id = ?",
+            (producto_id,)).fetchone()
+        if fila is None:
+            return None
+        producto = Producto(*fila)
+        self._poner_en_cache(producto_id, producto, modificado=False)
+        return producto
+
+    def __getitem__(self, producto_id):
+        producto = self._leer(producto_id)
+        if producto is None:
+            raise KeyError(producto_id)
+        return producto
+
+    def __contains__(self, producto_id):
+        return self._leer(producto_id) is not None
+
+    def __setitem__(self, producto_id, producto):
+        if producto_id not in self._cache and self._conexion.execute(
+                "SELECT 1 FROM productos WHERE producto_id = ?", (producto_id,)).fetchone() is None:
+            self._cantidad += 1
+        self._poner_en_cache(producto_id, producto, modificado=True)
+
+    def __delitem__(self, producto_id):
+        en_cache = producto_id in self._cache
+        if en_cache:
+            self._quitar_de_cache(producto_id)
+            self._modificados.discard(producto_id)
+        borradas = self._conexion.execute(
+            "DELETE FROM productos WHERE producto_id = ?", (producto_id,)).rowcount
+        if not en_cache and not borradas:
+            raise KeyError(producto_id)
+        self._cantidad -= 1
+
+    def __len__(self):
+        return self._cantidad
+
+    def _escribir_modificados(self):
+        if self._modificados:
+            self._escribir(self._cache[producto_id] for producto_id in self._modificados)
+            self.escrituras += len(self._modificados)
+            self._modificados = set()
+
+    def sincronizar(self):
+        """
+        Escribe los productos modificados que siguen en la caché y confirma la transacción.
+        """
+        self._escribir_modificados()
+        self._conexion.commit()
+
+    def cerrar(self):
+        self.sincronizar()
+        self._conexion.close()
+
+    def items(self):
+        """
+        Recorre todos los productos en orden de ID leyéndolos de la base, sin
+        agregarlos a la caché (un recorrido completo no desaloja los productos en uso).
+        """
+        self._escribir_modificados()
+        for fila in self._conexion.execute("SELECT producto_id, nombre, cantidad, precio FROM productos"):
+            producto = self._cache.get(fila[0])
+            yield fila[0], producto if producto is not None else Producto(*fila)
+
+    def __iter__(self):
+        for producto_id, _ in self.items():
+            yield producto_id
+
+    def values(self):
+        for _, producto in self.items():
+            yield producto
+
+
+def _importar_fragmento(nombre_archivo, inicio, fin):
+    """
+    Interpreta las líneas entre los bytes inicio y fin del archivo (se ejecuta en
+    un proceso aparte) con las mismas reglas que Producto.from_string.
+    Devuelve (aceptadas, rechazadas, cantidad de líneas): aceptadas es la lista de
+    tuplas (ID, Nombre, Cantidad, Precio) en orden, y rechazadas la lista de
+    (número de línea relativo al fragmento, texto). Las líneas vacías se ignoran.
+    """
+    with open(nombre_archivo, 'rb') as f:
+        f.seek(inicio)
+        datos = f.read(fin - inicio)
+    aceptadas = []
+    rechazadas = []
+    lineas = datos.decode('utf-8', errors='replace').split('\n')
+    if lineas and lineas[-1] == '':
+        lineas.pop()
+    for numero, linea in enumerate(lineas):
+        partes = linea.strip().split('|')
+        if len(partes) == 4:
+            try:
+                aceptadas.append((partes[0], partes[1], int(partes[2]), float(partes[3])))
+                continue
+            except ValueError:
+                pass
+        if linea.strip():
+            rechazadas.append((numero, linea.rstrip('\r')))
+    return aceptadas, rechazadas, len(lineas)
+
+
+def _dividir_en_fragmentos(nombre_archivo, cantidad):
+    """
+    Divide el archivo en hasta `cantidad` rangos de bytes (inicio, fin) que empiezan
+    y terminan en un límite de línea.
+    """
+    tamano = os.path.getsize(nombre_archivo)
+    cortes = [0]
+    with open(nombre_archivo, 'rb') as f:
+        for i in range(1, cantidad):
+            objetivo = max(tamano * i // cantidad, cortes[-1])
+            f.seek(objetivo)
+            f.readline()  # avanza hasta el final de la línea en curso
+            corte = min(f.tell(), tamano)
+            if corte > cortes[-1]:
+                cortes.append(corte)
+    if cortes[-1] < tamano:
+        cortes.append(tamano)
+    return list(zip(cortes, cortes[1:]))
+
+
+class ReporteImportacion:
+    """
+    Resultado de Inventario.importar_masivo.
+    """
+    def __init__(self):
+        self.lineas_leidas = 0
+        self.productos_importados = 0
+        # Líneas válidas descartadas porque otra línea con el mismo ID tuvo prioridad.
+        self.duplicados = 0
+        # Productos que ya estaban en el inventario y fueron reemplazados.
+        self.reemplazados = 0
+        # Lista de (número de línea, texto) de las líneas con formato incorrecto.
+        self.rechazadas = []
+
+    def __str__(self):
+        return (f"Líneas leídas: {self.lineas_leidas} | Importados: {self.productos_importados} | "
+                f"Duplicados: {self.duplicados} | Reemplazados: {self.reemplazados} | "
+                f"Rechazadas: {len(self.rechazadas)}")
+
+
+class EstadisticasGuardado:
+    """
+    Costo de los guardados de Inventario (manuales y checkpoints automáticos).
+    """
+    def __init__(self):
+        self.guardados = 0
+        # Checkpoints que no escribieron nada porque no había cambios.
+        self.omitidos = 0
+        self.segundos_total = 0.0
+        self.segundos_ultimo = 0.0
+        self.segundos_maximo = 0.0
+        self.bytes_ultimo = 0
+        # IDs modificados o eliminados que incluyó el último guardado.
+        self.cambios_ultimo = 0
+        # Último error de un checkpoint automático (None si el último salió bien).
+        self.ultimo_error = None
+
+    def registrar(self, segundos, bytes_escritos, cambios):
+        self.guardados += 1
+        self.segundos_ultimo = segundos
+        self.segundos_total += segundos
+        self.segundos_maximo = max(self.segundos_maximo, segundos)
+        self.bytes_ultimo = bytes_escritos
+        self.cambios_ultimo = cambios
+
+    def __str__(self):
+        return (f"Guardados: {self.guardados} | Omitidos: {self.omitidos} | "
+                f"Último: {self.segundos_ultimo * 1000:.1f} ms, {self.bytes_ultimo} bytes, "
+                f"{self.cambios_ultimo} cambios | Máximo: {self.segundos_maximo * 1000:.1f} ms")
+
+
+def _sincronizado(metodo):
+    """
+    Ejecuta el método con el candado del inventario tomado, para que el hilo de
+    checkpoints no lea los productos mientras se modifican.
+    """
+    @wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._candado:
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _sincronizar_directorio(nombre_archivo):
+    """
+    Hace fsync del directorio del archivo, para que el renombrado sobreviva a una caída.
+    """
+    try:
+        descriptor = os.open(os.path.dirname(os.path.abspath(nombre_archivo)), os.O_RDONLY)
+    except OSError:
+        # Algunos sistemas (Windows) no permiten abrir un directorio.
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
+
+
 class Inventario:
     """
     Clase que gestiona el inventario de productos.
     Utiliza un diccionario para almacenar los productos.
     """
-    def __init__(self):
+    def __init__(self, umbral_stock_bajo=UMBRAL_STOCK_BAJO, historial=None):
         # El diccionario almacena los productos. La clave es el ID y el valor es el objeto Producto.
         self.productos = {}
+        # IDs agregados o modificados y IDs eliminados desde el último guardado.
+        # _cambio_masivo indica un cambio que no se sigue por ID (importación o carga
+        # sobre un inventario que no estaba vacío).
+        self._modificados = set()
+        self._eliminados = set()
+        self._cambio_masivo = False
+        # _candado protege los productos y el registro de cambios (el hilo de
+        # checkpoints los lee); _candado_archivo ordena las escrituras del archivo.
+        self._candado = threading.RLock()
+        self._candado_archivo = threading.Lock()
+        self._hilo_checkpoint = None
+        self._detener_checkpoint = threading.Event()
+        self.estadisticas_guardado = EstadisticasGuardado()
+        # Formato del archivo ('texto' o 'binario'); se detecta al cargar y se usa al guardar.
+        self.formato = 'texto'
+        # Índice de trigramas de los nombres, usado por buscar_producto_por_nombre.
+        # Se construye en la primera búsqueda (así la carga no tiene que leer cada nombre)
+        # y después se mantiene al agregar, eliminar y renombrar.
+        self._indice_nombres = None
+        # Índices ordenados por ID, (cantidad, ID), (precio, ID) y (nombre en minúsculas, ID)
+        # para las consultas por rango, los listados ordenados y la búsqueda por prefijo.
+        # Igual que el de nombres, se construyen en la primera consulta y luego se
+        # mantienen en agregar, eliminar y actualizar.
+        self._indices_orden = None
+        # Árbol BK de los nombres para sugerir productos cuando el nombre buscado tiene
+        # errores de tipeo; se construye y mantiene igual que los demás índices.
+        self._arbol_nombres = None
+        # Totales (productos, unidades, valor, stock bajo). Se calculan en la primera
+        # consulta (la carga perezosa no tiene que leer cada producto) y luego se
+        # actualizan en O(1) en cada cambio.
+        self.umbral_stock_bajo = umbral_stock_bajo
+        self._estadisticas = None
+        # Historial de movimientos (HistorialMovimientos) donde se anotan los cambios de
+        # cantidad y precio; None para no anotarlos. Se sincroniza al guardar.
+        self.historial = historial
+
+    def _obtener_indices_orden(self):
+        """
+        Devuelve el diccionario de índices ordenados, construyéndolo si no existe.
+        """
+        if self._indices_orden is None:
+            productos = list(self.productos.values())
+            self._indices_orden = {
+                'producto_id': ListaOrdenada(p.producto_id for p in productos),
+                'cantidad': ListaOrdenada((p.cantidad, p.producto_id) for p in productos),
+                'precio': ListaOrdenada((p.precio, p.producto_id) for p in productos),
+                'nombre': ListaOrdenada((p.nombre.lower(), p.producto_id) for p in productos),
+            }
+        return self._indices_orden
+
+    def _invalidar_indices(self):
+        """
+        Descarta los índices derivados; se reconstruyen en la próxima consulta.
+        """
+        self._indice_nombres = None
+        self._indices_orden = None
+        self._arbol_nombres = None
+        self._estadisticas = None
+
+    def _obtener_indice_nombres(self):
+        """
+        Devuelve el índice de nombres, construyéndolo si todavía no existe.
+        """
+        if self._indice_nombres is None:
+            indice = IndiceTrigramas()
+            for producto_id, producto in self.productos.items():
+                indice.agregar(producto_id, producto.nombre, producto_id)
+            self._indice_nombres = indice
+        return self._indice_nombres
+
+    def _obtener_arbol_nombres(self):
+        """
+        Devuelve el árbol BK de nombres, construyéndolo si todavía no existe.
+        """
+        if self._arbol_nombres is None:
+            self._arbol_nombres = ArbolBK((producto_id, producto.nombre)
+                                          for producto_id, producto in self.productos.items())
+        return self._arbol_nombres
+
+    def _obtener_estadisticas(self):
+        """
+        Devuelve los totales del inventario, calculándolos si todavía no existen.
+        """
+        if self._estadisticas is None:
+            estadisticas = EstadisticasInventario(self.umbral_stock_bajo)
+            estadisticas.recalcular((p.cantidad, p.precio) for p in self.productos.values())
+            self._estadisticas = estadisticas
+        return self._estadisticas
 
+    @_sincronizado
     def agregar_producto(self, producto):
         """
         Añade un nuevo producto al inventario.
@@ -51,45 +683,98 @@ class Inventario:
             print(f" Error: El producto con ID {producto.producto_id} ya existe.")
             return False
         self.productos[producto.producto_id] = producto
+        if self._indice_nombres is not None:
+            self._indice_nombres.agregar(producto.producto_id, producto.nombre, producto.producto_id)
+        if self._indices_orden is not None:
+            self._indices_orden['producto_id'].agregar(producto.producto_id)
+            self._indices_orden['cantidad'].agregar((producto.cantidad, producto.producto_id))
+            self._indices_orden['precio'].agregar((producto.precio, producto.producto_id))
+            self._indices_orden['nombre'].agregar((producto.nombre.lower(), producto.producto_id))
+        if self._arbol_nombres is not None:
+            self._arbol_nombres.agregar(producto.producto_id, producto.nombre)
+        if self._estadisticas is not None:
+            self._estadisticas.sumar(producto.cantidad, producto.precio)
+        self._modificados.add(producto.producto_id)
+        self._eliminados.discard(producto.producto_id)
         print(f" Producto '{producto.nombre}' añadido correctamente.")
         return True
 
+    @_sincronizado
     def eliminar_producto(self, producto_id):
         """
         Elimina un producto del inventario por su ID.
         """
         if producto_id in self.productos:
+            producto = self.productos[producto_id]
+            if self._indices_orden is not None:
+                self._indices_orden['producto_id'].eliminar(producto_id)
+                self._indices_orden['cantidad'].eliminar((producto.cantidad, producto_id))
+                self._indices_orden['precio'].eliminar((producto.precio, producto_id))
+                self._indices_orden['nombre'].eliminar((producto.nombre.lower(), producto_id))
             del self.productos[producto_id]
+            if self._indice_nombres is not None:
+                self._indice_nombres.eliminar(producto_id)
+            if self._arbol_nombres is not None:
+                self._arbol_nombres.eliminar(producto_id)
+            if self._estadisticas is not None:
+                self._estadisticas.restar(producto.cantidad, producto.precio)
+            self._modificados.discard(producto_id)
+            self._eliminados.add(producto_id)
             print(f" Producto con ID {producto_id} eliminado correctamente.")
             return True
         else:
             print(f" Error: No se encontró ningún producto con ID {producto_id}.")
             return False
 
-    def actualizar_producto(self, producto_id, nueva_cantidad=None, nuevo_precio=None):
+    @_sincronizado
+    def actualizar_producto(self, producto_id, nueva_cantidad=None, nuevo_precio=None, nuevo_nombre=None):
         """
-        Actualiza la cantidad o el precio de un producto existente.
+        Actualiza la cantidad, el precio o el nombre de un producto existente.
         """
         if producto_id in self.productos:
             producto = self.productos[producto_id]
+            indices = self._indices_orden
+            cantidad, precio = producto.cantidad, producto.precio
             if nueva_cantidad is not None:
+                if indices is not None:
+                    indices['cantidad'].eliminar((producto.cantidad, producto_id))
+                    indices['cantidad'].agregar((nueva_cantidad, producto_id))
                 producto.cantidad = nueva_cantidad
             if nuevo_precio is not None:
+                if indices is not None:
+                    indices['precio'].eliminar((producto.precio, producto_id))
+                    indices['precio'].agregar((nuevo_precio, producto_id))
                 producto.precio = nuevo_precio
+            if nuevo_nombre is not None:
+                if indices is not None:
+                    indices['nombre'].eliminar((producto.nombre.lower(), producto_id))
+                    indices['nombre'].agregar((nuevo_nombre.lower(), producto_id))
+                producto.nombre = nuevo_nombre
+                if self._indice_nombres is not None:
+                    self._indice_nombres.renombrar(producto_id, nuevo_nombre)
+                if self._arbol_nombres is not None:
+                    self._arbol_nombres.agregar(producto_id, nuevo_nombre)
+            if self._estadisticas is not None:
+                self._estadisticas.reemplazar(cantidad, precio, producto.cantidad, producto.precio)
+            if self.historial is not None and (cantidad, precio) != (producto.cantidad, producto.precio):
+                self.historial.registrar(producto_id, cantidad, producto.cantidad, precio, producto.precio)
+            # Con el almacén en disco, volver a asignarlo lo marca como modificado.
+            self.productos[producto_id] = producto
+            self._modificados.add(producto_id)
             print(f" Producto con ID {producto_id} actualizado correctamente.")
             return True
         else:
             print(f" Error: No se encontró ningún producto con ID {producto_id}.")
             return False
 
+    @_sincronizado
     def buscar_producto_por_nombre(self, nombre_busqueda):
         """
         Busca y muestra productos cuyo nombre contenga la cadena de búsqueda.
+        Usa el índice de trigramas en lugar de recorrer todo el inventario.
         """
-        encontrados = [
-            producto for producto in self.productos.values()
-            if nombre_busqueda.lower() in producto.nombre.lower()
-        ]
+        encontrados = [self.productos[producto_id]
+                       for producto_id in self._obtener_indice_nombres().buscar(nombre_busqueda)]
         if encontrados:
             print(f"\nProductos encontrados para '{nombre_busqueda}':")
             self.mostrar_productos(encontrados)
@@ -97,53 +782,464 @@ class Inventario:
             print(f" No se encontraron productos con el nombre '{nombre_busqueda}'.")
         return encontrados
 
+    def mostrar_parecidos(self, nombre):
+        """
+        Muestra los productos con nombre parecido (errores de tipeo), como mucho una
+        página. Es una acción aparte de la búsqueda porque la primera vez construye
+        el árbol BK de nombres, lo que en inventarios grandes tarda segundos.
+        """
+        parecidos = self.productos_parecidos(nombre)
+        if parecidos:
+            print(f"\nProductos con nombre parecido a '{nombre}':")
+            for producto in parecidos[:TAMANO_PAGINA]:
+                self._imprimir_producto(producto)
+        else:
+            print(f" No hay productos con nombre parecido a '{nombre}'.")
+        return parecidos
+
+    @_sincronizado
+    def productos_con_prefijo(self, prefijo, limite=None):
+        """
+        Productos cuyo nombre empieza con el prefijo (sin distinguir mayúsculas), en
+        orden alfabético; como mucho `limite` si se indica. Se leen del índice por
+        nombre, así que cuesta O(log n + k) y no depende del tamaño del inventario.
+        """
+        prefijo = prefijo.lower()
+        claves = takewhile(lambda clave: clave[0].startswith(prefijo),
+                           self._obtener_indices_orden()['nombre'].desde((prefijo,)))
+        return self._productos_de(islice(claves, limite))
+
+    @_sincronizado
+    def productos_parecidos(self, nombre, maxima_distancia=DISTANCIA_SUGERENCIAS):
+        """
+        Productos cuyo nombre completo está a distancia de edición <= maxima_distancia
+        del nombre dado (sin distinguir mayúsculas), del más parecido al menos
+        parecido. Sirve para encontrar un producto aunque el nombre esté mal escrito.
+        """
+        return [self.productos[producto_id]
+                for _, _, ids in self._obtener_arbol_nombres().buscar(nombre, maxima_distancia)
+                for producto_id in ids]
+
+    def _productos_de(self, claves):
+        """
+        Convierte claves de un índice ordenado (el ID o tuplas (valor, ID)) en productos.
+        """
+        return [self.productos[clave[-1]] for clave in claves]
+
+    @_sincronizado
+    def productos_en_rango(self, campo, minimo=None, maximo=None, incluir_maximo=True):
+        """
+        Productos cuyo campo ('cantidad' o 'precio') está entre minimo y maximo,
+        ordenados por ese campo (y por ID si empatan). Un límite en None no se aplica.
+        Cuesta O(log n + k), donde k es la cantidad de resultados.
+        """
+        indice = self._obtener_indices_orden()[campo]
+        claves = indice if minimo is None else indice.desde((minimo,))
+        if maximo is not None:
+            if incluir_maximo:
+                claves = takewhile(lambda clave: clave[0] <= maximo, claves)
+            else:
+                claves = takewhile(lambda clave: clave[0] < maximo, claves)
+        return self._productos_de(claves)
+
+    def productos_bajo_stock(self, umbral):
+        """
+        Productos con cantidad menor que el umbral, de menor a mayor cantidad.
+        """
+        return self.productos_en_rango('cantidad', maximo=umbral, incluir_maximo=False)
+
+    def productos_por_precio(self, minimo, maximo):
+        """
+        Productos con precio entre minimo y maximo (ambos incluidos), del más barato al más caro.
+        """
+        return self.productos_en_rango('precio', minimo, maximo)
+
+    @_sincronizado
+    def primeros_productos(self, campo, k, descendente=False):
+        """
+        Los k productos con menor (o mayor, si descendente) 'producto_id', 'cantidad'
+        o 'precio'. Cuesta O(log n + k).
+        """
+        indice = self._obtener_indices_orden()[campo]
+        claves = islice(reversed(indice) if descendente else iter(indice), k)
+        if campo == 'producto_id':
+            return [self.productos[producto_id] for producto_id in claves]
+        return self._productos_de(claves)
+
+    @_sincronizado
+    def pagina(self, cursor=None, tamano=TAMANO_PAGINA):
+        """
+        Devuelve una página de productos en orden de ID, leída del índice por ID (sin
+        ordenar ni copiar el inventario). El cursor es el último ID de la página
+        anterior (None para empezar); como la página siguiente empieza después de
+        ese ID, los productos agregados o eliminados entre páginas no la desplazan.
+        Devuelve (productos, cursor siguiente), con None si no hay más.
+        """
+        indice = self._obtener_indices_orden()['producto_id']
+        if cursor is None:
+            ids = iter(indice)
+        else:
+            ids = (producto_id for producto_id in indice.desde(cursor) if producto_id != cursor)
+        # Se pide uno de más para saber si hay otra página.
+        ids = list(islice(ids, tamano + 1))
+        productos = [self.productos[producto_id] for producto_id in ids[:tamano]]
+        return productos, (ids[tamano - 1] if len(ids) > tamano else None)
+
+    def paginas(self, tamano=TAMANO_PAGINA, cursor=None):
+        """
+        Generador que recorre el inventario de a una página: produce tuplas
+        (productos, cursor de la página siguiente). La memoria usada depende del
+        tamaño de página y no del tamaño del inventario.
+        """
+        while True:
+            productos, cursor = self.pagina(cursor, tamano)
+            if productos:
+                yield productos, cursor
+            if cursor is None:
+                return
+
+    def mostrar_por_paginas(self, tamano=TAMANO_PAGINA):
+        """
+        Muestra el inventario en orden de ID de a una página, esperando al usuario
+        entre páginas.
+        """
+        numero = 0
+        for productos, cursor in self.paginas(tamano):
+            numero += 1
+            if numero == 1:
+                print("\n--- Inventario Completo ---")
+            for producto in productos:
+                self._imprimir_producto(producto)
+            if cursor is None:
+                break
+            if input(f" Página {numero}: Enter para ver más, 'q' para volver: ").strip().lower() == 'q':
+                break
+        if numero == 0:
+            print(" El inventario está vacío.")
+
+    @_sincronizado
     def mostrar_todos_los_productos(self):
         """
-        Muestra una lista de todos los productos en el inventario.
+        Muestra una lista de todos los productos en el inventario, en orden de ID.
+        El orden sale del índice por ID, sin volver a ordenar el inventario.
         """
         if not self.productos:
             print(" El inventario está vacío.")
         else:
             print("\n--- Inventario Completo ---")
-            self.mostrar_productos(self.productos.values())
+            for producto_id in self._obtener_indices_orden()['producto_id']:
+                self._imprimir_producto(self.productos[producto_id])
+
+    @_sincronizado
+    def estadisticas(self):
+        """
+        Totales del inventario: un diccionario con productos, unidades, valor_total,
+        stock_bajo (productos con cantidad menor al umbral) y umbral_stock_bajo.
+        Salvo la primera vez, no recorre el inventario.
+        """
+        return self._obtener_estadisticas().como_diccionario()
+
+    @_sincronizado
+    def cambiar_umbral_stock_bajo(self, umbral):
+        """
+        Cambia el umbral de stock bajo; los totales se recalculan en la próxima consulta.
+        """
+        self.umbral_stock_bajo = umbral
+        self._estadisticas = None
+
+    @_sincronizado
+    def verificar_estadisticas(self):
+        """
+        Compara los totales mantenidos con los calculados recorriendo el inventario.
+        Devuelve un diccionario campo -> (mantenido, recalculado) con los que no
+        coinciden; vacío si están bien.
+        """
+        return self._obtener_estadisticas().diferencias((p.cantidad, p.precio)
+                                                        for p in self.productos.values())
 
     def mostrar_productos(self, lista_productos):
         """
         Función auxiliar para imprimir una lista de productos.
         """
         for p in sorted(lista_productos, key=lambda x: x.producto_id):
-            print(f"ID: {p.producto_id} | Nombre: {p.nombre} | Cantidad: {p.cantidad} | Precio: ${p.precio:.2f}")
+            self._imprimir_producto(p)
+
+    @staticmethod
+    def _imprimir_producto(p):
+        print(f"ID: {p.producto_id} | Nombre: {p.nombre} | Cantidad: {p.cantidad} | Precio: ${p.precio:.2f}")
             
+    def hay_cambios(self):
+        """
+        Indica si hubo cambios desde el último guardado (o desde la carga).
+        """
+        return bool(self._modificados or self._eliminados or self._cambio_masivo)
+
+    def _marcar_guardado(self):
+        self._modificados = set()
+        self._eliminados = set()
+        self._cambio_masivo = False
+
+    def _guardar(self, nombre_archivo, solo_si_hay_cambios=False):
+        """
+        Escribe el inventario de forma atómica y devuelve True si escribió.
+        Los datos se copian con el candado tomado y se escriben fuera de él, así las
+        operaciones del menú solo esperan la copia y no la escritura. El archivo se
+        escribe en un temporal, se sincroniza con fsync y se renombra sobre el
+        original (y se sincroniza el directorio): una caída durante el guardado deja
+        el archivo anterior intacto. Con la carga perezosa el archivo original sigue
+        mapeado y se lee mientras se guarda, por eso nunca se escribe encima.
+        Con el almacén en disco (abrir_en_disco) el inventario ya está en su base, así
+        que solo se sincroniza y nombre_archivo no se usa.
+        """
+        if isinstance(self.productos, ProductosEnDisco):
+            return self._sincronizar_almacen(solo_si_hay_cambios)
+        with self._candado_archivo:
+            with self._candado:
+                if solo_si_hay_cambios and not self.hay_cambios():
+                    self.estadisticas_guardado.omitidos += 1
+                    return False
+                registros = [(p.producto_id, p.nombre, p.cantidad, p.precio)
+                             for p in self.productos.values()]
+                if self.historial is not None:
+                    self.historial.sincronizar()
+                cambios = (self._modificados, self._eliminados, self._cambio_masivo)
+                self._marcar_guardado()
+                formato = self.formato
+
+            inicio = time.perf_counter()
+            try:
+                if formato == 'binario':
+                    guardar_binario(nombre_archivo, registros)
+                else:
+                    temporal = nombre_archivo + '.tmp'
+                    with open(temporal, 'w') as f:
+                        for registro in registros:
+                            f.write('|'.join(map(str, registro)) + '\n')
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temporal, nombre_archivo)
+                _sincronizar_directorio(nombre_archivo)
+            except IOError:
+                # Los cambios no quedaron guardados: se vuelven a marcar como pendientes.
+                with self._candado:
+                    self._modificados |= cambios[0]
+                    self._eliminados |= cambios[1]
+                    self._cambio_masivo = self._cambio_masivo or cambios[2]
+                raise
+            segundos = time.perf_counter() - inicio
+
+        self.estadisticas_guardado.registrar(segundos, os.path.getsize(nombre_archivo),
+                                            len(cambios[0]) + len(cambios[1]))
+        return True
+
+    def _sincronizar_almacen(self, solo_si_hay_cambios):
+        """
+        Guardado con el almacén en disco: escribe en la base los productos
+        modificados que siguen en la caché y confirma la transacción.
+        """
+        with self._candado:
+            if solo_si_hay_cambios and not self.hay_cambios():
+                self.estadisticas_guardado.omitidos += 1
+                return False
+            cambios = len(self._modificados) + len(self._eliminados)
+            inicio = time.perf_counter()
+            self.productos.sincronizar()
+            if self.historial is not None:
+                self.historial.sincronizar()
+            self._marcar_guardado()
+            segundos = time.perf_counter() - inicio
+        self.estadisticas_guardado.registrar(segundos, os.path.getsize(self.productos.nombre_archivo), cambios)
+        return True
+
     def guardar_inventario(self, nombre_archivo):
         """
-        Guarda el inventario en un archivo de texto.
+        Guarda el inventario en un archivo de texto (o binario, si se cargó de uno).
         """
         try:
-            with open(nombre_archivo, 'w') as f:
-                for p in self.productos.values():
-                    f.write(p.to_string() + '\n')
+            self._guardar(nombre_archivo)
             print(" Inventario guardado correctamente.")
         except IOError as e:
             print(f" Error al guardar el archivo: {e}")
 
-    def cargar_inventario(self, nombre_archivo):
+    def checkpoint(self, nombre_archivo):
+        """
+        Guarda el inventario solo si cambió desde el último guardado.
+        Devuelve True si escribió el archivo. No imprime nada (se usa desde el hilo
+        de guardado automático); los errores se lanzan como IOError.
+        """
+        return self._guardar(nombre_archivo, solo_si_hay_cambios=True)
+
+    def iniciar_checkpoints(self, nombre_archivo, intervalo=INTERVALO_CHECKPOINT):
+        """
+        Inicia un hilo que guarda el inventario cada `intervalo` segundos si hubo
+        cambios. Si un guardado tarda mucho, la espera hasta el siguiente se alarga
+        para que los checkpoints no ocupen más de FRACCION_MAXIMA_CHECKPOINT del tiempo.
+        """
+        if self._hilo_checkpoint is not None:
+            return
+        self._detener_checkpoint.clear()
+
+        def ciclo():
+            espera = intervalo
+            while not self._detener_checkpoint.wait(espera):
+                try:
+                    self.checkpoint(nombre_archivo)
+                    self.estadisticas_guardado.ultimo_error = None
+                except IOError as e:
+                    self.estadisticas_guardado.ultimo_error = e
+                espera = max(intervalo, self.estadisticas_guardado.segundos_ultimo / FRACCION_MAXIMA_CHECKPOINT)
+
+        self._hilo_checkpoint = threading.Thread(target=ciclo, name="checkpoint-inventario", daemon=True)
+        self._hilo_checkpoint.start()
+
+    def detener_checkpoints(self):
+        """
+        Detiene el hilo de guardado automático (espera a que termine un guardado en curso).
+        """
+        if self._hilo_checkpoint is not None:
+            self._detener_checkpoint.set()
+            self._hilo_checkpoint.join()
+            self._hilo_checkpoint = None
+
+    @_sincronizado
+    def abrir_en_disco(self, nombre_archivo, capacidad=CAPACIDAD_CACHE, capacidad_bytes=None):
+        """
+        Pasa a guardar los productos en una base SQLite (nombre_archivo) con solo una
+        caché LRU en memoria (ver ProductosEnDisco), para catálogos más grandes que la
+        RAM. Si la base ya tiene productos, esos son el inventario; los productos que
+        hubiera en memoria se agregan a la base. Desde entonces guardar_inventario y los
+        checkpoints sincronizan la base.
+        Los índices de nombres, por rango y los totales se siguen construyendo en
+        memoria la primera vez que se usan.
+        """
+        anteriores = self.productos
+        self.productos = ProductosEnDisco(nombre_archivo, capacidad, capacidad_bytes)
+        for producto_id, producto in anteriores.items():
+            self.productos[producto_id] = producto
+        self._invalidar_indices()
+        if anteriores:
+            self._cambio_masivo = True
+
+    def estadisticas_cache(self):
+        """
+        Contadores de la caché del almacén en disco (aciertos, fallos, desalojos...),
+        o None si los productos están todos en memoria.
+        """
+        if isinstance(self.productos, ProductosEnDisco):
+            return self.productos.estadisticas()
+        return None
+
+    @_sincronizado
+    def cargar_inventario(self, nombre_archivo, perezoso=False):
         """
         Carga el inventario desde un archivo de texto.
+        Con perezoso=True (y el inventario vacío) el archivo se mapea en memoria y
+        cada producto se lee recién cuando se accede a su ID (ver ProductosPerezosos).
+        Los archivos en formato binario se detectan solos y se cargan completos.
         """
         if not os.path.exists(nombre_archivo):
             print(" Archivo de inventario no encontrado. Se iniciará con un inventario vacío.")
             return
 
+        # Si el inventario estaba vacío, después de cargar coincide con el archivo.
+        estaba_vacio = not self.productos and not self.hay_cambios()
         try:
-            with open(nombre_archivo, 'r') as f:
-                for linea in f:
-                    producto = Producto.from_string(linea)
-                    if producto:
-                        self.productos[producto.producto_id] = producto
+            if es_binario(nombre_archivo):
+                for producto_id, nombre, cantidad, precio in cargar_binario(nombre_archivo):
+                    # Un archivo guardado por semana_10.py trae IDs enteros; los IDs de
+                    # este programa son texto y no pueden contener el separador ni saltos
+                    # de línea, porque no se podrían guardar como ID|Nombre|Cantidad|Precio.
+                    producto_id = str(producto_id)
+                    if '|' in producto_id or '\n' in producto_id or '\r' in producto_id:
+                        print(f" Error: ID no válido en el archivo binario, se ignora: {producto_id!r}")
+                        continue
+                    self.productos[producto_id] = Producto(producto_id, nombre, cantidad, precio)
+                self.formato = 'binario'
+            elif perezoso and not self.productos and not isinstance(self.productos, ProductosEnDisco):
+                self.productos = ProductosPerezosos(nombre_archivo)
+            else:
+                with open(nombre_archivo, 'r') as f:
+                    for linea in f:
+                        producto = Producto.from_string(linea)
+                        if producto:
+                            self.productos[producto.producto_id] = producto
+            # Los índices se reconstruyen en la próxima consulta.
+            self._invalidar_indices()
+            if estaba_vacio:
+                self._marcar_guardado()
+            else:
+                self._cambio_masivo = True
             print(" Inventario cargado correctamente.")
+        except ValueError as e:
+            print(f" Error: el archivo binario no es válido: {e}")
         except IOError as e:
             print(f" Error al cargar el archivo: {e}")
 
+    @_sincronizado
+    def importar_masivo(self, nombre_archivo, procesos=None, conservar='ultimo'):
+        """
+        Importa un archivo ID|Nombre|Cantidad|Precio grande usando varios procesos.
+
+        El archivo se divide en rangos de bytes alineados a los saltos de línea y cada
+        rango se interpreta en un proceso del pool. Si un ID aparece varias veces en
+        el archivo se conserva la última línea (conservar='ultimo', igual que
+        cargar_inventario) o la primera (conservar='primero'); el resultado no depende
+        de cómo se dividió el archivo. Los productos importados reemplazan a los que ya
+        existían con el mismo ID. Devuelve un ReporteImportacion con las líneas
+        rechazadas y su número de línea (empezando en 1).
+        """
+        if conservar not in ('ultimo', 'primero'):
+            raise ValueError("conservar debe ser 'ultimo' o 'primero'")
+        reporte = ReporteImportacion()
+        if not os.path.exists(nombre_archivo):
+            print(" Archivo de importación no encontrado.")
+            return reporte
+
+        procesos = procesos or os.cpu_count() or 1
+        if procesos == 1 or os.path.getsize(nombre_archivo) < TAMANO_MINIMO_PARALELO:
+            resultados = [_importar_fragmento(nombre_archivo, inicio, fin)
+                          for inicio, fin in _dividir_en_fragmentos(nombre_archivo, 1)]
+        else:
+            # Más fragmentos que procesos, para repartir mejor el trabajo.
+            fragmentos = _dividir_en_fragmentos(nombre_archivo, procesos * 4)
+            with ProcessPoolExecutor(max_workers=procesos) as pool:
+                resultados = list(pool.map(_importar_fragmento, repeat(nombre_archivo),
+                                           *zip(*fragmentos)))
+
+        # Los fragmentos vuelven en orden, así que la primera línea de cada uno se
+        # obtiene sumando las líneas de los anteriores.
+        importados = {}
+        aceptadas_total = 0
+        primera_linea = 1
+        for aceptadas, rechazadas, cantidad in resultados:
+            if conservar == 'ultimo':
+                for campos in aceptadas:
+                    importados[campos[0]] = Producto(*campos)
+            else:
+                for campos in aceptadas:
+                    if campos[0] not in importados:
+                        importados[campos[0]] = Producto(*campos)
+            aceptadas_total += len(aceptadas)
+            reporte.rechazadas.extend((primera_linea + numero, texto) for numero, texto in rechazadas)
+            primera_linea += cantidad
+        reporte.lineas_leidas = primera_linea - 1
+        reporte.duplicados = aceptadas_total - len(importados)
+        reporte.productos_importados = len(importados)
+
+        if not self.productos and type(self.productos) is dict:
+            self.productos = importados
+        else:
+            for producto_id, producto in importados.items():
+                if producto_id in self.productos:
+                    reporte.reemplazados += 1
+                self.productos[producto_id] = producto
+        # Los índices se reconstruyen en la próxima consulta.
+        self._invalidar_indices()
+        if importados:
+            self._cambio_masivo = True
+        print(f" Importación terminada. {reporte}")
+        return reporte
+
 def mostrar_menu():
     """
     Muestra las opciones del menú principal al usuario.
@@ -154,15 +1250,23 @@ def mostrar_menu():
     print("3. Actualizar un producto")
     print("4. Buscar productos por nombre")
     print("5. Mostrar todo el inventario")
-    print("6. Salir")
+    print("6. Buscar nombres parecidos (errores de tipeo)")
+    print("7. Salir")
 
-def main():
+def main(inventario=None, nombre_archivo="inventario.txt"):
     """
     Función principal que ejecuta el programa.
+    Recibe opcionalmente otro inventario ya cargado con los mismos métodos (por
+    ejemplo un InventarioParticionado).
     """
-    nombre_archivo = "inventario.txt"
-    inventario = Inventario()
-    inventario.cargar_inventario(nombre_archivo)  # Carga los datos al iniciar
+    if inventario is None:
+        inventario = Inventario(historial=HistorialMovimientos(directorio_historial(nombre_archivo)))
+        # Carga los datos al iniciar; los archivos grandes se cargan de forma perezosa.
+        perezoso = os.path.exists(nombre_archivo) and os.path.getsize(nombre_archivo) >= TAMANO_CARGA_PEREZOSA
+        inventario.cargar_inventario(nombre_archivo, perezoso=perezoso)
+    # Guarda automáticamente cada INTERVALO_CHECKPOINT segundos si hubo cambios,
+    # para no perder toda la sesión si el programa se interrumpe.
+    inventario.iniciar_checkpoints(nombre_archivo)
 
     while True:
         mostrar_menu()
@@ -188,18 +1292,24 @@ def main():
             print("Deje en blanco si no desea actualizar.")
             nueva_cantidad_str = input("Nueva cantidad: ")
             nuevo_precio_str = input("Nuevo precio: ")
+            nuevo_nombre = input("Nuevo nombre: ") or None
             nueva_cantidad = int(nueva_cantidad_str) if nueva_cantidad_str else None
             nuevo_precio = float(nuevo_precio_str) if nuevo_precio_str else None
-            inventario.actualizar_producto(producto_id, nueva_cantidad, nuevo_precio)
+            inventario.actualizar_producto(producto_id, nueva_cantidad, nuevo_precio, nuevo_nombre)
             
         elif opcion == '4':
             nombre_busqueda = input("Nombre del producto a buscar: ")
             inventario.buscar_producto_por_nombre(nombre_busqueda)
 
         elif opcion == '5':
-            inventario.mostrar_todos_los_productos()
+            inventario.mostrar_por_paginas()
 
         elif opcion == '6':
+            nombre_busqueda = input("Nombre aproximado del producto: ")
+            inventario.mostrar_parecidos(nombre_busqueda)
+
+        elif opcion == '7':
+            inventario.detener_checkpoints()
             inventario.guardar_inventario(nombre_archivo)  # Guarda los datos antes de salir
             print(" ¡Gracias por usar el sistema! Saliendo...")
             break
@@ -1,4 +1,17 @@
 import os
+import threading
+import time
+import weakref
+from bisect import bisect_right
+from contextlib import contextmanager
+
+from estadisticas_inventario import UMBRAL_STOCK_BAJO, EstadisticasInventario
+from formato_binario import cargar_binario, es_binario, guardar_binario
+from historial_movimientos import HistorialMovimientos, directorio_historial
+from indice_trigramas import IndiceTrigramas
+
+# Cantidad de productos por página al mostrar el inventario.
+TAMANO_PAGINA = 20
 
 # Clase Producto
 # Representa un producto individual con ID, nombre, cantidad y precio.
@@ -29,39 +42,498 @@ class Producto:
     def set_precio(self, nuevo_precio):
         self.precio = nuevo_precio
 
+    def set_nombre(self, nuevo_nombre):
+        self.nombre = nuevo_nombre
+
     # Método para representar el objeto Producto como una cadena de texto
     def __str__(self):
         return f"ID: {self.id}, Nombre: {self.nombre}, Cantidad: {self.cantidad}, Precio: ${self.precio:.2f}"
 
+# Marca de "posición sin cambios desde la instantánea".
+_SIN_CAMBIOS = object()
+
+# Clase Instantanea
+# Vista de solo lectura del inventario tal como estaba al crearla (ver Inventario.instantanea).
+# Crearla cuesta O(1): no copia nada. El inventario, antes de modificar una posición
+# de su lista interna (o el producto que está en ella), guarda en cada instantánea
+# abierta una copia de lo que había, si todavía no lo hizo. Leer una posición es
+# entonces leer esa copia o, si no se tocó, la lista actual; la memoria extra es
+# proporcional a los cambios hechos después de crearla.
+# Mientras haya instantáneas abiertas el inventario no compacta su lista (compactar
+# movería las posiciones), así que conviene cerrarlas al terminar, idealmente con
+# "with inventario.instantanea() as instantanea:".
+# Se crea desde el hilo que modifica el inventario (entre dos operaciones); después
+# se puede leer y cerrar desde cualquier hilo, por ejemplo uno que guarda o reporta.
+class Instantanea:
+    def __init__(self, inventario):
+        self._inventario = inventario
+        # Las posiciones agregadas después de crearla no forman parte de la instantánea.
+        self._largo = len(inventario._ranuras)
+        self._cantidad = len(inventario._posiciones)
+        # Posición -> copia del producto que había (o None si era un hueco).
+        self._originales = {}
+        self._abierta = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    # Deja de seguir los cambios del inventario. Después de cerrarla no se debe usar.
+    # Una instantánea que se deja de usar sin cerrar se suelta sola al liberarse.
+    def cerrar(self):
+        if self._abierta:
+            self._abierta = False
+            self._inventario._soltar_instantanea(self)
+
+    # Guarda lo que había en una posición antes de que el inventario la modifique.
+    def _preservar(self, posicion, producto):
+        if posicion < self._largo and posicion not in self._originales:
+            self._originales[posicion] = None if producto is None else Producto(
+                producto.get_id(), producto.get_nombre(), producto.get_cantidad(), producto.get_precio())
+
+    def __len__(self):
+        return self._cantidad
+
+    # Recorre los registros (id, nombre, cantidad, precio) en orden de inserción.
+    # Puede usarse desde otro hilo mientras el inventario se modifica: el inventario
+    # guarda la copia antes de tocar un producto, así que si después de leer un
+    # producto su posición sigue sin copia, lo leído es lo que había al crearla.
+    def registros(self):
+        ranuras = self._inventario._ranuras
+        originales = self._originales
+        for posicion in range(self._largo):
+            producto = originales.get(posicion, _SIN_CAMBIOS)
+            if producto is _SIN_CAMBIOS:
+                try:
+                    producto = ranuras[posicion]
+                    registro = None if producto is None else (
+                        producto.get_id(), producto.get_nombre(), producto.get_cantidad(), producto.get_precio())
+                except IndexError:
+                    # Un lote que se deshizo quitó la posición; ya tiene su copia.
+                    registro = None
+                if posicion not in originales:
+                    if registro is not None:
+                        yield registro
+                    continue
+                producto = originales[posicion]
+            if producto is not None:
+                yield (producto.get_id(), producto.get_nombre(), producto.get_cantidad(), producto.get_precio())
+
+    # Recorre los productos (objetos Producto nuevos, con los datos de la instantánea).
+    def __iter__(self):
+        for registro in self.registros():
+            yield Producto(*registro)
+
+    # Busca un producto por su ID tal como estaba al crear la instantánea.
+    def buscar_por_id(self, id_producto):
+        posicion = self._inventario._posiciones.get(id_producto)
+        if posicion is not None and posicion < self._largo and posicion not in self._originales:
+            producto = self._inventario._ranuras[posicion]
+            copia = Producto(producto.get_id(), producto.get_nombre(), producto.get_cantidad(), producto.get_precio())
+            if posicion not in self._originales:
+                return copia
+        # Si su posición cambió, el producto que estaba quedó entre las copias.
+        for producto in list(self._originales.values()):
+            if producto is not None and producto.get_id() == id_producto:
+                return producto
+        return None
+
 # Clase Inventario
 # Gestiona una colección de productos, incluyendo carga, guardado y operaciones CRUD.
 class Inventario:
-    def __init__(self, nombre_archivo='inventario.txt'):
-        self.productos = []
+    # Número mínimo de huecos antes de considerar compactar la lista interna.
+    MIN_HUECOS_COMPACTAR = 64
+
+    # Tamaño (en bytes) a partir del cual la bitácora se compacta en el archivo principal.
+    UMBRAL_COMPACTACION = 1024 * 1024
+
+    # Si usar_bitacora es True, cada cambio se agrega como un registro al final de
+    # la bitácora (nombre_archivo + '.bitacora') en lugar de reescribir todo el archivo.
+    # historial es un HistorialMovimientos donde se anotan los cambios de cantidad y
+    # precio (None para no anotarlos).
+    def __init__(self, nombre_archivo='inventario.txt', usar_bitacora=False, umbral_compactacion=None,
+                 umbral_stock_bajo=UMBRAL_STOCK_BAJO, historial=None):
+        # Lista interna en orden de inserción. Un producto eliminado deja un hueco (None)
+        # en su posición, de modo que eliminar no desplaza el resto de la lista.
+        self._ranuras = []
+        # Número de orden de inserción de cada ranura (creciente, se conserva al
+        # compactar); los cursores de página lo usan en lugar de la posición.
+        self._secuencias = []
+        self._siguiente_secuencia = 0
+        # Índice ID -> posición en self._ranuras para acceder a un producto en O(1).
+        self._posiciones = {}
+        # Cantidad de huecos que hay en self._ranuras.
+        self._huecos = 0
+        # Índice de trigramas de los nombres para las búsquedas por nombre.
+        self._indice_nombres = IndiceTrigramas()
+        # Totales (productos, unidades, valor, stock bajo) actualizados en cada cambio.
+        self._estadisticas = EstadisticasInventario(umbral_stock_bajo)
         self.nombre_archivo = nombre_archivo
+        # Formato del archivo principal ('texto' o 'binario'); se detecta al cargar
+        # y se conserva al guardar.
+        self.formato = 'texto'
+        self.archivo_bitacora = nombre_archivo + '.bitacora'
+        self.usar_bitacora = usar_bitacora
+        self.umbral_compactacion = umbral_compactacion or self.UMBRAL_COMPACTACION
+        # Bytes válidos que tiene la bitácora actualmente.
+        self._tamano_bitacora = 0
+        # Profundidad de lotes abiertos (ver el método lote). Dentro de un lote los
+        # cambios quedan en memoria y en self._cambios_pendientes hasta confirmarlo;
+        # self._deshacer guarda lo necesario para revertirlos si el lote falla.
+        self._en_lote = 0
+        self._cambios_pendientes = []
+        self._deshacer = []
+        self.historial = historial
+        # Movimientos de un lote abierto; se anotan en el historial al confirmarlo.
+        self._movimientos_pendientes = []
+        # Instantáneas abiertas (ver la clase Instantanea). Es un WeakSet para que una
+        # instantánea olvidada sin cerrar no quede registrada para siempre; el candado
+        # permite leerlas y cerrarlas desde otros hilos.
+        self._instantaneas = weakref.WeakSet()
+        self._candado_instantaneas = threading.RLock()
         # Carga el inventario desde el archivo al iniciar la aplicación
         self.cargar_inventario()
 
+    # Devuelve la lista de productos en orden de inserción (sin huecos).
+    # Es una copia: para modificar el inventario se usan los métodos de la clase.
+    @property
+    def productos(self):
+        return list(self._iterar_productos())
+
+    # Recorre los productos en orden de inserción saltando los huecos.
+    def _iterar_productos(self):
+        for producto in self._ranuras:
+            if producto is not None:
+                yield producto
+
+    # Devuelve una instantánea del inventario (O(1)): una vista de solo lectura que no
+    # cambia aunque el inventario se siga modificando, útil para guardar o generar
+    # reportes largos mientras se atienden cambios. Ver la clase Instantanea.
+    def instantanea(self):
+        with self._candado_instantaneas:
+            instantanea = Instantanea(self)
+            self._instantaneas.add(instantanea)
+        return instantanea
+
+    def _soltar_instantanea(self, instantanea):
+        with self._candado_instantaneas:
+            self._instantaneas.discard(instantanea)
+
+    # Se llama antes de modificar la posición indicada (o su producto), para que las
+    # instantáneas abiertas conserven lo que había.
+    def _preservar(self, posicion):
+        if self._instantaneas:
+            with self._candado_instantaneas:
+                producto = self._ranuras[posicion] if posicion < len(self._ranuras) else None
+                for instantanea in self._instantaneas:
+                    instantanea._preservar(posicion, producto)
+
+    # Inserta un producto al final de la lista y lo registra en el índice.
+    def _insertar(self, producto):
+        self._preservar(len(self._ranuras))
+        self._posiciones[producto.get_id()] = len(self._ranuras)
+        self._ranuras.append(producto)
+        self._secuencias.append(self._siguiente_secuencia)
+        self._siguiente_secuencia += 1
+        self._indice_nombres.agregar(producto.get_id(), producto.get_nombre(), producto)
+        self._estadisticas.sumar(producto.get_cantidad(), producto.get_precio())
+        if self._en_lote:
+            self._deshacer.append(('A', producto))
+
+    # Quita un producto dejando un hueco en su posición (O(1)).
+    # Cuando los huecos superan la mitad de la lista, se compacta de una vez,
+    # por lo que el costo amortizado de cada eliminación sigue siendo O(1).
+    # Dentro de un lote no se compacta, para que deshacer pueda usar las posiciones.
+    def _quitar(self, id_producto):
+        posicion = self._posiciones.pop(id_producto)
+        self._preservar(posicion)
+        producto = self._ranuras[posicion]
+        self._ranuras[posicion] = None
+        self._huecos += 1
+        orden = self._indice_nombres.eliminar(id_producto)
+        self._estadisticas.restar(producto.get_cantidad(), producto.get_precio())
+        if self._en_lote:
+            self._deshacer.append(('E', producto, posicion, orden))
+        else:
+            self._compactar_si_conviene()
+
+    # Con instantáneas abiertas no se compacta, porque cambiaría las posiciones.
+    def _compactar_si_conviene(self):
+        if self._instantaneas:
+            return
+        if self._huecos >= self.MIN_HUECOS_COMPACTAR and self._huecos * 2 > len(self._ranuras):
+            self._compactar()
+
+    # Elimina los huecos conservando el orden de los productos y reconstruye el índice.
+    def _compactar(self):
+        self._secuencias = [secuencia for secuencia, producto in zip(self._secuencias, self._ranuras)
+                            if producto is not None]
+        self._ranuras = list(self._iterar_productos())
+        self._posiciones = {p.get_id(): i for i, p in enumerate(self._ranuras)}
+        self._huecos = 0
+
     # Guarda el estado actual del inventario en el archivo de texto.
-    # Cada producto se guarda en una línea separada.
+    # Cada producto se guarda en una línea separada. Los datos se leen de una
+    # instantánea, así el archivo refleja un único momento aunque otro hilo modifique
+    # el inventario mientras se escribe. Se escribe primero un archivo
+    # temporal y luego se reemplaza el original, así una falla a mitad de la escritura
+    # nunca deja el archivo principal incompleto. Después se vacía la bitácora,
+    # porque su contenido ya quedó incluido en el archivo principal.
     def guardar_inventario(self):
+        temporal = self.nombre_archivo + '.tmp'
         try:
-            with open(self.nombre_archivo, 'w') as f:
-                for p in self.productos:
-                    f.write(f"{p.get_id()},{p.get_nombre()},{p.get_cantidad()},{p.get_precio()}\n")
+            with self.instantanea() as instantanea:
+                if self.formato == 'binario':
+                    guardar_binario(self.nombre_archivo, instantanea.registros())
+                else:
+                    with open(temporal, 'w') as f:
+                        for id, nombre, cantidad, precio in instantanea.registros():
+                            f.write(f"{id},{nombre},{cantidad},{precio}\n")
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(temporal, self.nombre_archivo)
+            # Si el programa se detiene antes de vaciar la bitácora, al cargar se vuelve
+            # a aplicar sobre el archivo nuevo; los registros guardan el estado completo
+            # del producto, por lo que aplicarlos dos veces da el mismo resultado.
+            if self._tamano_bitacora or os.path.exists(self.archivo_bitacora):
+                with open(self.archivo_bitacora, 'wb') as f:
+                    os.fsync(f.fileno())
+                self._tamano_bitacora = 0
+            if self.historial is not None:
+                self.historial.sincronizar()
             print("Inventario guardado en el archivo exitosamente.")
         except IOError as e:
             # Captura errores de entrada/salida durante la escritura
             print(f"Error al guardar el inventario: {e}")
 
+    # Persiste un cambio. Sin bitácora reescribe el archivo completo; con bitácora
+    # agrega una sola línea al final (tipo de operación seguido de los campos) y
+    # compacta cuando la bitácora supera el umbral. Dentro de un lote solo se anota,
+    # y se persiste todo junto al confirmar el lote.
+    def _registrar_cambio(self, *campos):
+        if self._en_lote:
+            self._cambios_pendientes.append(campos)
+            return
+        self._persistir_cambios([campos])
+
+    # Escribe en disco una lista de cambios. Con bitácora, varios cambios se escriben
+    # juntos precedidos de un registro 'L,cantidad', para que al reproducir la
+    # bitácora se apliquen todos o ninguno. Los movimientos pendientes del historial
+    # se aseguran en disco junto con la bitácora.
+    def _persistir_cambios(self, cambios):
+        if not self.usar_bitacora:
+            self.guardar_inventario()
+            return
+        if len(cambios) > 1:
+            cambios = [('L', len(cambios))] + cambios
+        registro = ''.join(','.join(str(c) for c in campos) + '\n' for campos in cambios).encode('utf-8')
+        try:
+            with open(self.archivo_bitacora, 'ab') as f:
+                f.write(registro)
+                f.flush()
+                os.fsync(f.fileno())
+            self._tamano_bitacora += len(registro)
+            if self.historial is not None:
+                self.historial.sincronizar()
+        except IOError as e:
+            print(f"Error al escribir en la bitácora: {e}")
+            return
+        if self._tamano_bitacora >= self.umbral_compactacion:
+            self.compactar_bitacora()
+
+    # Agrupa varias operaciones en una transacción:
+    #
+    #     with inventario.lote():
+    #         for id_producto, precio in nuevos_precios:
+    #             inventario.actualizar_producto(id_producto, nuevo_precio=precio)
+    #
+    # Los cambios se aplican en memoria al momento, pero se guardan en disco una sola
+    # vez al salir del bloque (una reescritura del archivo, o una sola escritura en la
+    # bitácora), en lugar de una vez por operación. Si el bloque termina con una
+    # excepción, los cambios hechos dentro de él se deshacen y la excepción sigue.
+    # Los lotes anidados forman parte del lote exterior: se guardan cuando este se
+    # confirma, y si uno interior falla solo se deshacen sus propios cambios.
+    @contextmanager
+    def lote(self):
+        marca_deshacer = len(self._deshacer)
+        marca_cambios = len(self._cambios_pendientes)
+        marca_movimientos = len(self._movimientos_pendientes)
+        self._en_lote += 1
+        try:
+            yield self
+        except BaseException:
+            self._en_lote -= 1
+            self._revertir_hasta(marca_deshacer)
+            del self._cambios_pendientes[marca_cambios:]
+            del self._movimientos_pendientes[marca_movimientos:]
+            raise
+        self._en_lote -= 1
+        if not self._en_lote:
+            cambios = self._cambios_pendientes
+            self._cambios_pendientes = []
+            self._deshacer = []
+            movimientos = self._movimientos_pendientes
+            self._movimientos_pendientes = []
+            self._compactar_si_conviene()
+            # Los movimientos se anotan antes de persistir, para guardarlos junto con los cambios
+            for movimiento in movimientos:
+                self.historial.registrar(*movimiento)
+            if cambios:
+                self._persistir_cambios(cambios)
+
+    # Deshace, del último al primero, los cambios del lote registrados después de marca.
+    def _revertir_hasta(self, marca):
+        while len(self._deshacer) > marca:
+            accion = self._deshacer.pop()
+            if accion[0] == 'A':
+                # Las altas se deshacen en orden inverso, así que el producto es el último.
+                producto = accion[1]
+                self._preservar(len(self._ranuras) - 1)
+                self._ranuras.pop()
+                self._secuencias.pop()
+                del self._posiciones[producto.get_id()]
+                self._indice_nombres.eliminar(producto.get_id())
+                self._estadisticas.restar(producto.get_cantidad(), producto.get_precio())
+            elif accion[0] == 'E':
+                _, producto, posicion, orden = accion
+                self._preservar(posicion)
+                self._ranuras[posicion] = producto
+                self._posiciones[producto.get_id()] = posicion
+                self._huecos -= 1
+                self._indice_nombres.agregar(producto.get_id(), producto.get_nombre(), producto, orden)
+                self._estadisticas.sumar(producto.get_cantidad(), producto.get_precio())
+            else:
+                _, producto, nombre, cantidad, precio = accion
+                self._preservar(self._posiciones[producto.get_id()])
+                if producto.get_nombre() != nombre:
+                    producto.set_nombre(nombre)
+                    self._indice_nombres.renombrar(producto.get_id(), nombre)
+                self._estadisticas.reemplazar(producto.get_cantidad(), producto.get_precio(), cantidad, precio)
+                producto.set_cantidad(cantidad)
+                producto.set_precio(precio)
+
+    # Anota un cambio de cantidad o precio en el historial (dentro de un lote, recién
+    # al confirmarlo, así un lote deshecho no deja movimientos).
+    def _registrar_movimiento(self, id_producto, cantidad, nueva_cantidad, precio, nuevo_precio):
+        if self.historial is None or (cantidad, precio) == (nueva_cantidad, nuevo_precio):
+            return
+        movimiento = (id_producto, cantidad, nueva_cantidad, precio, nuevo_precio, time.time())
+        if self._en_lote:
+            self._movimientos_pendientes.append(movimiento)
+        else:
+            self.historial.registrar(*movimiento)
+
+    # Integra la bitácora en el archivo principal y la deja vacía.
+    def compactar_bitacora(self):
+        self.guardar_inventario()
+
+    # Aplica un registro de la bitácora al inventario en memoria.
+    # A: alta (id, nombre, cantidad, precio), E: eliminación (id),
+    # U: actualización (id, nombre, cantidad, precio).
+    def _aplicar_registro(self, campos):
+        operacion = campos[0]
+        if operacion == 'A' and len(campos) == 5:
+            producto = Producto(int(campos[1]), campos[2], int(campos[3]), float(campos[4]))
+            posicion = self._posiciones.get(producto.get_id())
+            if posicion is None:
+                self._insertar(producto)
+            else:
+                self._preservar(posicion)
+                anterior = self._ranuras[posicion]
+                self._estadisticas.reemplazar(anterior.get_cantidad(), anterior.get_precio(),
+                                              producto.get_cantidad(), producto.get_precio())
+                self._ranuras[posicion] = producto
+                self._indice_nombres.agregar(producto.get_id(), producto.get_nombre(), producto)
+        elif operacion == 'E' and len(campos) == 2:
+            id_producto = int(campos[1])
+            if id_producto in self._posiciones:
+                self._quitar(id_producto)
+        elif operacion == 'U' and len(campos) == 5:
+            producto = self.buscar_por_id(int(campos[1]))
+            if producto:
+                self._preservar(self._posiciones[producto.get_id()])
+                if producto.get_nombre() != campos[2]:
+                    producto.set_nombre(campos[2])
+                    self._indice_nombres.renombrar(producto.get_id(), campos[2])
+                cantidad, precio = int(campos[3]), float(campos[4])
+                self._estadisticas.reemplazar(producto.get_cantidad(), producto.get_precio(), cantidad, precio)
+                producto.set_cantidad(cantidad)
+                producto.set_precio(precio)
+        else:
+            raise ValueError(f"registro desconocido: {campos}")
+
+    # Aplica una línea de la bitácora; si no se puede interpretar, solo advierte.
+    def _aplicar_texto_registro(self, texto):
+        try:
+            self._aplicar_registro(texto.split(','))
+        except ValueError:
+            print(f"Advertencia: Registro de bitácora con formato incorrecto: {texto}")
+
+    # Vuelve a aplicar la bitácora sobre lo cargado desde el archivo principal.
+    # Solo se usan líneas completas (terminadas en salto de línea): una última línea
+    # a medio escribir por una caída se descarta y se recorta del archivo.
+    # Los registros de un lote ('L,cantidad' seguido de esa cantidad de registros) se
+    # aplican solo si el lote está completo.
+    def _reproducir_bitacora(self):
+        validos = 0
+        # Registros leídos del lote en curso y cuántos le faltan.
+        lote, faltan, tamano_lote = [], 0, 0
+        try:
+            with open(self.archivo_bitacora, 'rb') as f:
+                for linea in f:
+                    if not linea.endswith(b'\n'):
+                        break
+                    texto = linea.decode('utf-8', errors='replace').strip()
+                    if faltan:
+                        lote.append(texto)
+                        tamano_lote += len(linea)
+                        faltan -= 1
+                        if not faltan:
+                            validos += tamano_lote
+                            for registro in lote:
+                                self._aplicar_texto_registro(registro)
+                        continue
+                    campos = texto.split(',')
+                    if campos[0] == 'L' and len(campos) == 2 and campos[1].isdigit():
+                        lote, faltan, tamano_lote = [], int(campos[1]), len(linea)
+                        if not faltan:
+                            validos += tamano_lote
+                        continue
+                    validos += len(linea)
+                    self._aplicar_texto_registro(texto)
+            if validos < os.path.getsize(self.archivo_bitacora):
+                print("Advertencia: Se descartó un registro incompleto al final de la bitácora.")
+                with open(self.archivo_bitacora, 'r+b') as f:
+                    f.truncate(validos)
+                    os.fsync(f.fileno())
+            self._tamano_bitacora = validos
+            print("Bitácora de cambios aplicada exitosamente.")
+        except IOError as e:
+            print(f"Error de lectura de la bitácora: {e}")
+
     # Carga los productos desde el archivo de texto al inicio del programa.
     # Maneja la creación del archivo si no existe y errores de formato.
+    # Si existe una bitácora de cambios, la aplica después del archivo principal.
     def cargar_inventario(self):
+        self._cargar_archivo_principal()
+        if os.path.exists(self.archivo_bitacora):
+            self._reproducir_bitacora()
+            if self._tamano_bitacora >= self.umbral_compactacion:
+                self.compactar_bitacora()
+
+    def _cargar_archivo_principal(self):
         # Si el archivo no existe, notifica y no intenta cargarlo.
         if not os.path.exists(self.nombre_archivo):
             print("Archivo de inventario no encontrado. Se creará uno nuevo al guardar.")
             return
 
+        # El formato binario se reconoce por su firma al inicio del archivo.
+        if es_binario(self.nombre_archivo):
+            self._cargar_binario()
+            return
+
         try:
             with open(self.nombre_archivo, 'r') as f:
                 for linea in f:
@@ -69,10 +541,15 @@ class Inventario:
                         # Intenta dividir la línea y crear un objeto Producto
                         id, nombre, cantidad, precio = linea.strip().split(',')
                         producto = Producto(int(id), nombre, int(cantidad), float(precio))
-                        self.productos.append(producto)
                     except ValueError:
                         # Si una línea tiene formato incorrecto, la ignora y advierte al usuario
                         print(f"Advertencia: Línea con formato incorrecto en el archivo: {linea.strip()}")
+                        continue
+                    if producto.get_id() in self._posiciones:
+                        # Se conserva la primera aparición, que es la que devolvía la búsqueda por ID
+                        print(f"Advertencia: ID duplicado en el archivo, se ignora la línea: {linea.strip()}")
+                    else:
+                        self._insertar(producto)
             print("Inventario cargado desde el archivo exitosamente.")
         except FileNotFoundError:
             # Este error se maneja con 'os.path.exists', pero se incluye como precaución
@@ -81,12 +558,37 @@ class Inventario:
             # Captura otros errores de entrada/salida durante la lectura
             print(f"Error de lectura del archivo: {e}")
 
+    # Carga el archivo principal cuando está en formato binario (ver formato_binario.py).
+    def _cargar_binario(self):
+        try:
+            for id, nombre, cantidad, precio in cargar_binario(self.nombre_archivo):
+                # Un archivo guardado por semana11.py trae IDs de texto; se convierten a
+                # entero y se ignoran los que no son números, como en el formato de texto.
+                try:
+                    id = int(id)
+                except ValueError:
+                    print(f"Advertencia: ID no numérico en el archivo binario, se ignora: {id}")
+                    continue
+                if id in self._posiciones:
+                    print(f"Advertencia: ID duplicado en el archivo, se ignora: {id}")
+                else:
+                    self._insertar(Producto(id, nombre, cantidad, precio))
+            self.formato = 'binario'
+            print("Inventario cargado desde el archivo binario exitosamente.")
+        except ValueError as e:
+            # Firma, versión o checksum inválidos: no se carga nada del archivo
+            print(f"Error: el archivo binario no es válido: {e}")
+        except IOError as e:
+            print(f"Error de lectura del archivo: {e}")
+
     # Añade un nuevo producto al inventario.
     # Verifica que el ID sea único antes de añadir y guarda los cambios.
     def agregar_producto(self, producto):
-        if not self.buscar_por_id(producto.get_id()):
-            self.productos.append(producto)
-            self.guardar_inventario() # Guarda los cambios
+        if producto.get_id() not in self._posiciones:
+            self._insertar(producto)
+            # Guarda los cambios
+            self._registrar_cambio('A', producto.get_id(), producto.get_nombre(),
+                                   producto.get_cantidad(), producto.get_precio())
             print(f"Producto '{producto.get_nombre()}' agregado exitosamente.")
             return True
         else:
@@ -96,58 +598,139 @@ class Inventario:
     # Elimina un producto del inventario por su ID.
     # Guarda los cambios después de la eliminación.
     def eliminar_producto(self, id_producto):
-        producto = self.buscar_por_id(id_producto)
-        if producto:
-            self.productos.remove(producto)
-            self.guardar_inventario() # Guarda los cambios
+        if id_producto in self._posiciones:
+            self._quitar(id_producto)
+            self._registrar_cambio('E', id_producto) # Guarda los cambios
             print(f"Producto con ID {id_producto} eliminado exitosamente.")
             return True
         else:
             print(f"Error: No se encontró ningún producto con el ID {id_producto}.")
             return False
 
-    # Actualiza la cantidad o el precio de un producto por su ID.
+    # Actualiza la cantidad, el precio o el nombre de un producto por su ID.
     # Guarda los cambios después de la actualización.
-    def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None):
+    def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None, nuevo_nombre=None):
         producto = self.buscar_por_id(id_producto)
         if producto:
+            self._preservar(self._posiciones[id_producto])
+            if self._en_lote:
+                self._deshacer.append(('U', producto, producto.get_nombre(),
+                                       producto.get_cantidad(), producto.get_precio()))
+            cantidad, precio = producto.get_cantidad(), producto.get_precio()
             if nueva_cantidad is not None:
                 producto.set_cantidad(nueva_cantidad)
             if nuevo_precio is not None:
                 producto.set_precio(nuevo_precio)
-            self.guardar_inventario() # Guarda los cambios
+            if nuevo_nombre is not None:
+                producto.set_nombre(nuevo_nombre)
+                self._indice_nombres.renombrar(id_producto, nuevo_nombre)
+            self._estadisticas.reemplazar(cantidad, precio, producto.get_cantidad(), producto.get_precio())
+            self._registrar_movimiento(id_producto, cantidad, producto.get_cantidad(), precio, producto.get_precio())
+            # Guarda los cambios
+            self._registrar_cambio('U', id_producto, producto.get_nombre(),
+                                   producto.get_cantidad(), producto.get_precio())
             print(f"Producto con ID {id_producto} actualizado exitosamente.")
             return True
         else:
             print(f"Error: No se encontró ningún producto con el ID {id_producto}.")
             return False
             
-    # Busca un producto por su ID.
+    # Busca un producto por su ID usando el índice (O(1)).
     def buscar_por_id(self, id_producto):
-        for producto in self.productos:
-            if producto.get_id() == id_producto:
-                return producto
-        return None
+        posicion = self._posiciones.get(id_producto)
+        if posicion is None:
+            return None
+        return self._ranuras[posicion]
 
-    # Busca productos por una coincidencia parcial en el nombre.
+    # Busca productos por una coincidencia parcial en el nombre (sin distinguir
+    # mayúsculas), usando el índice de trigramas en lugar de recorrer todo el inventario.
     def buscar_por_nombre(self, nombre_buscado):
-        resultados = []
-        nombre_buscado_lower = nombre_buscado.lower()
-        for producto in self.productos:
-            if nombre_buscado_lower in producto.get_nombre().lower():
-                resultados.append(producto)
-        return resultados
+        return self._indice_nombres.buscar(nombre_buscado)
+
+    # Devuelve una página de productos en orden de inserción, sin copiar la lista.
+    # El cursor es (número de orden de inserción, ID) del último producto de la página
+    # anterior, o None para empezar. Si ese producto sigue en el inventario se continúa
+    # desde su posición actual; si fue eliminado, desde la primera ranura insertada
+    # después de él (búsqueda binaria en self._secuencias). Las dos cosas siguen
+    # valiendo aunque la lista se haya compactado.
+    # Devuelve (productos, cursor siguiente), con None si no hay más.
+    def pagina(self, cursor=None, tamano=TAMANO_PAGINA):
+        posicion = 0
+        if cursor is not None:
+            actual = self._posiciones.get(cursor[1])
+            if actual is not None:
+                posicion = actual + 1
+            else:
+                posicion = bisect_right(self._secuencias, cursor[0])
+        productos = []
+        while posicion < len(self._ranuras) and len(productos) < tamano:
+            producto = self._ranuras[posicion]
+            if producto is not None:
+                productos.append(producto)
+            posicion += 1
+        # Se saltean los huecos siguientes para saber si queda algún producto.
+        while posicion < len(self._ranuras) and self._ranuras[posicion] is None:
+            posicion += 1
+        if not productos or posicion == len(self._ranuras):
+            return productos, None
+        ultimo = productos[-1].get_id()
+        return productos, (self._secuencias[self._posiciones[ultimo]], ultimo)
+
+    # Generador que recorre el inventario de a una página: produce tuplas
+    # (productos, cursor de la página siguiente). La memoria usada depende del
+    # tamaño de página y no del tamaño del inventario.
+    def paginas(self, tamano=TAMANO_PAGINA, cursor=None):
+        while True:
+            productos, cursor = self.pagina(cursor, tamano)
+            if productos:
+                yield productos, cursor
+            if cursor is None:
+                return
+
+    # Devuelve los totales del inventario sin recorrerlo: un diccionario con productos,
+    # unidades, valor_total, stock_bajo (cantidad menor al umbral) y umbral_stock_bajo.
+    def estadisticas(self):
+        return self._estadisticas.como_diccionario()
+
+    # Cambia el umbral de stock bajo; los totales se recalculan recorriendo el inventario.
+    def cambiar_umbral_stock_bajo(self, umbral):
+        self._estadisticas.umbral_stock_bajo = umbral
+        self._estadisticas.recalcular((p.get_cantidad(), p.get_precio()) for p in self._iterar_productos())
+
+    # Compara los totales mantenidos con los calculados recorriendo el inventario.
+    # Devuelve un diccionario con los campos que no coinciden (vacío si están bien).
+    def verificar_estadisticas(self):
+        return self._estadisticas.diferencias((p.get_cantidad(), p.get_precio())
+                                              for p in self._iterar_productos())
 
     # Muestra todos los productos actualmente en el inventario.
     def mostrar_inventario(self):
-        if not self.productos:
+        if not self._posiciones:
             print("El inventario está vacío.")
         else:
             print("\n--- Inventario Actual ---")
-            for producto in self.productos:
+            for producto in self._iterar_productos():
                 print(producto)
             print("-------------------------")
 
+# Muestra el inventario de a una página, esperando al usuario entre páginas.
+def mostrar_por_paginas(inventario, tamano=TAMANO_PAGINA):
+    numero = 0
+    for productos, cursor in inventario.paginas(tamano):
+        numero += 1
+        if numero == 1:
+            print("\n--- Inventario Actual ---")
+        for producto in productos:
+            print(producto)
+        if cursor is None:
+            break
+        if input(f"-- Página {numero}: Enter para ver más, 'q' para volver: ").strip().lower() == 'q':
+            break
+    if numero == 0:
+        print("El inventario está vacío.")
+    else:
+        print("-------------------------")
+
 # Función para mostrar el menú de opciones al usuario.
 def menu():
     print("\n--- Sistema de Gestión de Inventarios ---")
@@ -160,8 +743,13 @@ def menu():
     return input("Seleccione una opción: ")
 
 # Función principal que ejecuta el programa.
-def main():
-    inventario = Inventario() # Se inicializa y carga el inventario desde el archivo.
+# Recibe opcionalmente otro inventario con los mismos métodos (por ejemplo InventarioSQLite).
+def main(inventario=None):
+    # Se inicializa y carga el inventario desde el archivo. Los cambios se registran en la bitácora.
+    if inventario is None:
+        nombre_archivo = 'inventario.txt'
+        inventario = Inventario(nombre_archivo, usar_bitacora=True,
+                                historial=HistorialMovimientos(directorio_historial(nombre_archivo)))
 
     while True:
         opcion = menu()
@@ -215,9 +803,10 @@ def main():
                 print("No se encontraron productos con ese nombre.")
 
         elif opcion == '5':
-            inventario.mostrar_inventario()
+            mostrar_por_paginas(inventario)
 
         elif opcion == '6':
+            inventario.compactar_bitacora() # Integra la bitácora en el archivo antes de salir
             print("Saliendo del sistema. ¡Hasta luego!")
             break
 
@@ -1,3 +1,10 @@
+from bisect import bisect_right
+
+from estadisticas_inventario import UMBRAL_STOCK_BAJO, EstadisticasInventario
+from indice_trigramas import IndiceTrigramas
+
+# cantidad de productos por pagina al mostrar el inventario
+TAMANO_PAGINA = 20
 
 class Producto:
     #incio de la clase segun el enunciado de la tarea
@@ -24,17 +31,36 @@ class Producto:
 
     def set_precio(self, nuevo_precio):
         self.precio = nuevo_precio
+
+    def set_nombre(self, nuevo_nombre):
+        self.nombre = nuevo_nombre
     # metodo str para imprimir los productos
     def __str__(self):
         return f"ID: {self.id}, Nombre: {self.nombre}, Cantidad: {self.cantidad}, Precio: ${self.precio:.2f}"
 class Inventario:
     #inicio de la clase inventario
-    def __init__(self):
+    def __init__(self, umbral_stock_bajo=UMBRAL_STOCK_BAJO, historial=None):
         self.productos = []
+        # numero de orden de insercion de cada producto de self.productos (creciente);
+        # los cursores de pagina usan este numero en lugar de la posicion en la lista
+        self._secuencias = []
+        self._siguiente_secuencia = 0
+        # indice de trigramas de los nombres para las busquedas por nombre
+        self._indice_nombres = IndiceTrigramas()
+        # totales (productos, unidades, valor, stock bajo) que se actualizan en cada cambio
+        self._estadisticas = EstadisticasInventario(umbral_stock_bajo)
+        # historial de movimientos (HistorialMovimientos) donde se anotan los cambios de
+        # cantidad y precio, o None para no anotarlos; como este inventario no tiene
+        # archivo propio, cada movimiento se asegura en disco al anotarlo
+        self.historial = historial
     #metodo para agragar productos
     def agregar_producto(self, producto):
         if not self.buscar_por_id(producto.get_id()):
             self.productos.append(producto)
+            self._secuencias.append(self._siguiente_secuencia)
+            self._siguiente_secuencia += 1
+            self._indice_nombres.agregar(producto.get_id(), producto.get_nombre(), producto)
+            self._estadisticas.sumar(producto.get_cantidad(), producto.get_precio())
             print(f"Producto '{producto.get_nombre()}' agregado exitosamente.")
             return True
         else:
@@ -44,20 +70,32 @@ class Inventario:
     def eliminar_producto(self, id_producto):
         producto = self.buscar_por_id(id_producto)
         if producto:
-            self.productos.remove(producto)
+            posicion = self.productos.index(producto)
+            del self.productos[posicion]
+            del self._secuencias[posicion]
+            self._indice_nombres.eliminar(id_producto)
+            self._estadisticas.restar(producto.get_cantidad(), producto.get_precio())
             print(f"Producto con ID {id_producto} eliminado exitosamente.")
             return True
         else:
             print(f"Error: No se encontró ningún producto con el ID {id_producto}.")
             return False
     #metodo para actualizar productos
-    def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None):
+    def actualizar_producto(self, id_producto, nueva_cantidad=None, nuevo_precio=None, nuevo_nombre=None):
         producto = self.buscar_por_id(id_producto)
         if producto:
+            cantidad, precio = producto.get_cantidad(), producto.get_precio()
             if nueva_cantidad is not None:
                 producto.set_cantidad(nueva_cantidad)
             if nuevo_precio is not None:
                 producto.set_precio(nuevo_precio)
+            if nuevo_nombre is not None:
+                producto.set_nombre(nuevo_nombre)
+                self._indice_nombres.renombrar(id_producto, nuevo_nombre)
+            self._estadisticas.reemplazar(cantidad, precio, producto.get_cantidad(), producto.get_precio())
+            if self.historial is not None and (cantidad, precio) != (producto.get_cantidad(), producto.get_precio()):
+                self.historial.registrar(id_producto, cantidad, producto.get_cantidad(), precio, producto.get_precio())
+                self.historial.sincronizar()
             print(f"Producto con ID {id_producto} actualizado exitosamente.")
             return True
         else:
@@ -69,14 +107,42 @@ class Inventario:
             if producto.get_id() == id_producto:
                 return producto
         return None
-    #metodo para buscar productos por nombre
+    #metodo para buscar productos por nombre (coincidencia parcial, usando el indice de trigramas)
     def buscar_por_nombre(self, nombre_buscado):
-        resultados = []
-        nombre_buscado_lower = nombre_buscado.lower()
-        for producto in self.productos:
-            if nombre_buscado_lower in producto.get_nombre().lower():
-                resultados.append(producto)
-        return resultados
+        return self._indice_nombres.buscar(nombre_buscado)
+    #metodo para obtener una pagina de productos en orden de insercion
+    #el cursor es el numero de orden del ultimo producto devuelto (None para empezar desde
+    #el principio); la pagina sigue despues de ese numero, asi eliminar productos entre
+    #una pagina y la siguiente no hace saltear ni repetir ninguno
+    #devuelve la lista de productos y el cursor de la pagina siguiente (None si no hay mas)
+    def pagina(self, cursor=None, tamano=TAMANO_PAGINA):
+        inicio = 0 if cursor is None else bisect_right(self._secuencias, cursor)
+        productos = self.productos[inicio:inicio + tamano]
+        siguiente = inicio + len(productos)
+        if not productos or siguiente == len(self.productos):
+            return productos, None
+        return productos, self._secuencias[siguiente - 1]
+    #generador que recorre el inventario de a una pagina, sin copiar la lista completa
+    #produce tuplas (productos, cursor de la pagina siguiente)
+    def paginas(self, tamano=TAMANO_PAGINA, cursor=None):
+        while True:
+            productos, cursor = self.pagina(cursor, tamano)
+            if productos:
+                yield productos, cursor
+            if cursor is None:
+                return
+    #metodo que devuelve los totales del inventario sin recorrerlo (diccionario con
+    #productos, unidades, valor_total, stock_bajo y umbral_stock_bajo)
+    def estadisticas(self):
+        return self._estadisticas.como_diccionario()
+    #metodo que cambia el umbral de stock bajo; recalcula los totales recorriendo el inventario
+    def cambiar_umbral_stock_bajo(self, umbral):
+        self._estadisticas.umbral_stock_bajo = umbral
+        self._estadisticas.recalcular((p.get_cantidad(), p.get_precio()) for p in self.productos)
+    #metodo que compara los totales mantenidos con los calculados recorriendo el inventario
+    #devuelve un diccionario con los campos que no coinciden (vacio si estan bien)
+    def verificar_estadisticas(self):
+        return self._estadisticas.diferencias((p.get_cantidad(), p.get_precio()) for p in self.productos)
     #metodo para mostrar el inventario
     def mostrar_inventario(self):
         if not self.productos:
@@ -86,6 +152,23 @@ class Inventario:
             for producto in self.productos:
                 print(producto)
             print("-------------------------")
+# funcion para mostrar el inventario de a una pagina, esperando al usuario entre paginas
+def mostrar_por_paginas(inventario, tamano=TAMANO_PAGINA):
+    numero = 0
+    for productos, cursor in inventario.paginas(tamano):
+        numero += 1
+        if numero == 1:
+            print("\n--- Inventario Actual ---")
+        for producto in productos:
+            print(producto)
+        if cursor is None:
+            break
+        if input(f"-- Página {numero}: Enter para ver más, 'q' para volver: ").strip().lower() == 'q':
+            break
+    if numero == 0:
+        print("El inventario está vacío.")
+    else:
+        print("-------------------------")
 # funcion para mostrar el menu
 def menu():
     print("\n--- Sistema de Gestión de Inventarios ---")
@@ -158,7 +241,7 @@ def main():
                 print("No se encontraron productos con ese nombre.")
 
         elif opcion == '5':
-            inventario.mostrar_inventario()
+            mostrar_por_paginas(inventario)
 
         elif opcion == '6':
             print("Saliendo del sistema. ¡Hasta luego!")
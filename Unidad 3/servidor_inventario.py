@@ -0,0 +1,274 @@
+"""
+Servidor asyncio que permite a muchas terminales (puntos de venta) usar el mismo
+inventario a la vez. Atiende por TCP en localhost o por un socket Unix.
+
+Protocolo: una solicitud por línea, con los campos separados por tabulaciones; el
+nombre va siempre al final, así que es el único campo que puede contener
+tabulaciones en las respuestas. Los clientes pueden enviar varias solicitudes sin
+esperar: las respuestas llegan en el mismo orden.
+
+    G id                          -> OK id cantidad precio nombre
+    A id cantidad precio nombre   -> OK
+    U id cantidad precio nombre   -> OK id cantidad precio nombre
+                                     (un campo vacío no se modifica)
+    E id                          -> OK
+    B limite texto                -> OK n, seguido de n líneas "id cantidad precio nombre"
+                                     (limite 0 = sin límite)
+    N                             -> OK cantidad_de_productos
+
+Los errores se responden como "ERR<tab>mensaje", también los inesperados: un error
+en una solicitud no cierra la conexión.
+
+Las operaciones duran microsegundos, así que se ejecutan directamente en el bucle de
+eventos; el guardado periódico corre en otro hilo y por eso el inventario es un
+InventarioConcurrente.
+
+Uso: python servidor_inventario.py [archivo] [puerto o ruta de socket Unix]
+"""
+import asyncio
+import os
+import signal
+import sys
+
+from inventario_concurrente import InventarioConcurrente
+from semana11 import Producto
+
+PUERTO = 8765
+# Segundos entre guardados automáticos (solo si hubo cambios).
+INTERVALO_GUARDADO = 30
+
+
+class ErrorSolicitud(Exception):
+    """
+    Solicitud mal formada o que no se pudo cumplir; el mensaje se envía al cliente.
+    """
+
+
+def _linea_producto(tupla):
+    producto_id, nombre, cantidad, precio = tupla
+    return f"{producto_id}\t{cantidad}\t{precio}\t{nombre}"
+
+
+class ServidorInventario:
+    """
+    Traduce las líneas del protocolo a operaciones sobre un InventarioConcurrente.
+    """
+    def __init__(self, inventario, nombre_archivo=None, intervalo_guardado=INTERVALO_GUARDADO):
+        self.inventario = inventario
+        self.nombre_archivo = nombre_archivo
+        self.intervalo_guardado = intervalo_guardado
+        self.solicitudes = 0
+        self._operaciones = {
+            'G': self._obtener,
+            'A': self._agregar,
+            'U': self._actualizar,
+            'E': self._eliminar,
+            'B': self._buscar,
+            'N': self._contar,
+        }
+
+    # --- operaciones: reciben los campos y devuelven el texto de la respuesta ---
+
+    def _obtener(self, campos):
+        producto = self.inventario.obtener(self._campos(campos, 1)[0])
+        if producto is None:
+            raise ErrorSolicitud("producto no encontrado")
+        return "OK\t" + _linea_producto(producto)
+
+    def _agregar(self, campos):
+        producto_id, cantidad, precio, nombre = self._campos(campos, 4)
+        if not producto_id or not nombre:
+            raise ErrorSolicitud("el ID y el nombre no pueden estar vacíos")
+        self._validar_id(producto_id)
+        self._validar_nombre(nombre)
+        producto = Producto(producto_id, nombre, self._entero(cantidad), self._numero(precio))
+        if not self.inventario.agregar_producto(producto):
+            raise ErrorSolicitud("ya existe un producto con ese ID")
+        return "OK"
+
+    def _actualizar(self, campos):
+        producto_id, cantidad, precio, nombre = self._campos(campos, 4)
+        if nombre:
+            self._validar_nombre(nombre)
+        producto = self.inventario.actualizar_producto(
+            producto_id,
+            self._entero(cantidad) if cantidad else None,
+            self._numero(precio) if precio else None,
+            nombre or None)
+        if producto is None:
+            raise ErrorSolicitud("producto no encontrado")
+        return "OK\t" + _linea_producto(producto)
+
+    def _eliminar(self, campos):
+        if not self.inventario.eliminar_producto(self._campos(campos, 1)[0]):
+            raise ErrorSolicitud("producto no encontrado")
+        return "OK"
+
+    def _buscar(self, campos):
+        limite, texto = self._campos(campos, 2)
+        limite = self._entero(limite)
+        if limite < 0:
+            raise ErrorSolicitud("el límite no puede ser negativo")
+        encontrados = self.inventario.buscar_por_nombre(texto, limite or None)
+        return "\n".join([f"OK\t{len(encontrados)}"] + [_linea_producto(p) for p in encontrados])
+
+    def _contar(self, campos):
+        return f"OK\t{len(self.inventario)}"
+
+    # El archivo se guarda en el formato en que se cargó; estas validaciones evitan
+    # datos que ese formato no puede guardar.
+
+    def _validar_id(self, producto_id):
+        self._validar_texto(producto_id, "el ID")
+        if self.inventario.formato == 'csv':
+            try:
+                int(producto_id)
+            except ValueError:
+                raise ErrorSolicitud("este inventario usa IDs enteros")
+
+    def _validar_nombre(self, nombre):
+        self._validar_texto(nombre, "el nombre")
+
+    # Rechaza el separador del formato del archivo y los caracteres que cortan los
+    # campos o las líneas (del protocolo o del archivo)
+    def _validar_texto(self, texto, campo):
+        separador = {'csv': ',', 'pipe': '|'}.get(self.inventario.formato)
+        for caracter, descripcion in ((separador, f"'{separador}'"), ('\t', "tabulaciones"),
+                                      ('\n', "saltos de línea"), ('\r', "saltos de línea")):
+            if caracter is not None and caracter in texto:
+                raise ErrorSolicitud(f"{campo} no puede contener {descripcion}")
+
+    @staticmethod
+    def _campos(campos, cantidad):
+        if len(campos) != cantidad:
+            raise ErrorSolicitud(f"se esperaban {cantidad} campos")
+        return campos
+
+    @staticmethod
+    def _entero(texto):
+        try:
+            return int(texto)
+        except ValueError:
+            raise ErrorSolicitud(f"número entero no válido: {texto}")
+
+    @staticmethod
+    def _numero(texto):
+        try:
+            return float(texto)
+        except ValueError:
+            raise ErrorSolicitud(f"número no válido: {texto}")
+
+    def procesar(self, linea):
+        """
+        Ejecuta una línea del protocolo (bytes) y devuelve la respuesta (bytes).
+        """
+        self.solicitudes += 1
+        texto = linea.decode('utf-8', errors='replace').rstrip('\r\n')
+        comando, _, resto = texto.partition('\t')
+        # El último campo (el nombre o el texto buscado) puede contener tabulaciones.
+        maximo = {'A': 3, 'U': 3, 'B': 1}.get(comando, -1)
+        campos = resto.split('\t', maximo) if resto else []
+        operacion = self._operaciones.get(comando)
+        try:
+            if operacion is None:
+                raise ErrorSolicitud(f"comando desconocido: {comando}")
+            respuesta = operacion(campos)
+        except ErrorSolicitud as e:
+            respuesta = f"ERR\t{e}"
+        except Exception as e:
+            # Un error inesperado solo afecta a esta solicitud, no a la conexión.
+            mensaje = f"{type(e).__name__}: {e}".replace('\n', ' ')
+            respuesta = f"ERR\terror interno: {mensaje}"
+        return (respuesta + "\n").encode('utf-8')
+
+    async def atender(self, lector, escritor):
+        """
+        Atiende una conexión hasta que el cliente la cierra.
+        """
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                escritor.write(self.procesar(linea))
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _guardado_periodico(self):
+        while True:
+            await asyncio.sleep(self.intervalo_guardado)
+            if self.inventario.hay_cambios():
+                try:
+                    # La escritura del archivo se hace en otro hilo para no frenar el bucle.
+                    await asyncio.to_thread(self.inventario.guardar, self.nombre_archivo)
+                except IOError as e:
+                    print(f"Error al guardar el inventario: {e}")
+
+    async def ejecutar(self, direccion=PUERTO):
+        """
+        Atiende conexiones hasta que se cancela o se recibe SIGTERM. direccion es un
+        puerto TCP (en localhost) o la ruta de un socket Unix.
+        """
+        if isinstance(direccion, int):
+            servidor = await asyncio.start_server(self.atender, '127.0.0.1', direccion)
+        else:
+            servidor = await asyncio.start_unix_server(self.atender, direccion)
+        guardado = None
+        if self.nombre_archivo:
+            guardado = asyncio.create_task(self._guardado_periodico())
+        # SIGTERM (por ejemplo, al apagar el equipo) termina igual que Ctrl+C.
+        detener = asyncio.Event()
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, detener.set)
+        except NotImplementedError:
+            # Windows no admite manejadores de señales en el bucle de eventos.
+            pass
+        print(f"Servidor de inventario escuchando en {direccion} ({len(self.inventario)} productos).")
+        try:
+            async with servidor:
+                await detener.wait()
+        finally:
+            if guardado is not None:
+                guardado.cancel()
+
+
+def leer_direccion(texto):
+    """
+    Convierte el argumento de línea de comandos en un puerto o una ruta de socket.
+    """
+    return int(texto) if texto.isdigit() else texto
+
+
+def main():
+    nombre_archivo = sys.argv[1] if len(sys.argv) > 1 else 'inventario.txt'
+    direccion = leer_direccion(sys.argv[2]) if len(sys.argv) > 2 else PUERTO
+
+    inventario = InventarioConcurrente()
+    if os.path.exists(nombre_archivo):
+        try:
+            print(f"Se cargaron {inventario.cargar(nombre_archivo)} productos de {nombre_archivo}.")
+        except (IOError, ValueError) as e:
+            print(f"Error al cargar el inventario: {e}")
+            return
+    servidor = ServidorInventario(inventario, nombre_archivo)
+    try:
+        asyncio.run(servidor.ejecutar(direccion))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if inventario.hay_cambios():
+            # Un error al guardar no debe ocultar el error que terminó el servidor.
+            try:
+                inventario.guardar(nombre_archivo)
+                print("Inventario guardado.")
+            except IOError as e:
+                print(f"Error al guardar el inventario: {e}")
+        if isinstance(direccion, str) and os.path.exists(direccion):
+            os.remove(direccion)
+
+
+if __name__ == "__main__":
+    main()
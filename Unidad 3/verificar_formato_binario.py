@@ -0,0 +1,81 @@
+"""
+Verifica que un inventario en formato binario (ver formato_binario.py) pase de
+semana_10.py (IDs enteros) a semana11.py (IDs de texto) y de vuelta sin perder ni
+cambiar productos.
+
+semana_10 guarda IDs enteros y semana11 debe cargarlos como texto; semana11 guarda
+IDs de texto y semana_10 debe cargarlos como enteros, ignorando los que no son
+números. Los archivos se escriben en un directorio temporal.
+
+Uso: python verificar_formato_binario.py [productos]
+Termina con código 1 si alguna comprobación falla.
+"""
+import contextlib
+import os
+import sys
+import tempfile
+
+import semana11
+import semana_10
+
+
+def productos_semana_10(inventario):
+    return {p.get_id(): (p.get_nombre(), p.get_cantidad(), p.get_precio()) for p in inventario.productos}
+
+
+def productos_semana11(inventario):
+    return {i: (p.nombre, p.cantidad, p.precio) for i, p in inventario.productos.items()}
+
+
+def verificar(n):
+    """
+    Hace la ida y vuelta con n productos y devuelve la lista de errores encontrados.
+    """
+    errores = []
+    with tempfile.TemporaryDirectory() as directorio, \
+            open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+        desde_10 = os.path.join(directorio, 'desde_semana_10.bin')
+        desde_11 = os.path.join(directorio, 'desde_semana11.bin')
+
+        # semana_10 -> semana11
+        origen = semana_10.Inventario(desde_10)
+        origen.formato = 'binario'
+        for i in range(n):
+            origen.agregar_producto(semana_10.Producto(i, f"Producto {i}", i % 100, 1.5 + i % 50))
+        origen.guardar_inventario()
+        esperado = productos_semana_10(origen)
+
+        intermedio = semana11.Inventario()
+        intermedio.cargar_inventario(desde_10)
+        cargado = productos_semana11(intermedio)
+        if not all(type(i) is str for i in cargado):
+            errores.append("semana11 cargó IDs que no son texto")
+        if cargado != {str(i): datos for i, datos in esperado.items()}:
+            errores.append("semana11 no cargó los mismos productos que guardó semana_10")
+
+        # semana11 -> semana_10, con un ID que semana_10 no puede convertir
+        intermedio.agregar_producto(semana11.Producto("A-1", "Sin ID numérico", 1, 1.0))
+        intermedio.guardar_inventario(desde_11)
+        vuelta = semana_10.Inventario(desde_11)
+        cargado = productos_semana_10(vuelta)
+        if not all(type(i) is int for i in cargado):
+            errores.append("semana_10 cargó IDs que no son enteros")
+        if cargado != esperado:
+            errores.append("semana_10 no recuperó los productos originales")
+        if vuelta.formato != 'binario':
+            errores.append("semana_10 no reconoció el archivo binario de semana11")
+    return errores
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    errores = verificar(n)
+    for error in errores:
+        print(f"✗ {error}")
+    if errores:
+        sys.exit(1)
+    print(f"✓ {n} productos pasaron de semana_10 a semana11 y de vuelta sin cambios.")
+
+
+if __name__ == "__main__":
+    main()